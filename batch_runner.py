@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+from rrt import COLLISION_BACKENDS, PLANNERS, RRT, RRTSettings, is_cacheable, result_key
+from rrtCore.nearestNeighbour import NN_BACKENDS
+from rrtCore.resultCache import open_result_cache
+
+"""
+    Headless batch runner: plans on one or more maps without opening any window.
+
+    Only `rrt.py` and NumPy are imported, so it runs on machines without PyQt5, pyqtgraph or OpenGL.
+
+    Examples:
+        python3 batch_runner.py                                  # every map in ./maps, results as JSON on stdout
+        python3 batch_runner.py maps/example.json --runs 10 --seed 1 --output results.csv
+        python3 batch_runner.py --seed 1 --result-cache cache.sqlite       # seeded runs are only planned once
+"""
+
+CSV_FIELDS = ["map", "run", "seed", "success", "nodes", "waypoint_count", "path_length", "time_s", "cached", "solutions", "stats", "waypoints"]
+
+def parse_args(argv=None):
+    """
+    Parses the command-line arguments.
+
+    :param argv: The arguments, defaults to `sys.argv[1:]`.
+    :return: The parsed arguments.
+    """
+    defaults = RRTSettings()
+    parser = argparse.ArgumentParser(description="Run the RRT planner on map files without a GUI.")
+    parser.add_argument("maps", nargs="*", default=["./maps"], help="Map JSON files or folders containing them. Defaults to ./maps.")
+    parser.add_argument("--runs", type=int, default=1, help="Number of runs per map.")
+    parser.add_argument("--output", "-o", default=None, help="Output file. Defaults to stdout.")
+    parser.add_argument("--format", choices=("json", "csv"), default=None, help="Output format. Defaults to the output file extension, or json.")
+
+    parser.add_argument("--planner", choices=PLANNERS, default=defaults.planner)
+    parser.add_argument("--safe-distance", type=float, default=defaults.safeDistance)
+    parser.add_argument("--goal-distance", type=float, default=defaults.goalDistance)
+    parser.add_argument("--node-distance", type=float, default=defaults.nodeDistance)
+    parser.add_argument("--node-limit", type=int, default=defaults.nodeLimit)
+    parser.add_argument("--quadrants", action="store_true", default=defaults.quadrants)
+    parser.add_argument("--num-quadrants-per-axis", type=int, default=defaults.numQuadrantsPerAxis)
+    parser.add_argument("--quadrant-prob", type=float, default=defaults.quadrantProb)
+    parser.add_argument("--nn-backend", choices=NN_BACKENDS, default=defaults.nnBackend)
+    parser.add_argument("--bvh-threshold", type=int, default=defaults.bvhThreshold)
+    parser.add_argument("--collision-backend", choices=COLLISION_BACKENDS, default=defaults.collisionBackend)
+    parser.add_argument("--voxel-resolution", type=float, default=defaults.voxelResolution)
+    parser.add_argument("--clearance", type=float, default=defaults.clearance, help="Additive distance to the obstacles kept by the sdf collision backend.")
+    parser.add_argument("--prm-samples", type=int, default=defaults.prmSamples)
+    parser.add_argument("--prm-radius", type=float, default=defaults.prmRadius)
+    parser.add_argument("--roadmap-dir", default=defaults.roadmapDir, help="Folder where PRM roadmaps are saved and reused between runs.")
+    parser.add_argument("--voxel-cache-dir", default=defaults.voxelCacheDir, help="Folder where occupancy grids are cached between runs.")
+    parser.add_argument("--rewire-radius", type=float, default=defaults.rewireRadius)
+    parser.add_argument("--time-budget", type=float, default=defaults.timeBudget, help="Time budget in milliseconds; the best path found when it runs out is returned.")
+    parser.add_argument("--informed", action="store_true", default=defaults.informed, help="Informed sampling for the star planner.")
+    parser.add_argument("--prune-path", action="store_true", default=defaults.prunePath)
+    parser.add_argument("--shortcut-iterations", type=int, default=defaults.shortcutIterations)
+    parser.add_argument("--profile", action="store_true", default=defaults.profile, help="Record per-phase counters and timings of every run.")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Seed of the first run; run i uses seed + i.")
+    parser.add_argument("--result-cache", default=defaults.resultCache,
+                        help="SQLite file where the results of seeded runs without a time budget are stored and reused.")
+    parser.add_argument("--result-cache-size", type=int, default=defaults.resultCacheSize, help="Size limit of the result cache in bytes.")
+    return parser.parse_args(argv)
+
+def settings_from_args(args):
+    """
+    Builds the RRT settings from the parsed arguments.
+
+    :param args: The parsed arguments.
+    :return: The RRT settings.
+    :rtype: `RRTSettings`
+    """
+    return RRTSettings(
+        safeDistance=args.safe_distance,
+        goalDistance=args.goal_distance,
+        nodeDistance=args.node_distance,
+        nodeLimit=args.node_limit,
+        quadrants=args.quadrants,
+        numQuadrantsPerAxis=args.num_quadrants_per_axis,
+        quadrantProb=args.quadrant_prob,
+        nnBackend=args.nn_backend,
+        bvhThreshold=args.bvh_threshold,
+        seed=args.seed,
+        planner=args.planner,
+        rewireRadius=args.rewire_radius,
+        timeBudget=args.time_budget,
+        informed=args.informed,
+        prunePath=args.prune_path,
+        shortcutIterations=args.shortcut_iterations,
+        collisionBackend=args.collision_backend,
+        voxelResolution=args.voxel_resolution,
+        voxelCacheDir=args.voxel_cache_dir,
+        clearance=args.clearance,
+        prmSamples=args.prm_samples,
+        prmRadius=args.prm_radius,
+        roadmapDir=args.roadmap_dir,
+        profile=args.profile,
+        resultCache=args.result_cache,
+        resultCacheSize=args.result_cache_size,
+    )
+
+def find_maps(paths):
+    """
+    Expands folders into the JSON maps they contain.
+
+    :param paths: A list of map files or folders.
+    :return: A sorted list of map files.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+        else:
+            files.append(path)
+    return files
+
+def path_length(waypoints):
+    """
+    Calculates the length of a path.
+
+    :param waypoints: A list of waypoints (x, y, z).
+    :return: The sum of the distances between consecutive waypoints.
+    """
+    return sum(sum((b - a)**2 for a, b in zip(p1, p2))**0.5 for p1, p2 in zip(waypoints, waypoints[1:]))
+
+def run_map(map_file, settings, runs):
+    """
+    Runs the planner several times on a map.
+
+    :param map_file: The path of the map JSON file.
+    :param settings: The RRT settings. Run i uses `settings.seed + i` when a seed is set. Runs that are cacheable
+        (see `is_cacheable`) are answered from `settings.resultCache` when they were already planned; they are marked
+        "cached" and report the stored planning time, without solutions or stats.
+    :type settings: `RRTSettings`
+    :param runs: The number of runs.
+    :return: A list with one result dictionary per run.
+    """
+    with open(map_file, 'r') as f:
+        map_data = json.load(f)
+
+    base_seed = settings.seed
+    results = []
+    for run in range(runs):
+        settings.seed = None if base_seed is None else base_seed + run
+
+        cache = None
+        entry = None
+        if is_cacheable(settings):
+            cache = open_result_cache(settings.resultCache, settings.resultCacheSize)
+            key = result_key(map_data["mapSize"], map_data["posStart"], map_data["posGoal"], map_data["listObstacles"], settings)
+            entry = cache.get(key)
+
+        if entry is not None:
+            waypoints, nodes, elapsed = entry["waypoints"], entry["nodes"], entry["time_s"]
+            solutions, stats = [], None
+        else:
+            t0 = time.perf_counter()
+            rrt = RRT(map_data["mapSize"], map_data["posStart"], map_data["posGoal"], map_data["listObstacles"], settings)
+            waypoints, nodes, stats = rrt.main_logic()
+            elapsed = time.perf_counter() - t0
+            solutions = rrt.solutions
+            if cache is not None:
+                cache.put(key, waypoints, nodes, elapsed)
+
+        goal = map_data["posGoal"]
+        success = len(waypoints) > 0 and path_length([waypoints[-1], goal]) < settings.goalDistance
+        results.append({
+            "map": map_file,
+            "run": run,
+            "seed": settings.seed,
+            "success": success,
+            "nodes": nodes,
+            "waypoint_count": len(waypoints),
+            "path_length": path_length(waypoints),
+            "time_s": elapsed,
+            "cached": entry is not None,
+            "solutions": solutions,
+            "stats": None if stats is None else stats.as_dict(),
+            "waypoints": waypoints,
+        })
+    settings.seed = base_seed
+    return results
+
+def write_results(results, output, fmt):
+    """
+    Writes the results as JSON or CSV. In CSV the solutions and waypoints are stored as JSON strings.
+
+    :param results: A list of result dictionaries.
+    :param output: An open text file.
+    :param fmt: "json" or "csv".
+    """
+    if fmt == "csv":
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for result in results:
+            row = dict(result)
+            row["solutions"] = json.dumps(result["solutions"])
+            row["stats"] = json.dumps(result["stats"])
+            row["waypoints"] = json.dumps(result["waypoints"])
+            writer.writerow(row)
+    else:
+        json.dump(results, output, indent=4)
+        output.write("\n")
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = settings_from_args(args)
+    fmt = args.format
+    if fmt is None:
+        fmt = "csv" if args.output and args.output.endswith(".csv") else "json"
+
+    map_files = find_maps(args.maps)
+    if not map_files:
+        print("No maps found.", file=sys.stderr)
+        return 1
+
+    results = []
+    for map_file in map_files:
+        # The planner reports its progress with print(); keep stdout clean for the results.
+        with contextlib.redirect_stdout(sys.stderr):
+            results.extend(run_map(map_file, settings, args.runs))
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_results(results, f, fmt)
+    else:
+        write_results(results, sys.stdout, fmt)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+import time
+import numpy as np
+from rrtCore.collisionChecker import BoxCollisionChecker, inflated_boxes
+from rrtCore.bvh import BVHCollisionChecker
+
+"""
+    Compares the brute-force collision checker against the BVH as the number of obstacles grows.
+
+    Run from the repository root:
+        python -m benchmarks.collision_benchmark
+"""
+
+def random_map(num_obstacles, rng, map_size=100.0):
+    """
+    Generates random box obstacles spread over a square map.
+
+    :param num_obstacles: The number of obstacles.
+    :param rng: The NumPy random generator.
+    :param map_size: The edge length of the map.
+    :return: A tuple (positions, sizes).
+    """
+    positions = rng.uniform(0, map_size, (num_obstacles, 3))
+    sizes = rng.uniform(0.2, 1.5, (num_obstacles, 3))
+    return positions, sizes
+
+def random_segments(num_segments, rng, map_size=100.0, length=0.3):
+    """
+    Generates short random segments, like the edges tested by the RRT.
+
+    :param num_segments: The number of segments.
+    :param rng: The NumPy random generator.
+    :param map_size: The edge length of the map.
+    :param length: The length of each segment.
+    :return: A tuple (initial, objective) of (N, 3) arrays.
+    """
+    initial = rng.uniform(0, map_size, (num_segments, 3))
+    direction = rng.normal(size=(num_segments, 3))
+    direction /= np.linalg.norm(direction, axis=1)[:, None]
+    return initial, initial + length * direction
+
+def time_queries(checker, initial, objective):
+    """
+    Times the segment queries of a checker.
+
+    :return: A tuple (microseconds per query, number of collisions).
+    """
+    t0 = time.perf_counter()
+    hits = sum(checker.segment_collides(a, b) for a, b in zip(initial, objective))
+    return (time.perf_counter() - t0) / len(initial) * 1e6, hits
+
+def main():
+    rng = np.random.default_rng(0)
+    initial, objective = random_segments(2000, rng)
+
+    print(f"{'obstacles':>10} {'brute us/query':>15} {'bvh build ms':>13} {'bvh us/query':>13} {'speedup':>8}")
+    for num_obstacles in (10, 100, 1000, 10000, 50000):
+        positions, sizes = random_map(num_obstacles, rng)
+        box_min, box_max = inflated_boxes(positions, sizes, 1.75)
+
+        brute = BoxCollisionChecker(box_min, box_max)
+        t0 = time.perf_counter()
+        bvh = BVHCollisionChecker(box_min, box_max)
+        build_ms = (time.perf_counter() - t0) * 1e3
+
+        brute_us, brute_hits = time_queries(brute, initial, objective)
+        bvh_us, bvh_hits = time_queries(bvh, initial, objective)
+        assert brute_hits == bvh_hits, "BVH and brute force disagree"
+
+        print(f"{num_obstacles:>10} {brute_us:>15.1f} {build_ms:>13.1f} {bvh_us:>13.1f} {brute_us / bvh_us:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+import numpy as np
+
+"""
+    Procedural stress maps in the same format as the map editor's JSON files:
+    {"mapSize": [[min, max] x3], "posStart": [x, y, z], "posGoal": [x, y, z], "listObstacles": [[id, position, size, color], ...]}
+
+    Obstacle positions are their minimum corner, as in the editor. Walls are built as separate boxes so their openings
+    stay open; since the RRT scales every obstacle by safeDistance, the openings only keep their width with a
+    safeDistance close to 1.
+"""
+
+WALL_COLOR = [0.6, 0.6, 0.6, 1.0]
+CLUTTER_COLOR = [0.8, 0.3, 0.2, 1.0]
+
+def _map(size, height, start, goal, boxes):
+    """
+    Builds a map dictionary.
+
+    :param size: The edge length of the map along x and y.
+    :param height: The height of the map.
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param boxes: A list of (minimum corner, maximum corner, color) tuples.
+    :return: The map dictionary.
+    """
+    obstacles = []
+    for lo, hi, color in boxes:
+        lo = np.asarray(lo, dtype=np.float64)
+        hi = np.asarray(hi, dtype=np.float64)
+        if np.all(hi > lo):
+            obstacles.append([len(obstacles) + 1, lo.tolist(), (hi - lo).tolist(), list(color)])
+    return {
+        "mapSize": [[0.0, float(size)], [0.0, float(size)], [0.0, float(height)]],
+        "posStart": [float(v) for v in start],
+        "posGoal": [float(v) for v in goal],
+        "listObstacles": obstacles,
+    }
+
+def _clear_of(lo, hi, points, margin):
+    """
+    Checks that a box stays at least `margin` away from some points.
+
+    :param lo: The minimum corner of the box.
+    :param hi: The maximum corner of the box.
+    :param points: A list of points (x, y, z).
+    :param margin: The minimum distance.
+    :return: True if every point is far enough.
+    """
+    for point in points:
+        gap = np.maximum(0, np.maximum(lo - point, point - hi))
+        if np.linalg.norm(gap) < margin:
+            return False
+    return True
+
+def _random_boxes(rng, count, low, high, min_size, max_size, keep_clear, margin, color=CLUTTER_COLOR):
+    """
+    Generates random boxes inside a region, away from some points.
+
+    :return: A list of (minimum corner, maximum corner, color) tuples.
+    """
+    boxes = []
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    for _ in range(20 * count):
+        if len(boxes) == count:
+            break
+        extent = rng.uniform(min_size, max_size, 3)
+        lo = rng.uniform(low, np.maximum(low, high - extent))
+        hi = lo + extent
+        if _clear_of(lo, hi, keep_clear, margin):
+            boxes.append((lo, hi, color))
+    return boxes
+
+def random_boxes_map(rng, size=10.0, num_obstacles=100):
+    """
+    Random boxes of varied sizes scattered over the whole volume. The start and the goal are at opposite corners.
+
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the (cubic) map. Defaults to 10.
+    :param num_obstacles: The number of boxes. Defaults to 100.
+    :return: The map dictionary.
+    """
+    start = np.full(3, 0.05 * size)
+    goal = np.full(3, 0.95 * size)
+    boxes = _random_boxes(rng, num_obstacles, [0, 0, 0], [size] * 3, 0.02 * size, 0.12 * size, [start, goal], 0.05 * size)
+    return _map(size, size, start, goal, boxes)
+
+def forest_map(rng, size=10.0, num_obstacles=100):
+    """
+    Thin floor-to-ceiling columns (tree trunks) between the start and the goal.
+
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the (cubic) map. Defaults to 10.
+    :param num_obstacles: The number of trunks. Defaults to 100.
+    :return: The map dictionary.
+    """
+    start = np.array([0.05 * size, 0.5 * size, 0.5 * size])
+    goal = np.array([0.95 * size, 0.5 * size, 0.5 * size])
+    boxes = []
+    for _ in range(20 * num_obstacles):
+        if len(boxes) == num_obstacles:
+            break
+        width = rng.uniform(0.02 * size, 0.04 * size)
+        x, y = rng.uniform(0, size - width, 2)
+        lo = np.array([x, y, 0.0])
+        hi = np.array([x + width, y + width, size])
+        if _clear_of(lo, hi, [start, goal], 0.05 * size):
+            boxes.append((lo, hi, [0.4, 0.25, 0.1, 1.0]))
+    return _map(size, size, start, goal, boxes)
+
+def _wall_with_hole(axis, position, thickness, size, height, hole_lo, hole_hi):
+    """
+    Builds a wall across the whole map, perpendicular to `axis`, with a rectangular hole.
+
+    :param axis: 0 for a wall perpendicular to x, 2 for a floor slab.
+    :param position: The coordinate of the wall along `axis`.
+    :param thickness: The thickness of the wall.
+    :param size: The edge length of the map along x and y.
+    :param height: The height of the map.
+    :param hole_lo: The minimum corner of the hole in the two other axes.
+    :param hole_hi: The maximum corner of the hole in the two other axes.
+    :return: A list of up to four (minimum corner, maximum corner, color) tuples around the hole.
+    """
+    extent = np.array([size, size, height], dtype=np.float64)
+    u, v = [a for a in range(3) if a != axis]
+    boxes = []
+    for (u0, u1), (v0, v1) in (
+            ((0, hole_lo[0]), (0, extent[v])),
+            ((hole_hi[0], extent[u]), (0, extent[v])),
+            ((hole_lo[0], hole_hi[0]), (0, hole_lo[1])),
+            ((hole_lo[0], hole_hi[0]), (hole_hi[1], extent[v]))):
+        lo = np.zeros(3)
+        hi = np.zeros(3)
+        lo[axis], hi[axis] = position, position + thickness
+        lo[u], hi[u] = u0, u1
+        lo[v], hi[v] = v0, v1
+        boxes.append((lo, hi, WALL_COLOR))
+    return boxes
+
+def corridor_map(rng, size=10.0, num_obstacles=16, gap=1.5):
+    """
+    Parallel walls across the map, each with a narrow square opening at a random place, so the path has to slalom
+    through a sequence of narrow passages.
+
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the (cubic) map. Defaults to 10.
+    :param num_obstacles: The number of boxes; every wall is made of four. Defaults to 16 (4 walls).
+    :param gap: The edge length of the openings. Defaults to 1.5.
+    :return: The map dictionary.
+    """
+    num_walls = max(1, num_obstacles // 4)
+    start = np.array([0.02 * size, 0.5 * size, 0.5 * size])
+    goal = np.array([0.98 * size, 0.5 * size, 0.5 * size])
+    thickness = 0.02 * size
+    boxes = []
+    for x in np.linspace(0.1 * size, 0.9 * size, num_walls):
+        hole_lo = rng.uniform(0, size - gap, 2)
+        boxes.extend(_wall_with_hole(0, x, thickness, size, size, hole_lo, hole_lo + gap))
+    return _map(size, size, start, goal, boxes)
+
+def bug_trap_map(rng, size=10.0, num_obstacles=20):
+    """
+    A cup-shaped trap around the start whose opening faces away from the goal, plus some random clutter. Greedy
+    growth towards the goal gets stuck inside the cup.
+
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the (cubic) map. Defaults to 10.
+    :param num_obstacles: The number of clutter boxes outside the trap. Defaults to 20.
+    :return: The map dictionary.
+    """
+    center = np.array([0.35 * size, 0.5 * size, 0.5 * size])
+    goal = np.array([0.9 * size, 0.5 * size, 0.5 * size])
+    inner = 0.12 * size
+    thickness = 0.02 * size
+    outer = inner + thickness
+
+    boxes = [
+        # Closed side, facing the goal.
+        (center + [inner, -outer, -outer], center + [outer, outer, outer], WALL_COLOR),
+        (center + [-outer, -outer, -outer], center + [inner, -inner, outer], WALL_COLOR),
+        (center + [-outer, inner, -outer], center + [inner, outer, outer], WALL_COLOR),
+        (center + [-outer, -inner, -outer], center + [inner, inner, -inner], WALL_COLOR),
+        (center + [-outer, -inner, inner], center + [inner, inner, outer], WALL_COLOR),
+    ]
+    clutter = _random_boxes(rng, num_obstacles, [0, 0, 0], [size] * 3, 0.03 * size, 0.08 * size,
+                            [center, goal], outer + 0.05 * size)
+    return _map(size, size, center, goal, boxes + clutter)
+
+def building_map(rng, size=10.0, num_obstacles=30, floors=3, door=1.0):
+    """
+    A multi-floor building: floor slabs with a stairwell opening at alternating corners, an interior wall with a
+    door on every floor and some furniture. The start is on the ground floor and the goal on the top floor.
+
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the (cubic) map. Defaults to 10.
+    :param num_obstacles: The number of furniture boxes, spread over the floors. Defaults to 30.
+    :param floors: The number of floors. Defaults to 3.
+    :param door: The width of the doors and the stairwell openings. Defaults to 1.0.
+    :return: The map dictionary.
+    """
+    storey = size / floors
+    thickness = 0.02 * size
+    start = np.array([0.1 * size, 0.1 * size, 0.5 * storey])
+    goal = np.array([0.9 * size, 0.9 * size, (floors - 0.5) * storey])
+    corners = [np.array([0.05 * size, 0.05 * size]), np.array([size - 0.05 * size - door, size - 0.05 * size - door])]
+
+    boxes = []
+    holes = []
+    for k in range(1, floors):
+        hole_lo = corners[k % 2]
+        holes.append(hole_lo)
+        boxes.extend(_wall_with_hole(2, k * storey - thickness / 2, thickness, size, size, hole_lo, hole_lo + door))
+
+    for k in range(floors):
+        base = k * storey + thickness / 2
+        door_y = rng.uniform(0, size - door)
+        wall_x = 0.5 * size
+        boxes.append((np.array([wall_x, 0, base]), np.array([wall_x + thickness, door_y, base + storey - thickness]), WALL_COLOR))
+        boxes.append((np.array([wall_x, door_y + door, base]), np.array([wall_x + thickness, size, base + storey - thickness]), WALL_COLOR))
+
+        keep_clear = [start, goal] + [np.array([*(hole + door / 2), base]) for hole in holes]
+        boxes.extend(_random_boxes(rng, num_obstacles // floors, [0, 0, base], [size, size, base + 0.4 * storey],
+                                   0.04 * size, 0.1 * size, keep_clear, door))
+    return _map(size, size, start, goal, boxes)
+
+MAP_TYPES = {
+    "boxes": random_boxes_map,
+    "forest": forest_map,
+    "corridors": corridor_map,
+    "bugtrap": bug_trap_map,
+    "building": building_map,
+}
+
+def generate_map(kind, rng, size=10.0, num_obstacles=None):
+    """
+    Generates a map of one of the `MAP_TYPES`.
+
+    :param kind: The map type.
+    :param rng: The NumPy random generator.
+    :param size: The edge length of the map. Defaults to 10.
+    :param num_obstacles: The number of obstacles (see each generator). Defaults to None (the generator's default).
+    :return: The map dictionary.
+    """
+    if kind not in MAP_TYPES:
+        raise ValueError(f"Unknown map type: {kind}")
+    if num_obstacles is None:
+        return MAP_TYPES[kind](rng, size)
+    return MAP_TYPES[kind](rng, size, num_obstacles)
@@ -0,0 +1,165 @@
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from rrt import COLLISION_BACKENDS, PLANNERS, RRT, RRTSettings, create_checker
+from rrtCore.nearestNeighbour import NN_BACKENDS
+from benchmarks.map_generators import MAP_TYPES, generate_map
+
+# "boxes" only switches to the bounding-volume hierarchy above bvhThreshold obstacles, more than the generated maps
+# have, so the hierarchy is measured as its own configuration: the box backend with bvhThreshold=0.
+BENCHMARK_COLLISION_BACKENDS = COLLISION_BACKENDS + ("bvh",)
+
+"""
+    Runs every planner mode and backend over procedurally generated stress maps and many seeds, and reports the
+    median and 95th percentile of the time, node count and path length, and the success rate, as JSON.
+
+    Run from the repository root:
+        python -m benchmarks.planner_benchmark --seeds 10 --output report.json
+        python -m benchmarks.planner_benchmark --maps corridors bugtrap --planners rrt connect --nn-backends kdtree
+"""
+
+def parse_args(argv=None):
+    """
+    Parses the command-line arguments.
+
+    :param argv: The arguments, defaults to `sys.argv[1:]`.
+    :return: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the planners on procedurally generated maps.")
+    parser.add_argument("--maps", nargs="+", choices=list(MAP_TYPES), default=list(MAP_TYPES), help="Map types to generate.")
+    parser.add_argument("--size", type=float, default=10.0, help="Edge length of the generated maps.")
+    parser.add_argument("--obstacles", type=int, default=None, help="Number of obstacles of each map. Defaults to each generator's default.")
+    parser.add_argument("--map-seed", type=int, default=0, help="Seed of the map generator.")
+    parser.add_argument("--planners", nargs="+", choices=PLANNERS, default=list(PLANNERS))
+    parser.add_argument("--nn-backends", nargs="+", choices=NN_BACKENDS, default=list(NN_BACKENDS))
+    parser.add_argument("--collision-backends", nargs="+", choices=BENCHMARK_COLLISION_BACKENDS, default=list(BENCHMARK_COLLISION_BACKENDS),
+                        help="Collision backends; \"bvh\" is the box backend forced onto its bounding-volume hierarchy.")
+    parser.add_argument("--seeds", type=int, default=5, help="Number of seeded runs per configuration.")
+    parser.add_argument("--node-limit", type=int, default=5000)
+    parser.add_argument("--time-budget", type=float, default=2000, help="Time budget of every run in milliseconds.")
+    parser.add_argument("--safe-distance", type=float, default=1.0, help="The generated openings only keep their width close to 1.")
+    parser.add_argument("--output", "-o", default=None, help="Output file. Defaults to stdout.")
+    return parser.parse_args(argv)
+
+def summarise(values):
+    """
+    Computes the median and the 95th percentile of some values.
+
+    :param values: A list of numbers.
+    :return: A dictionary with "median" and "p95", or None if there are no values.
+    """
+    if not values:
+        return None
+    return {"median": float(np.median(values)), "p95": float(np.percentile(values, 95))}
+
+def path_length(waypoints):
+    """
+    Calculates the length of a path.
+
+    :param waypoints: A list of waypoints (x, y, z).
+    :return: The sum of the distances between consecutive waypoints.
+    """
+    if len(waypoints) < 2:
+        return 0.0
+    return float(np.linalg.norm(np.diff(np.asarray(waypoints, dtype=np.float64), axis=0), axis=1).sum())
+
+def run_configuration(map_data, settings, seeds):
+    """
+    Runs one planner configuration on a map with several seeds. The collision checker is built once and shared by
+    the runs; its build time is reported separately.
+
+    :param map_data: The map dictionary.
+    :param settings: The RRT settings.
+    :type settings: `RRTSettings`
+    :param seeds: The seeds of the runs.
+    :return: A summary dictionary.
+    """
+    t0 = time.perf_counter()
+    checker = create_checker(map_data["mapSize"], map_data["listObstacles"], settings)
+    setup_s = time.perf_counter() - t0
+
+    times = []
+    nodes = []
+    lengths = []
+    successes = 0
+    goal = np.asarray(map_data["posGoal"], dtype=np.float64)
+    for seed in seeds:
+        run_settings = copy.copy(settings)
+        run_settings.seed = seed
+        t0 = time.perf_counter()
+        rrt = RRT(map_data["mapSize"], map_data["posStart"], map_data["posGoal"], map_data["listObstacles"], run_settings, checker=checker)
+        waypoints, node_count, _ = rrt.main_logic()
+        times.append(time.perf_counter() - t0)
+        nodes.append(node_count)
+        if waypoints and np.linalg.norm(np.asarray(waypoints[-1]) - goal) < settings.goalDistance:
+            successes += 1
+            lengths.append(path_length(waypoints))
+
+    return {
+        "runs": len(seeds),
+        "success_rate": successes / len(seeds) if seeds else 0.0,
+        "setup_s": setup_s,
+        "time_s": summarise(times),
+        "nodes": summarise(nodes),
+        "path_length": summarise(lengths),
+    }
+
+def main(argv=None):
+    args = parse_args(argv)
+    base = RRTSettings(safeDistance=args.safe_distance, nodeLimit=args.node_limit, timeBudget=args.time_budget)
+    seeds = list(range(args.seeds))
+
+    report = {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(), "cpus": os.cpu_count()},
+        "parameters": {"size": args.size, "obstacles": args.obstacles, "map_seed": args.map_seed, "seeds": args.seeds,
+                       "node_limit": args.node_limit, "time_budget_ms": args.time_budget, "safe_distance": args.safe_distance},
+        "results": [],
+    }
+
+    for kind in args.maps:
+        map_data = generate_map(kind, np.random.default_rng(args.map_seed), args.size, args.obstacles)
+        for planner in args.planners:
+            # The PRM roadmap does not use the nearest-neighbour index, so it is run once per collision backend.
+            nn_backends = [None] if planner == "prm" else args.nn_backends
+            for nn_backend in nn_backends:
+                for collision_backend in args.collision_backends:
+                    settings = copy.copy(base)
+                    settings.planner = planner
+                    settings.nnBackend = nn_backend or base.nnBackend
+                    if collision_backend == "bvh":
+                        settings.collisionBackend = "boxes"
+                        settings.bvhThreshold = 0
+                    else:
+                        settings.collisionBackend = collision_backend
+
+                    # The planner reports its progress with print(); keep the output for the report.
+                    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                        summary = run_configuration(map_data, settings, seeds)
+
+                    entry = {"map": kind, "obstacles": len(map_data["listObstacles"]), "planner": planner,
+                             "nn_backend": nn_backend, "collision_backend": collision_backend}
+                    entry.update(summary)
+                    report["results"].append(entry)
+                    median = summary["time_s"]["median"] if summary["time_s"] else float("nan")
+                    print(f"{kind:>10} {planner:>8} {str(nn_backend):>7} {collision_backend:>6}  "
+                          f"success {summary['success_rate']:>5.0%}  median {median * 1e3:>8.1f} ms", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
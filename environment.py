@@ -1,6 +1,47 @@
 import numpy as np
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QWidget
 from pyqtgraph.opengl import GLViewWidget, GLGridItem, GLMeshItem, GLLinePlotItem
+from rrtCore.trajectory import Trajectory
+
+CUBE_CORNERS = np.array([
+    [-1, -1, -1], [1, -1, -1], [1, 1, -1], [-1, 1, -1],
+    [-1, -1, 1], [1, -1, 1], [1, 1, 1], [-1, 1, 1],
+], dtype=np.float32) / 2
+
+CUBE_FACES = np.array([
+    [0, 1, 2], [0, 2, 3],
+    [4, 5, 6], [4, 6, 7],
+    [0, 1, 5], [0, 5, 4],
+    [2, 3, 7], [2, 7, 6],
+    [1, 2, 6], [1, 6, 5],
+    [0, 3, 7], [0, 7, 4]
+], dtype=np.int32)
+
+CUBE_EDGES = np.array([
+    [0, 1], [1, 2], [2, 3], [3, 0],
+    [4, 5], [5, 6], [6, 7], [7, 4],
+    [0, 4], [1, 5], [2, 6], [3, 7]
+], dtype=np.int32)
+
+def cubes_geometry(positions, sizes):
+    """
+    Computes the geometry of many cubes at once.
+
+    :param positions: The center position of each cube, an (M, 3) array.
+    :param sizes: The dimensions of each cube, an (M, 3) array.
+    :return: A tuple containing:
+        - The vertices, an (8M, 3) array.
+        - The triangle faces, a (12M, 3) array of vertex indices.
+        - The edge segments, a (24M, 3) array of endpoints to draw with `mode='lines'`.
+    """
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 1, 3)
+    sizes = np.asarray(sizes, dtype=np.float32).reshape(-1, 1, 3)
+    verts = positions + CUBE_CORNERS * sizes
+    offsets = (np.arange(len(verts), dtype=np.int32) * 8)[:, None, None]
+    faces = (CUBE_FACES + offsets).reshape(-1, 3)
+    edges = verts[:, CUBE_EDGES.ravel()].reshape(-1, 3)
+    return verts.reshape(-1, 3), faces, edges
 
 class EnvSettings(object):
     """
@@ -11,14 +52,26 @@ class EnvSettings(object):
     :param goalColor: The color of the goal point (RGBA format). Defaults to (0, 0, 1, 1).
     :param obstacleColor: The color of obstacles (RGBA format). Defaults to (1, 0, 0, 1).
     :param boundary: Indicates whether to display a boundary. Defaults to True.
+    :param showTree: Indicates whether to draw the tree while the RRT grows it. Defaults to True.
+    :param treeColor: The color of the tree edges (RGBA format). Defaults to (0.5, 0.5, 0.5, 1).
+    :param treeRefreshRate: The maximum number of tree redraws per second. Defaults to 30.
+    :param smoothTrajectory: Indicates whether to draw the path as a smoothed, collision-checked trajectory instead of the raw polyline. Defaults to False.
+    :param maxVelocity: The maximum speed used to time-parameterise the smoothed trajectory. Defaults to 1.0.
+    :param maxAcceleration: The maximum tangential and centripetal acceleration used to time-parameterise the smoothed trajectory. Defaults to 1.0.
     """
-    def __init__(self, grid=True, startColor=(0, 1, 0, 1), goalColor=(0, 0, 1, 1), obstacleColor=(1, 0, 0, 1), boundary=True, displayResolution=(1920, 1080)):
+    def __init__(self, grid=True, startColor=(0, 1, 0, 1), goalColor=(0, 0, 1, 1), obstacleColor=(1, 0, 0, 1), boundary=True, displayResolution=(1920, 1080), showTree=True, treeColor=(0.5, 0.5, 0.5, 1), treeRefreshRate=30, smoothTrajectory=False, maxVelocity=1.0, maxAcceleration=1.0):
         self.grid = grid
         self.startColor = startColor
         self.goalColor = goalColor
         self.obstacleColor = obstacleColor
         self.boundary = boundary
         self.displayResolution = displayResolution
+        self.showTree = showTree
+        self.treeColor = treeColor
+        self.treeRefreshRate = treeRefreshRate
+        self.smoothTrajectory = smoothTrajectory
+        self.maxVelocity = maxVelocity
+        self.maxAcceleration = maxAcceleration
 
 class Environment(QMainWindow):
     """
@@ -45,6 +98,16 @@ class Environment(QMainWindow):
         self.trajectory = None
         self.settings = settings
         self.trajectory_items = []
+        self.scene_items = {}
+        self.obstacle_slots = {}
+        self.obstacle_ids = []
+        self.obstacle_verts = np.empty((0, 3), dtype=np.float32)
+        self.obstacle_colors = np.empty((0, 4), dtype=np.float32)
+        self.obstacle_edges = np.empty((0, 3), dtype=np.float32)
+        self.obstacle_faces = np.empty((0, 3), dtype=np.int32)
+        self.tree_edges = np.empty((0, 3), dtype=np.float32)
+        self.tree_count = 0
+        self.tree_dirty = False
 
         self.__initUI()
 
@@ -65,37 +128,80 @@ class Environment(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        self.tree_timer = QTimer(self)
+        self.tree_timer.setInterval(int(1000 / self.settings.treeRefreshRate))
+        self.tree_timer.timeout.connect(self.refresh_tree)
+
         self.updateView()
 
     def updateView(self):
         """
         Updates the view of the environment.
 
-        Clears the existing view and redraws all elements based on the current settings and data:
-        grid, boundary, start/goal points, obstacles, and trajectory.
+        Replaces the existing scene items and redraws all elements based on the current settings and data:
+        grid, boundary, start/goal points, obstacles and axes. Single edits should use `set_start`, `set_goal`,
+        `set_size`, `add_obstacle`, `update_obstacle` or `remove_obstacle`, which only change the affected items.
+        """
+        self.set_size(self.size)
+        self.set_start(self.start)
+        self.set_goal(self.goal)
+        self.create_obstacles(self.obstacles)
+        self.__replace_items("axes", self.add_coordinate_axes())
+
+    def __replace_items(self, key, items):
+        """
+        Removes the scene items tracked under a key and tracks the new ones instead.
+
+        :param key: The name of the scene element (e.g. "grid", "start").
+        :param items: The new items, already added to the view.
+        """
+        for item in self.scene_items.pop(key, []):
+            self.view.removeItem(item)
+        if items:
+            self.scene_items[key] = items
+
+    def set_size(self, size):
         """
+        Sets the environment size and redraws the grid and the boundary.
 
+        :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+        """
+        self.size = size
+
+        grid = []
         if self.settings.grid:
-            grid = self.add_grid()
-            self.view.addItem(grid)
+            grid = [self.add_grid()]
+            self.view.addItem(grid[0])
+        self.__replace_items("grid", grid)
 
+        boundary = []
         if self.settings.boundary:
-            self.create_boundary()        
+            boundary = [self.create_boundary()]
+        self.__replace_items("boundary", boundary)
 
-        if self.start:
-            self.create_cube(self.start, (0.2, 0.2, 0.2), self.settings.startColor)
+    def set_start(self, start):
+        """
+        Sets the start position and moves its marker.
 
-        if self.goal:
-            self.create_cube(self.goal, (0.2, 0.2, 0.2), self.settings.goalColor)
+        :param start: The starting position (x, y, z), or None to remove it.
+        """
+        self.start = start
+        items = []
+        if self.start:
+            items = self.create_cube(self.start, (0.2, 0.2, 0.2), self.settings.startColor)
+        self.__replace_items("start", items)
 
-        for obstacle_data in self.obstacles:
-            _, pos, size, color = obstacle_data
-            if color is None:
-                self.create_cube(pos, size, self.settings.obstacleColor)
-            else:
-                self.create_cube(pos, size, color)
+    def set_goal(self, goal):
+        """
+        Sets the goal position and moves its marker.
 
-        self.add_coordinate_axes()
+        :param goal: The goal position (x, y, z), or None to remove it.
+        """
+        self.goal = goal
+        items = []
+        if self.goal:
+            items = self.create_cube(self.goal, (0.2, 0.2, 0.2), self.settings.goalColor)
+        self.__replace_items("goal", items)
 
     def add_grid(self):
         """Adds (or updates) the grid to the environment."""
@@ -111,7 +217,11 @@ class Environment(QMainWindow):
         return grid
     
     def add_coordinate_axes(self):
-        """Adds X, Y, and Z axes at (0, 0, 0)."""
+        """
+        Adds X, Y, and Z axes at (0, 0, 0).
+
+        :return: The three axis items.
+        """
         x_axis = GLLinePlotItem(pos=np.array([[0, 0, 0], [1, 0, 0]], dtype=np.float32), color=(1, 0, 0, 1), width=3, antialias=True)
         self.view.addItem(x_axis)
 
@@ -121,6 +231,8 @@ class Environment(QMainWindow):
         z_axis = GLLinePlotItem(pos=np.array([[0, 0, 0], [0, 0, 1]], dtype=np.float32), color=(0, 0, 1, 1), width=3, antialias=True)
         self.view.addItem(z_axis)
 
+        return [x_axis, y_axis, z_axis]
+
     def create_cube(self, pos, size, color):
         """
         Creates a cube in the 3D environment.
@@ -128,41 +240,178 @@ class Environment(QMainWindow):
         :param pos: The center position of the cube (x, y, z).
         :param size: The dimensions of the cube (width, length, height).
         :param color: The color of the cube (RGBA).
+        :return: The mesh and edge items of the cube.
         """
-        x, y, z = pos
-        sx, sy, sz = size
-
-        verts = np.array([
-            [x - sx/2, y - sy/2, z - sz/2],
-            [x + sx/2, y - sy/2, z - sz/2],
-            [x + sx/2, y + sy/2, z - sz/2],
-            [x - sx/2, y + sy/2, z - sz/2],
-            [x - sx/2, y - sy/2, z + sz/2],
-            [x + sx/2, y - sy/2, z + sz/2],
-            [x + sx/2, y + sy/2, z + sz/2],
-            [x - sx/2, y + sy/2, z + sz/2],
-        ], dtype=np.float32)
-        faces = np.array([
-            [0, 1, 2], [0, 2, 3],
-            [4, 5, 6], [4, 6, 7],
-            [0, 1, 5], [0, 5, 4],
-            [2, 3, 7], [2, 7, 6],
-            [1, 2, 6], [1, 6, 5],
-            [0, 3, 7], [0, 7, 4]
-        ],  dtype=np.int32)
+        verts, faces, edges = cubes_geometry([pos], [size])
 
         mesh = GLMeshItem(vertexes=verts, faces=faces, smooth=True, color=color, drawEdges=False, glOptions='opaque')
         self.view.addItem(mesh)
 
-        edges = np.array([
-            [0, 1], [1, 2], [2, 3], [3, 0],
-            [4, 5], [5, 6], [6, 7], [7, 4],
-            [0, 4], [1, 5], [2, 6], [3, 7]
-        ], dtype=np.int32)
+        lines = GLLinePlotItem(pos=edges, color=(0, 0, 0, 1), width=2, antialias=True, mode='lines')
+        self.view.addItem(lines)
+
+        return [mesh, lines]
+
+    def create_obstacles(self, obstacles):
+        """
+        Creates all the obstacles as a single mesh with per-vertex colors and a single line item for their edges,
+        so the number of scene items does not depend on the number of obstacles.
+
+        Each obstacle keeps a slot in merged vertex, color, edge and face buffers whose capacity doubles when they are
+        full, so `add_obstacle`, `update_obstacle` and `remove_obstacle` only write one slot (amortised O(1)). The
+        upload to the mesh and line items is still O(M) in the number of obstacles: pyqtgraph has no partial buffer
+        update, and the mesh recomputes its normals on every change.
 
-        for edge in edges:
-            line = GLLinePlotItem(pos=verts[edge], color=(0, 0, 0, 1), width=2, antialias=True)
-            self.view.addItem(line)
+        :param obstacles: A list of obstacles [id, pos, size, color]. Obstacles without color use `obstacleColor`.
+        """
+        self.obstacles = obstacles
+        self.obstacle_ids = [obstacle_data[0] for obstacle_data in obstacles]
+        self.obstacle_slots = {obstacle_id: slot for slot, obstacle_id in enumerate(self.obstacle_ids)}
+
+        count = len(obstacles)
+        self.obstacle_verts = np.empty((0, 3), dtype=np.float32)
+        self.obstacle_colors = np.empty((0, 4), dtype=np.float32)
+        self.obstacle_edges = np.empty((0, 3), dtype=np.float32)
+        self.__reserve_obstacles(count)
+        if obstacles:
+            positions = [obstacle_data[1] for obstacle_data in obstacles]
+            sizes = [obstacle_data[2] for obstacle_data in obstacles]
+            colors = np.array([self.__obstacle_color(obstacle_data) for obstacle_data in obstacles], dtype=np.float32)
+            verts, _, edges = cubes_geometry(positions, sizes)
+            self.obstacle_verts[:count*8] = verts
+            self.obstacle_colors[:count*8] = np.repeat(colors, 8, axis=0)
+            self.obstacle_edges[:count*24] = edges
+
+        self.__replace_items("obstacles", [])
+        self.__upload_obstacles()
+
+    def __reserve_obstacles(self, count):
+        """
+        Grows the obstacle buffers, doubling their capacity, so they can hold at least `count` obstacles.
+
+        :param count: The number of obstacles the buffers must hold.
+        """
+        capacity = len(self.obstacle_verts) // 8
+        if count <= capacity and len(self.obstacle_faces) == capacity * 12:
+            return
+        new_capacity = max(count, 2 * capacity, 16)
+        used = min(len(self.obstacle_ids), capacity)
+
+        verts = np.zeros((new_capacity * 8, 3), dtype=np.float32)
+        colors = np.zeros((new_capacity * 8, 4), dtype=np.float32)
+        edges = np.zeros((new_capacity * 24, 3), dtype=np.float32)
+        verts[:used*8] = self.obstacle_verts[:used*8]
+        colors[:used*8] = self.obstacle_colors[:used*8]
+        edges[:used*24] = self.obstacle_edges[:used*24]
+        self.obstacle_verts = verts
+        self.obstacle_colors = colors
+        self.obstacle_edges = edges
+        self.obstacle_faces = (CUBE_FACES + (np.arange(new_capacity, dtype=np.int32) * 8)[:, None, None]).reshape(-1, 3)
+
+    def __write_obstacle(self, slot, obstacle_data):
+        """
+        Writes the geometry and color of an obstacle into its slot of the buffers.
+
+        :param slot: The slot of the obstacle.
+        :param obstacle_data: The obstacle [id, pos, size, color].
+        """
+        verts, _, edges = cubes_geometry([obstacle_data[1]], [obstacle_data[2]])
+        self.obstacle_verts[slot*8:(slot + 1)*8] = verts
+        self.obstacle_colors[slot*8:(slot + 1)*8] = self.__obstacle_color(obstacle_data)
+        self.obstacle_edges[slot*24:(slot + 1)*24] = edges
+
+    def add_obstacle(self, obstacle_data):
+        """
+        Adds an obstacle to the environment, in the next free slot of the buffers.
+
+        :param obstacle_data: The obstacle [id, pos, size, color].
+        """
+        slot = len(self.obstacle_ids)
+        self.__reserve_obstacles(slot + 1)
+        self.obstacles.append(obstacle_data)
+        self.obstacle_slots[obstacle_data[0]] = slot
+        self.obstacle_ids.append(obstacle_data[0])
+        self.__write_obstacle(slot, obstacle_data)
+        self.__upload_obstacles()
+
+    def update_obstacle(self, obstacle_data):
+        """
+        Replaces an obstacle with the same id.
+
+        :param obstacle_data: The new obstacle data [id, pos, size, color].
+        """
+        slot = self.obstacle_slots[obstacle_data[0]]
+        for i, data in enumerate(self.obstacles):
+            if data[0] == obstacle_data[0]:
+                self.obstacles[i] = obstacle_data
+                break
+
+        self.__write_obstacle(slot, obstacle_data)
+        self.__upload_obstacles()
+
+    def remove_obstacle(self, obstacle_id):
+        """
+        Removes an obstacle. The last slot of the buffers is moved into the freed one; the capacity is kept.
+
+        :param obstacle_id: The id of the obstacle.
+        """
+        slot = self.obstacle_slots.pop(obstacle_id)
+        for i, data in enumerate(self.obstacles):
+            if data[0] == obstacle_id:
+                del self.obstacles[i]
+                break
+
+        last = len(self.obstacle_ids) - 1
+        if slot != last:
+            moved_id = self.obstacle_ids[last]
+            self.obstacle_ids[slot] = moved_id
+            self.obstacle_slots[moved_id] = slot
+            self.obstacle_verts[slot*8:(slot + 1)*8] = self.obstacle_verts[last*8:(last + 1)*8]
+            self.obstacle_colors[slot*8:(slot + 1)*8] = self.obstacle_colors[last*8:(last + 1)*8]
+            self.obstacle_edges[slot*24:(slot + 1)*24] = self.obstacle_edges[last*24:(last + 1)*24]
+
+        self.obstacle_ids.pop()
+        self.__upload_obstacles()
+
+    def __obstacle_color(self, obstacle_data):
+        """
+        Gets the color of an obstacle.
+
+        :param obstacle_data: The obstacle [id, pos, size, color].
+        :return: The obstacle color, or `obstacleColor` if it has none.
+        """
+        color = obstacle_data[3]
+        return self.settings.obstacleColor if color is None else color
+
+    def __upload_obstacles(self):
+        """
+        Sends the used part of the obstacle buffers to the obstacle mesh and edge items, creating them if needed. The
+        items receive views of the buffers, not copies; this upload is the O(M) part of an edit.
+        """
+        count = len(self.obstacle_ids)
+        if count == 0:
+            self.__replace_items("obstacles", [])
+            return
+
+        faces = self.obstacle_faces[:count*12]
+        verts = self.obstacle_verts[:count*8]
+        colors = self.obstacle_colors[:count*8]
+        edges = self.obstacle_edges[:count*24]
+
+        items = self.scene_items.get("obstacles")
+        if items:
+            mesh, lines = items
+            mesh.setMeshData(vertexes=verts, faces=faces, vertexColors=colors)
+            lines.setData(pos=edges)
+            return
+
+        mesh = GLMeshItem(vertexes=verts, faces=faces, vertexColors=colors, smooth=True, drawEdges=False, glOptions='opaque')
+        self.view.addItem(mesh)
+
+        lines = GLLinePlotItem(pos=edges, color=(0, 0, 0, 1), width=2, antialias=True, mode='lines')
+        self.view.addItem(lines)
+
+        self.scene_items["obstacles"] = [mesh, lines]
 
     def create_boundary(self):
         """
@@ -170,6 +419,8 @@ class Environment(QMainWindow):
 
         The boundary is rendered as a set of red lines outlining the environment's extents.
         It uses the environment's `size` attribute to determine the boundary dimensions.
+
+        :return: The boundary item.
         """
         min_x, max_x = self.size[0]
         min_y, max_y = self.size[1]
@@ -195,16 +446,70 @@ class Environment(QMainWindow):
         boundary = GLLinePlotItem(pos=boundary_lines, color=(1, 0, 0, 1), width=2, antialias=True)
         self.view.addItem(boundary)
 
+        return boundary
+
     def plotTrajectory(self, waypoints):
         """
         Plots the trajectory (path) in the environment.  Adds to self.trajectory_items.
 
-        :param waypoints: A list of 3D points (x, y, z) representing the waypoints of the trajectory.
+        :param waypoints: A list of 3D points (x, y, z) representing the waypoints of the trajectory, or a smoothed `Trajectory`, which is drawn as its sampled curve.
         """
-        trajectory_line = GLLinePlotItem(pos=np.array(waypoints, dtype=np.float32), color=(0, 0, 0, 1), width=8, antialias=True)
+        if isinstance(waypoints, Trajectory):
+            _, positions = waypoints.sample_uniform(max(200, 20 * len(waypoints.waypoints)))
+        else:
+            positions = waypoints
+        trajectory_line = GLLinePlotItem(pos=np.array(positions, dtype=np.float32), color=(0, 0, 0, 1), width=8, antialias=True)
         self.view.addItem(trajectory_line)
         self.trajectory_items.append(trajectory_line)
 
+    def begin_tree(self, capacity=4096):
+        """
+        Starts drawing a new tree. Removes the previous tree and preallocates the edge buffer.
+
+        :param capacity: The initial number of edges the buffer can hold. It doubles when full.
+        """
+        self.__replace_items("tree", [])
+        self.tree_edges = np.empty((2 * capacity, 3), dtype=np.float32)
+        self.tree_count = 0
+        self.tree_dirty = False
+
+        if self.settings.showTree:
+            tree_line = GLLinePlotItem(pos=self.tree_edges[:0], color=self.settings.treeColor, width=1, antialias=True, mode='lines')
+            self.view.addItem(tree_line)
+            self.__replace_items("tree", [tree_line])
+            self.tree_timer.start()
+
+    def append_tree_edges(self, edges):
+        """
+        Appends new tree edges to the buffer. They are drawn at the next refresh, at most `treeRefreshRate` times per second.
+
+        :param edges: A (2K, 3) array with the endpoints of K edges.
+        """
+        if not self.settings.showTree:
+            return
+
+        end = self.tree_count + len(edges)
+        if end > len(self.tree_edges):
+            grown = np.empty((max(end, 2 * len(self.tree_edges)), 3), dtype=np.float32)
+            grown[:self.tree_count] = self.tree_edges[:self.tree_count]
+            self.tree_edges = grown
+        self.tree_edges[self.tree_count:end] = edges
+        self.tree_count = end
+        self.tree_dirty = True
+
+    def refresh_tree(self):
+        """Uploads the tree edge buffer to its line item if new edges arrived since the last refresh."""
+        items = self.scene_items.get("tree")
+        if not self.tree_dirty or not items:
+            return
+        items[0].setData(pos=self.tree_edges[:self.tree_count])
+        self.tree_dirty = False
+
+    def end_tree(self):
+        """Draws the remaining tree edges and stops the refresh timer."""
+        self.tree_timer.stop()
+        self.refresh_tree()
+
     def clear_scene(self):
         """Clears only the trajectory lines from the scene."""
         for item in self.trajectory_items:
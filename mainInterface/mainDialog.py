@@ -1,9 +1,15 @@
 from environment import Environment
-from rrt import RRTSettings, search
-from PyQt5.QtWidgets import QMessageBox, QPushButton, QApplication, QHBoxLayout
+from rrt import RRTSettings
+from rrtCore.resultsSink import ResultsSink
+from rrtCore.trajectory import Trajectory
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLabel, QMessageBox, QPushButton, QHBoxLayout, QProgressDialog
 from .multiTestDialog import MultiTestDialog
+from .multiTestWorker import MultiTestWorker
+from .planningWorker import PlanningWorker
 from .rrtConfigDialog import RRTConfigDialog
-import time
+
+MULTI_TEST_RESULTS = "multi-testResults.csv"
 
 class EnvironmentWindow(Environment):
     """
@@ -19,13 +25,18 @@ class EnvironmentWindow(Environment):
     def __init__(self, size, obs, start, goal, settings):
         super().__init__(size, obs, start, goal, settings)
         self.rrt_settings = RRTSettings()
+        self.planning_worker = None
         self.add_buttons()
 
 
     def add_buttons(self):
-        """Adds 'Run RRT', 'Configure RRT', and 'Multi-Test' buttons."""
-        rrt_button = QPushButton("Run RRT")
-        rrt_button.clicked.connect(self.run_rrt)
+        """Adds 'Run RRT', 'Cancel', 'Configure RRT', and 'Multi-Test' buttons, and the label that shows the stats of profiled searches."""
+        self.rrt_button = QPushButton("Run RRT")
+        self.rrt_button.clicked.connect(self.run_rrt)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(self.cancel_rrt)
+        self.cancel_button.setEnabled(False)
 
         config_rrt_button = QPushButton("Configure RRT")
         config_rrt_button.clicked.connect(self.configure_rrt)
@@ -33,15 +44,21 @@ class EnvironmentWindow(Environment):
         multi_test_button = QPushButton("Multi-Test")
         multi_test_button.clicked.connect(self.run_multi_test)
 
+        self.stats_label = QLabel()
+        self.stats_label.setWordWrap(True)
+        self.stats_label.setVisible(False)
+
         central_widget = self.centralWidget()
         if central_widget:
             layout = central_widget.layout()
             if layout:
                 button_layout = QHBoxLayout()
-                button_layout.addWidget(rrt_button)
+                button_layout.addWidget(self.rrt_button)
+                button_layout.addWidget(self.cancel_button)
                 button_layout.addWidget(config_rrt_button)
                 button_layout.addWidget(multi_test_button)
                 layout.addLayout(button_layout)
+                layout.addWidget(self.stats_label)
             else:
                 print("Error: No layout found in central widget.")
         else:
@@ -55,69 +72,154 @@ class EnvironmentWindow(Environment):
 
 
     def run_rrt(self):
-        """Executes the RRT search and plots the trajectory."""
+        """Starts the RRT search in a background thread. The trajectory is plotted when it finishes."""
         if self.start is None or self.goal is None:
             QMessageBox.warning(self, "Start/Goal Not Set", "Please set both start and goal points before running RRT.")
             return
 
-        waypoints = search(self.size, self.start, self.goal, self.obstacles, self.rrt_settings)
-        if waypoints is not None:
+        self.planning_worker = PlanningWorker(self.size, self.start, self.goal, self.obstacles, self.rrt_settings)
+        self.planning_worker.progress.connect(self.on_rrt_progress)
+        self.planning_worker.planned.connect(self.on_rrt_planned)
+        self.planning_worker.failed.connect(self.on_rrt_failed)
+        self.planning_worker.edges.connect(self.append_tree_edges)
+        self.clear_scene()
+        self.begin_tree()
+
+        self.rrt_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.statusBar().showMessage("Planning...")
+        self.planning_worker.start()
+
+    def cancel_rrt(self):
+        """Cancels the running RRT search."""
+        if self.planning_worker is not None:
+            self.planning_worker.cancel()
+
+    def on_rrt_progress(self, nodes, best_distance):
+        """
+        Shows the progress of the running search.
+
+        :param nodes: The number of nodes in the tree.
+        :param best_distance: The best distance to the goal so far.
+        """
+        self.statusBar().showMessage(f"Planning... Nodes: {nodes} | Best distance to goal: {best_distance:.3f}")
+
+    def on_rrt_failed(self, message):
+        """
+        Restores the controls after the search raised an error, and shows the error.
+
+        :param message: The error message.
+        """
+        self.rrt_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.end_tree()
+        self.stats_label.setVisible(False)
+        self.statusBar().showMessage(f"Search failed: {message}")
+        QMessageBox.critical(self, "Search Failed", message)
+
+    def on_rrt_planned(self, waypoints, nodes, cancelled, stats):
+        """
+        Plots the trajectory found by the search, unless it was cancelled, and shows the per-phase stats if the search was profiled.
+
+        :param waypoints: The waypoints of the path.
+        :param nodes: The number of nodes in the tree.
+        :param cancelled: Whether the search was cancelled.
+        :param stats: The per-phase stats of the search, or None.
+        :type stats: `PlannerStats`
+        """
+        self.rrt_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.end_tree()
+
+        self.stats_label.setVisible(stats is not None)
+        if stats is not None:
+            self.stats_label.setText(f"Profile: {stats.summary()}")
+
+        if cancelled:
+            self.statusBar().showMessage(f"Search cancelled after {nodes} nodes.")
+            return
+
+        self.statusBar().showMessage(f"Search finished. Nodes: {nodes} | Waypoints: {len(waypoints)}")
+        if waypoints:
             self.clear_scene()
-            self.plotTrajectory(waypoints)
+            if self.settings.smoothTrajectory:
+                trajectory = Trajectory(waypoints, self.settings.maxVelocity, self.settings.maxAcceleration, checker=self.planning_worker.rrt.checker)
+                self.statusBar().showMessage(f"Search finished. Nodes: {nodes} | Waypoints: {len(waypoints)} | Length: {trajectory.length:.3f} | Duration: {trajectory.duration:.2f} s")
+                self.plotTrajectory(trajectory)
+            else:
+                self.plotTrajectory(waypoints)
             self.update()
 
-
     def run_multi_test(self):
-        """Opens a dialog to configure and run multiple RRT tests."""
-
-        def run_test(i, num_tests, visualization):
-            """
-            Inner function to run a single test.
-            
-            :param i: actual index.
-            :param num_tests: number of test to do.
-            :param visualization: boolean to plot the trajectory.
-            """
-            file = open("multi-testLog.log", "a")
-            try:
-                if visualization:
-                    waypoints = search(self.size, self.start, self.goal, self.obstacles, self.rrt_settings)
-                    if waypoints is not None:
-                        self.plotTrajectory(waypoints)
-                        self.update()
-                        QApplication.processEvents()
-                else:
-                    waypoints = search(self.size, self.start, self.goal, self.obstacles, self.rrt_settings)
-
-                if waypoints is not None:
-                    print(f"{i + 1}/{num_tests}")
-                    file.write(f"{i + 1}/{num_tests} - Nodes: " + str(len(waypoints)) + "\n")
-                else:
-                    print(f"{i + 1}/{num_tests} - No path found")
-                    file.write(f"{i + 1}/{num_tests} - No path found\n")
-            except Exception as e:
-                print(f"Error during test {i+1}: {e}")
-                file.write(f"Error during test {i+1}: {str(e)}\n")
-
-            finally:
-                file.close()
-
+        """Opens a dialog to configure and run multiple RRT tests on a process pool."""
         dialog = MultiTestDialog(self.rrt_settings)
         if dialog.exec_():
             num_tests = dialog.get_num_tests()
-            visualization = dialog.get_visualization()
+            self.multi_test_visualization = dialog.get_visualization()
             self.rrt_settings = dialog.get_rrt_settings()
 
             if self.start is None or self.goal is None:
                 QMessageBox.warning(self, "Start/Goal Not Set", "Please set both start and goal points before running RRT.")
                 return
 
-            file = open("multi-testLog.log", "a")
-            file.write("\n--- New Test ---\n")
-            file.write("- RRT Settings -\n")
-            file.write(f"safeDistance: {self.rrt_settings.safeDistance} | goalDistance: {self.rrt_settings.goalDistance} | nodeDistance: {self.rrt_settings.nodeDistance} | nodeLimit: {self.rrt_settings.nodeLimit} | quadrants: {self.rrt_settings.quadrants} | numQuadrantsPerAxis: {self.rrt_settings.numQuadrantsPerAxis} | quadrantProb: {self.rrt_settings.quadrantProb}\n")
-            file.close()
-            for i in range(num_tests):
+            self.multi_test_worker = MultiTestWorker(self.size, self.start, self.goal, self.obstacles, self.rrt_settings, num_tests)
+            self.multi_test_done = 0
+            self.multi_test_total = num_tests
+
+            self.multi_test_results = ResultsSink(MULTI_TEST_RESULTS, self.rrt_settings)
+
+            self.multi_test_progress = QProgressDialog("Running tests...", "Cancel", 0, num_tests, self)
+            self.multi_test_progress.setWindowTitle("Multi-Test")
+            self.multi_test_progress.setWindowModality(Qt.WindowModal)
+            self.multi_test_progress.canceled.connect(self.multi_test_worker.requestInterruption)
+
+            self.multi_test_worker.trialFinished.connect(self.on_multi_test_trial)
+            self.multi_test_worker.finished.connect(self.on_multi_test_finished)
+            self.multi_test_worker.start()
+
+    def on_multi_test_trial(self, result):
+        """
+        Records a finished multi-test trial and updates the progress view.
+
+        :param result: The trial result, see `MultiTestRunner.run`.
+        """
+        self.multi_test_done += 1
+        i = result["index"]
+        num_tests = self.multi_test_total
+        waypoints = result["waypoints"]
+
+        self.multi_test_results.write({
+            "run": i,
+            "seed": result["seed"],
+            "success": result["success"],
+            "nodes": result["nodes"],
+            "waypoint_count": len(waypoints) if waypoints else 0,
+            "path_length": result["path_length"],
+            "time_s": result["time_s"],
+            "error": result["error"],
+        })
+
+        if result["error"] is not None:
+            print(f"Error during test {i+1}: {result['error']}")
+        elif waypoints:
+            print(f"{i + 1}/{num_tests} - Seed: {result['seed']} - Nodes: {result['nodes']}")
+            if self.multi_test_visualization:
                 self.clear_scene()
-                run_test(i, num_tests, visualization)
-                time.sleep(0.5)
\ No newline at end of file
+                self.plotTrajectory(waypoints)
+                self.update()
+        else:
+            print(f"{i + 1}/{num_tests} - No path found")
+
+        self.multi_test_progress.setValue(self.multi_test_done)
+
+    def on_multi_test_finished(self):
+        """Writes the remaining multi-test results and their summary, and closes the progress view."""
+        summary = self.multi_test_results.close()
+        self.multi_test_progress.reset()
+
+        message = f"Multi-test finished. Successful: {summary['successes']}/{summary['runs']}"
+        if summary["nodes"] is not None:
+            message += f" | Median nodes: {summary['nodes']['median']:.0f} | Median time: {summary['time_s']['median'] * 1e3:.1f} ms"
+        if summary["path_length"] is not None:
+            message += f" | Median length: {summary['path_length']['median']:.3f}"
+        self.statusBar().showMessage(f"{message} | Results: {MULTI_TEST_RESULTS}")
@@ -0,0 +1,34 @@
+import multiprocessing
+from PyQt5.QtCore import QThread, pyqtSignal
+from rrtCore.multiTest import MultiTestRunner
+
+class MultiTestWorker(QThread):
+    """
+    Runs a multi-test on a process pool from a background thread, so the GUI keeps responding.
+
+    :param size: The dimensions of the environment (width, length, height).
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param obs: A list of obstacles.
+    :param rrt_settings: Settings for the RRT algorithm.
+    :type rrt_settings: `RRTSettings`
+    :param num_tests: The number of tests to run.
+    """
+    trialFinished = pyqtSignal(dict)
+
+    def __init__(self, size, start, goal, obs, rrt_settings, num_tests):
+        super().__init__()
+        # Forking a process that runs Qt is unsafe, the workers are spawned instead.
+        self.runner = MultiTestRunner(size, start, goal, obs, rrt_settings, num_tests,
+                                      mp_context=multiprocessing.get_context("spawn"))
+
+    def run(self):
+        """Emits `trialFinished` for each trial as it completes. Stops early if an interruption is requested."""
+        results = self.runner.run()
+        try:
+            for result in results:
+                self.trialFinished.emit(result)
+                if self.isInterruptionRequested():
+                    break
+        finally:
+            results.close()
@@ -0,0 +1,48 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from rrt import RRT
+
+class PlanningWorker(QThread):
+    """
+    Runs the RRT search in a background thread, so the view keeps rendering while it plans.
+
+    :param size: The dimensions of the environment (width, length, height).
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param obs: A list of obstacles.
+    :param rrt_settings: Settings for the RRT algorithm.
+    :type rrt_settings: `RRTSettings`
+    """
+    progress = pyqtSignal(int, float)
+    planned = pyqtSignal(list, int, bool, object)
+    edges = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, size, start, goal, obs, rrt_settings):
+        super().__init__()
+        # Not stored as `self.start`, which would hide QThread.start.
+        self.rrt_args = (size, start, goal, obs, rrt_settings)
+        self.rrt = None
+        self.cancelled = False
+
+    def run(self):
+        """
+        Builds the search (including its collision checker, which can take seconds for the voxel and sdf backends) and
+        runs it. Emits `progress` (node count, best distance to the goal) and `edges` (chunks of new tree edges) while it
+        runs, and `planned` (waypoints, node count, cancelled, per-phase stats or None) at the end. If building or
+        running the search raises, `failed` (the error message) is emitted instead of `planned`.
+        """
+        try:
+            self.rrt = RRT(*self.rrt_args)
+            if self.cancelled:
+                self.rrt.cancel()
+            waypoints, nodes, stats = self.rrt.main_logic(progress_callback=self.progress.emit, edge_callback=self.edges.emit)
+        except Exception as e:
+            self.failed.emit(f"{type(e).__name__}: {e}")
+            return
+        self.planned.emit(waypoints, nodes, self.rrt.cancelled, stats)
+
+    def cancel(self):
+        """Stops the search at its next iteration, or as soon as it is built if it has not started yet."""
+        self.cancelled = True
+        if self.rrt is not None:
+            self.rrt.cancel()
@@ -1,5 +1,6 @@
-from PyQt5.QtWidgets import QCheckBox, QMessageBox, QPushButton, QLineEdit, QDialog, QFormLayout, QLabel
-from rrt import RRTSettings
+from PyQt5.QtWidgets import QCheckBox, QComboBox, QMessageBox, QPushButton, QLineEdit, QDialog, QFormLayout, QLabel
+from rrt import COLLISION_BACKENDS, PLANNERS, RRTSettings
+from rrtCore.nearestNeighbour import NN_BACKENDS
 
 class RRTConfigDialog(QDialog):
     """
@@ -17,12 +18,48 @@ class RRTConfigDialog(QDialog):
         self.nodeLimit = QLineEdit(str(settings.nodeLimit))
         self.numQuadrantsPerAxis = QLineEdit(str(settings.numQuadrantsPerAxis))
         self.quadrantProb = QLineEdit(str(settings.quadrantProb))
+        self.timeBudget = QLineEdit("" if settings.timeBudget is None else str(settings.timeBudget))
+        self.timeBudget.setPlaceholderText("No limit")
+        self.shortcutIterations = QLineEdit(str(settings.shortcutIterations))
+        self.prmSamples = QLineEdit(str(settings.prmSamples))
+        self.seed = QLineEdit("" if settings.seed is None else str(settings.seed))
+        self.seed.setPlaceholderText("Random")
+        self.planner = QComboBox()
+        self.planner.addItems(PLANNERS)
+        self.planner.setCurrentText(settings.planner)
+        self.nnBackend = QComboBox()
+        self.nnBackend.addItems(NN_BACKENDS)
+        self.nnBackend.setCurrentText(settings.nnBackend)
+        self.collisionBackend = QComboBox()
+        self.collisionBackend.addItems(COLLISION_BACKENDS)
+        self.collisionBackend.setCurrentText(settings.collisionBackend)
+        self.voxelResolution = QLineEdit("" if settings.voxelResolution is None else str(settings.voxelResolution))
+        self.voxelResolution.setPlaceholderText("From the node distance")
+        self.clearance = QLineEdit(str(settings.clearance))
 
         self.layout = QFormLayout()
         self.layout.addRow("Safety distance to obstacles:", self.safeDistance)
         self.layout.addRow("Minimum distance to goal:", self.goalDistance)
         self.layout.addRow("Distance between nodes:", self.nodeDistance)
         self.layout.addRow("Maximum number of expanded nodes:", self.nodeLimit)
+        self.layout.addRow("Time budget (ms):", self.timeBudget)
+        self.layout.addRow("Planner:", self.planner)
+        self.informed_check = QCheckBox("Informed sampling (star planner)")
+        self.informed_check.setChecked(settings.informed)
+        self.layout.addRow(self.informed_check)
+        self.layout.addRow("Roadmap nodes (prm planner):", self.prmSamples)
+        self.layout.addRow("Nearest-neighbour backend:", self.nnBackend)
+        self.layout.addRow("Collision backend:", self.collisionBackend)
+        self.layout.addRow("Voxel resolution:", self.voxelResolution)
+        self.layout.addRow("Clearance (sdf backend):", self.clearance)
+        self.prune_check = QCheckBox("Prune path (line of sight)")
+        self.prune_check.setChecked(settings.prunePath)
+        self.layout.addRow(self.prune_check)
+        self.layout.addRow("Shortcut iterations:", self.shortcutIterations)
+        self.layout.addRow("Random seed:", self.seed)
+        self.profile_check = QCheckBox("Profile planner phases")
+        self.profile_check.setChecked(settings.profile)
+        self.layout.addRow(self.profile_check)
 
         self.quadrants_check = QCheckBox("Use quadrants?")
         self.quadrants_check.setChecked(settings.quadrants)
@@ -75,6 +112,18 @@ class RRTConfigDialog(QDialog):
             settings.goalDistance = float(self.goalDistance.text())
             settings.nodeDistance = float(self.nodeDistance.text())
             settings.nodeLimit = int(self.nodeLimit.text())
+            settings.timeBudget = float(self.timeBudget.text()) if self.timeBudget.text().strip() else None
+            settings.planner = self.planner.currentText()
+            settings.informed = self.informed_check.isChecked()
+            settings.prmSamples = int(self.prmSamples.text())
+            settings.nnBackend = self.nnBackend.currentText()
+            settings.collisionBackend = self.collisionBackend.currentText()
+            settings.voxelResolution = float(self.voxelResolution.text()) if self.voxelResolution.text().strip() else None
+            settings.clearance = float(self.clearance.text())
+            settings.prunePath = self.prune_check.isChecked()
+            settings.shortcutIterations = int(self.shortcutIterations.text())
+            settings.seed = int(self.seed.text()) if self.seed.text().strip() else None
+            settings.profile = self.profile_check.isChecked()
             settings.quadrants = self.quadrants_check.isChecked()
 
             if settings.quadrants:
@@ -74,8 +74,7 @@ class ButtonManager:
                     QMessageBox.warning(self.environment, "Out of Bounds", "Start point coordinates are outside the environment bounds.")
                     return
 
-                self.environment.start = (x, y, z)
-                self.environment.updateView()
+                self.environment.set_start((x, y, z))
             except ValueError as e:
                 QMessageBox.critical(self.environment, "Error", str(e))
 
@@ -93,8 +92,7 @@ class ButtonManager:
                     QMessageBox.warning(self.environment, "Out of Bounds", "Goal point coordinates are outside the environment bounds.")
                     return
                 
-                self.environment.goal = (x, y, z)
-                self.environment.updateView()
+                self.environment.set_goal((x, y, z))
             except ValueError as e:
                 QMessageBox.critical(self.environment, "Error", str(e))
 
@@ -118,9 +116,8 @@ class ButtonManager:
                     QMessageBox.warning(self.environment, "Invalid Size", "Obstacle size must be positive.")
                     return
 
-                self.environment.obstacles.append([obstacle_id, pos, size, color])
+                self.environment.add_obstacle([obstacle_id, pos, size, color])
                 self.size_input_dialog.next_obstacle_id += 1
-                self.environment.updateView()
                 self.obstacle_sidebar.update_obstacle_list()
                 
             except ValueError as e:
@@ -146,13 +143,7 @@ class ButtonManager:
                     QMessageBox.warning(self.environment, "Invalid Size", "Obstacle size must be positive.")
                     return
                 
-                # Find and update the obstacle in the environment's obstacle list.
-                for i, data in enumerate(self.environment.obstacles):
-                    if data[0] == obstacle_id:
-                        self.environment.obstacles[i] = [obstacle_id, pos, size, color]
-                        break
-
-                self.environment.updateView()
+                self.environment.update_obstacle([obstacle_id, pos, size, color])
                 self.obstacle_sidebar.update_obstacle_list()
 
 
@@ -163,15 +154,8 @@ class ButtonManager:
         """Deletes the selected obstacle."""
         obstacle_id = obstacle_data[0]
 
-        index_to_remove = -1
-        for i, data in enumerate(self.environment.obstacles):
-            if data[0] == obstacle_id:
-                index_to_remove = i
-                break
-
-        if index_to_remove != -1:
-            del self.environment.obstacles[index_to_remove]
-            self.environment.updateView()
+        if obstacle_id in self.environment.obstacle_slots:
+            self.environment.remove_obstacle(obstacle_id)
             self.obstacle_sidebar.update_obstacle_list()
 
     def edit_map_limits(self):
@@ -181,8 +165,7 @@ class ButtonManager:
         if result == QDialog.Accepted:
             try:
                 new_size = dialog.get_new_size()
-                self.environment.size = new_size
-                self.environment.updateView()
+                self.environment.set_size(new_size)
 
             except ValueError as e:
                 QMessageBox.critical(self.environment, "Error", str(e))
@@ -1,7 +1,85 @@
-import random as rd
+import copy
+import functools
+import math
+import os
+import time
 import numpy as np
+from rrtCore.nearestNeighbour import create_nearest_neighbour
+from rrtCore.collisionChecker import BoxCollisionChecker, inflated_boxes
+from rrtCore.bvh import BVHCollisionChecker
+from rrtCore.occupancyGrid import OccupancyGridChecker
+from rrtCore.distanceField import DistanceFieldChecker
+from rrtCore.tree import Tree
+from rrtCore.sampler import Sampler
+from rrtCore.deadline import Deadline
+from rrtCore.pathProcessing import prune_path, shortcut_path
+from rrtCore.resultCache import canonical_hash, environment_hash, map_hash, open_result_cache
+from rrtCore.roadmap import build_roadmap, default_radius, load_roadmap
+from rrtCore.profiler import PlannerStats
+
+PLANNERS = ("rrt", "connect", "star", "prm")
+COLLISION_BACKENDS = ("boxes", "voxel", "sdf")
+# Settings that only change where things are stored, not the path that is found.
+STORAGE_SETTINGS = ("voxelCacheDir", "resultCache", "resultCacheSize", "roadmapDir")
+# Settings the PRM roadmap depends on; the start, the goal and the other settings only change the queries.
+ROADMAP_SETTINGS = ("safeDistance", "collisionBackend", "voxelResolution", "clearance", "nodeDistance", "seed", "prmSamples", "prmRadius")
+
+def result_key(size, start, goal, obs, rrt_settings):
+    """
+    Builds the key of a search in the result cache from the map content and the settings.
+
+    :param size: The dimensions of the environment.
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param obs: A list of obstacles.
+    :param rrt_settings: Settings for the RRT algorithm.
+    :type rrt_settings: `RRTSettings`
+    :return: A hex digest.
+    """
+    settings = {name: value for name, value in vars(rrt_settings).items() if name not in STORAGE_SETTINGS}
+    return canonical_hash({"map": map_hash(size, start, goal, obs), "settings": settings})
+
+def is_cacheable(rrt_settings):
+    """
+    Checks whether the result of a search can be stored in and answered from the result cache: a result cache is set,
+    the search is seeded (unseeded searches are not reproducible), it has no time budget (how far it gets depends on
+    the speed of the machine) and it is not profiled (cached results have no per-phase stats).
+
+    :param rrt_settings: Settings for the RRT algorithm.
+    :type rrt_settings: `RRTSettings`
+    :return: True if the search is cacheable, False otherwise.
+    """
+    return (rrt_settings.resultCache is not None and rrt_settings.seed is not None
+            and rrt_settings.timeBudget is None and not rrt_settings.profile)
+
+def create_checker(size, obs, rrt_settings):
+    """
+    Creates the collision engine selected by the settings, over the obstacles inflated by `safeDistance`.
 
-def search(size, start, goal, obs, rrt_settings):
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param obs: A list of obstacles.
+    :param rrt_settings: Settings for the RRT algorithm.
+    :type rrt_settings: `RRTSettings`
+    :return: The collision checker.
+    """
+    positions = [obstacle[1] for obstacle in obs]
+    sizes = [obstacle[2] for obstacle in obs]
+    box_min, box_max = inflated_boxes(positions, sizes, rrt_settings.safeDistance)
+    if rrt_settings.collisionBackend == "voxel":
+        resolution = rrt_settings.voxelResolution or rrt_settings.nodeDistance / 2
+        return OccupancyGridChecker(box_min, box_max, size, resolution, rrt_settings.voxelCacheDir)
+    if rrt_settings.collisionBackend == "sdf":
+        resolution = rrt_settings.voxelResolution or rrt_settings.nodeDistance / 4
+        # Exact up to the distance that lets a whole new edge be cleared by a single lookup.
+        max_distance = rrt_settings.clearance + rrt_settings.nodeDistance + 2 * math.sqrt(3) * resolution
+        return DistanceFieldChecker(box_min, box_max, size, resolution, rrt_settings.clearance, max_distance)
+    if rrt_settings.collisionBackend != "boxes":
+        raise ValueError(f"Unknown collision backend: {rrt_settings.collisionBackend}")
+    if len(box_min) > rrt_settings.bvhThreshold:
+        return BVHCollisionChecker(box_min, box_max)
+    return BoxCollisionChecker(box_min, box_max)
+
+def search(size, start, goal, obs, rrt_settings, planner=None, time_budget=None):
     """
     Performs a search using the RRT algorithm.
 
@@ -12,12 +90,31 @@ def search(size, start, goal, obs, rrt_settings):
     :param obs_sizes: A list of obstacle sizes (width, length, height).
     :param rrt_settings: Settings for the RRT algorithm.
     :type rrt_settings: `RRTSettings`
+    :param planner: The planner to use, one of `PLANNERS`. Defaults to `rrt_settings.planner`.
+    :param time_budget: The time budget in milliseconds; the best path found when it runs out is returned. Defaults to `rrt_settings.timeBudget`.
     :return: A list of waypoints representing the path found by the RRT algorithm, or an empty list if no path is found.
     """
-
+    if planner is not None or time_budget is not None:
+        rrt_settings = copy.copy(rrt_settings)
+        if planner is not None:
+            rrt_settings.planner = planner
+        if time_budget is not None:
+            rrt_settings.timeBudget = time_budget
+
+    cache = None
+    if is_cacheable(rrt_settings):
+        cache = open_result_cache(rrt_settings.resultCache, rrt_settings.resultCacheSize)
+        key = result_key(size, start, goal, obs, rrt_settings)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry["waypoints"]
+
+    t0 = time.perf_counter()
     rrt_class = RRT(size, start, goal, obs, rrt_settings)
-    waypoints, _ = rrt_class.main_logic()
-    
+    waypoints, nodes, _ = rrt_class.main_logic()
+
+    if cache is not None:
+        cache.put(key, waypoints, nodes, time.perf_counter() - t0)
     return waypoints
 
 # --- RRT --- #
@@ -35,8 +132,27 @@ class RRTSettings(object):
     :param quadrants: Whether to use quadrant-based sampling. Defaults to False.
     :param numQuadrantsPerAxis: The number of quadrants per axis if quadrant-based sampling is enabled. Defaults to 2.
     :param quadrantProb: The probability of sampling from a quadrant (as opposed to the whole space). Defaults to 0.5.
+    :param nnBackend: The nearest-neighbour index used to find the closest node: "brute", "kdtree" or "voxel". Defaults to "kdtree".
+    :param bvhThreshold: The number of obstacles above which collision checks use a bounding-volume hierarchy. Defaults to 2000.
+    :param seed: The seed of the random generator. Runs with the same seed and settings are reproducible. Defaults to None (random).
+    :param planner: The planner: "rrt" grows a single tree from the start, "connect" (RRT-Connect) grows trees from both the start and the goal and tries to connect them on every iteration, "star" (RRT*) keeps improving the path with neighbourhood rewiring until the iteration (nodeLimit) or time budget runs out, "prm" builds a roadmap of the whole map once and answers every start/goal pair with A* on it. Defaults to "rrt".
+    :param rewireRadius: The maximum radius of the RRT* neighbourhood. Defaults to None (twice the nodeDistance).
+    :param timeBudget: The time budget of the search in milliseconds. When it runs out, the best path found so far is returned. Defaults to None (only nodeLimit applies).
+    :param informed: Whether RRT* samples only the region that can improve the best path once a solution exists (Informed RRT*). Defaults to False.
+    :param prunePath: Whether to remove the waypoints that can be skipped with a straight, collision-free segment. Defaults to False.
+    :param shortcutIterations: The number of random shortcut attempts made on the path after planning. Defaults to 0.
+    :param collisionBackend: The collision engine: "boxes" tests the inflated obstacle boxes directly (through a bounding-volume hierarchy above bvhThreshold obstacles), "voxel" precomputes a bit-packed occupancy grid whose checks do not depend on the number of obstacles, "sdf" precomputes a signed distance field that keeps paths at least clearance away from the obstacles and rejects samples closer than that. Defaults to "boxes".
+    :param voxelResolution: The edge length of a voxel of the occupancy grid, or of the distance field. Defaults to None (half the nodeDistance, a quarter of it for the distance field).
+    :param voxelCacheDir: A directory where occupancy grids are cached, so repeated runs on the same map skip building them. Defaults to None (no cache).
+    :param clearance: The distance paths keep from the (inflated) obstacles with the "sdf" collision backend. Unlike safeDistance it is added to every obstacle, so thin obstacles get the same margin as thick ones. Defaults to 0.
+    :param resultCache: The SQLite file where `search` and the batch runner cache their results, keyed by the map content and these settings. Only seeded searches without a time budget or profiling are cached (see `is_cacheable`). Defaults to None (no cache).
+    :param resultCacheSize: The size limit of the cached results in bytes; the least recently used results are evicted above it. Defaults to 64 MiB.
+    :param prmSamples: The number of free nodes of the PRM roadmap. Defaults to 2000.
+    :param prmRadius: The maximum length of a PRM roadmap edge. Defaults to None (about 15 neighbours per node).
+    :param roadmapDir: A directory where PRM roadmaps are saved, keyed by the map obstacles and the roadmap settings, so later queries on the same map load them instead of building them. Defaults to None (no persistence).
+    :param profile: Whether `main_logic` counts and times every phase of the search (sampling, nearest-neighbour queries, steering and collision checks) and returns the stats. Defaults to False.
     """
-    def __init__(self, safeDistance=1.75, goalDistance=0.3, nodeDistance=0.3, nodeLimit=5000, quadrants=False, numQuadrantsPerAxis=2, quadrantProb=0.5):
+    def __init__(self, safeDistance=1.75, goalDistance=0.3, nodeDistance=0.3, nodeLimit=5000, quadrants=False, numQuadrantsPerAxis=2, quadrantProb=0.5, nnBackend="kdtree", bvhThreshold=2000, seed=None, planner="rrt", rewireRadius=None, timeBudget=None, informed=False, prunePath=False, shortcutIterations=0, collisionBackend="boxes", voxelResolution=None, voxelCacheDir=None, clearance=0.0, resultCache=None, resultCacheSize=64 * 1024 * 1024, prmSamples=2000, prmRadius=None, roadmapDir=None, profile=False):
         self.safeDistance = safeDistance
         self.goalDistance = goalDistance
         self.nodeDistance = nodeDistance
@@ -44,6 +160,25 @@ class RRTSettings(object):
         self.quadrants = quadrants
         self.numQuadrantsPerAxis= numQuadrantsPerAxis
         self.quadrantProb = quadrantProb
+        self.nnBackend = nnBackend
+        self.bvhThreshold = bvhThreshold
+        self.seed = seed
+        self.planner = planner
+        self.rewireRadius = rewireRadius
+        self.timeBudget = timeBudget
+        self.informed = informed
+        self.prunePath = prunePath
+        self.shortcutIterations = shortcutIterations
+        self.collisionBackend = collisionBackend
+        self.voxelResolution = voxelResolution
+        self.voxelCacheDir = voxelCacheDir
+        self.clearance = clearance
+        self.resultCache = resultCache
+        self.resultCacheSize = resultCacheSize
+        self.prmSamples = prmSamples
+        self.prmRadius = prmRadius
+        self.roadmapDir = roadmapDir
+        self.profile = profile
 
 class RRT(object):
     """
@@ -55,27 +190,36 @@ class RRT(object):
     :param obs: A list of obstacles.
     :param settings: Settings for the RRT algorithm.
     :type settings: RRTSettings
+    :param checker: An already built collision checker of this map (see `create_checker`), shared by many searches. Defaults to None (built from the obstacles).
+    :param roadmap: An already built PRM roadmap of this map, used by the "prm" planner instead of loading or building one. Defaults to None.
     """
-    def __init__(self, size, start, goal, obs, settings):
+    def __init__(self, size, start, goal, obs, settings, checker=None, roadmap=None):
         self.size = size
         self.start = start
         self.goal = goal
-        self.obs = []
-        self.obs_sizes = []
+        self.map_obstacles = obs
         self.use_quadrants = settings.quadrants
         self.settings = settings
 
-        for obstacle in obs:
-            _, obs, size, _ = obstacle
-            self.obs.append(obs)
-            self.obs_sizes.append(size)
+        self.checker = checker if checker is not None else create_checker(self.size, self.map_obstacles, settings)
+        self.roadmap = roadmap
 
+        self.cancelled = False
+        self.solutions = []
+        self.stats = None
+        self.rng = np.random.default_rng(settings.seed)
+        self.t_quadrant = None
         if settings.quadrants:
             self.quadrant_prob = settings.quadrantProb
             self.num_quadrants_per_axis = settings.numQuadrantsPerAxis
-            self.num_quadrants = settings.numQuadrantsPerAxis**3
             self.quadrants = self.__create_quadrants()
-            self.t_quadrant = None
+            self.t_quadrant = self.__find_quadrant(self.goal)
+
+        reject = self.checker.points_collide if settings.collisionBackend == "sdf" else None
+        if self.t_quadrant is not None:
+            self.sampler = Sampler(self.size, self.rng, self.quadrants[self.t_quadrant], self.quadrant_prob, reject=reject)
+        else:
+            self.sampler = Sampler(self.size, self.rng, reject=reject)
 
     def __create_quadrants(self):
         """
@@ -103,79 +247,19 @@ class RRT(object):
                     ))
         return quadrants
 
-    def __check_quadrant(self, node, quadrant):
-        """
-        Checks if a node is within a given quadrant.
-
-        :param node: The node to check (x, y, z).
-        :param quadrant: The quadrant to check against, represented by two tuples: ((min_x, min_y, min_z), (max_x, max_y, max_z)).
-        :return: True if the node is within the quadrant, False otherwise.
+    def __find_quadrant(self, node):
         """
-        x, y, z = node
-        qx_min, qy_min, qz_min = quadrant[0]
-        qx_max, qy_max, qz_max = quadrant[1]
-        return qx_min <= x <= qx_max and qy_min <= y <= qy_max and qz_min <= z <= qz_max
+        Finds the quadrant that contains a node.
 
-    def __create_new_node(self):
+        :param node: The node to look for (x, y, z).
+        :return: The index of the first quadrant containing the node, or None if it is outside every quadrant.
         """
-        Creates a new random node, with optional bias towards the goal quadrant.
-
-        :return: The new node's coordinates [x, y, z].
-        """
-        if self.use_quadrants:
-            if self.t_quadrant is None:
-                for i, quad in enumerate(self.quadrants):
-                    if self.__check_quadrant(self.goal, quad):
-                        self.t_quadrant = i
-                        break
-            if self.t_quadrant is not None and rd.random() < self.quadrant_prob:
-                quadrant = self.quadrants[self.t_quadrant]
-                x = rd.uniform(quadrant[0][0], quadrant[1][0])
-                y = rd.uniform(quadrant[0][1], quadrant[1][1])
-                z = rd.uniform(quadrant[0][2], quadrant[1][2])
-                return [x, y, z]
-
-        x = rd.uniform(self.size[0][0], self.size[0][1])
-        y = rd.uniform(self.size[1][0], self.size[1][1])
-        z = rd.uniform(self.size[2][0], self.size[2][1])
-        return [x, y, z]
-
-    def __check_obstacles(self, initial, objective, center, size):
-        """
-        Checks for collisions between a line segment and an obstacle.
-
-        :param initial: The starting point of the line segment (x, y, z).
-        :param objective: The ending point of the line segment (x, y, z).
-        :param center: The center of the obstacle (x, y, z).
-        :param size: The size of the obstacle (width, length, height).
-        :return: True if there is a collision, False otherwise.
-        """
-        p1 = np.array(initial)
-        p2 = np.array(objective)
-        v = p2 - p1
-
-        half_size = np.array(size) / 2 * self.settings.safeDistance
-
-        min_vertex = np.array(center) - half_size
-        max_vertex = np.array(center) + half_size
-
-        t_min = -np.inf
-        t_max = np.inf
-
-        for i in range(3):
-            if v[i] == 0:
-                if p1[i] < min_vertex[i] or p1[i] > max_vertex[i]:
-                    return True
-            else:
-                t1 = (min_vertex[i] - p1[i]) / v[i]
-                t2 = (max_vertex[i] - p1[i]) / v[i]
-                t_min = max(t_min, min(t1, t2))
-                t_max = min(t_max, max(t1, t2))
-
-        if t_min > t_max or t_max < 0 or t_min > 1:
-            return False
-        else:
-            return True
+        bounds = np.array(self.quadrants, dtype=np.float64)
+        point = np.asarray(node, dtype=np.float64)
+        inside = np.all((bounds[:, 0] <= point) & (point <= bounds[:, 1]), axis=1)
+        if not inside.any():
+            return None
+        return int(np.argmax(inside))
 
     def __calculate_distance(self, p1, p2):
         """
@@ -206,88 +290,520 @@ class RRT(object):
             new_waypoint = np.array(actual_node) + max_dist * unit_vector
             return list(new_waypoint)
 
-    def main_logic(self):
+    def cancel(self):
         """
-        The main logic of the RRT algorithm.
+        Asks a running `main_logic` to stop. It can be called from another thread; the search stops at its next iteration.
+        """
+        self.cancelled = True
 
+    def main_logic(self, progress_callback=None, progress_interval=500, edge_callback=None, edge_chunk=256, solution_callback=None):
+        """
+        The main logic of the RRT algorithm. Runs the planner selected by `settings.planner`, then post-processes the path
+        (see `prunePath` and `shortcutIterations`).
+
+        :param progress_callback: Optional function called every `progress_interval` iterations with the number of nodes and the best distance to the goal so far.
+        :param progress_interval: The number of iterations between progress reports. Defaults to 500.
+        :param edge_callback: Optional function called with the new tree edges, in chunks of `edge_chunk` edges, as a (2K, 3) array of segment endpoints. The remaining edges are sent when the search ends.
+        :param edge_chunk: The number of edges per chunk. Defaults to 256.
+        :param solution_callback: Optional function called with the elapsed time in milliseconds, the path length and the waypoints every time a new best solution is found.
+            Every solution is also recorded in `solutions` as a dictionary with the keys time_ms, cost and nodes.
         :return: A tuple containing:
             - A list of waypoints representing the path found (or an empty list if no path is found).
             - The total number of nodes generated.
+            - The per-phase stats of the search (`PlannerStats`) if `settings.profile` is enabled, None otherwise.
         """
-        completed = False
-        label = 0
-        root_label = 0
-        rwp = []
-        waypoints = []
-        center_obs = []
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+        self.edge_callback = edge_callback
+        self.edge_chunk = edge_chunk
+        self.solution_callback = solution_callback
+        self.solutions = []
+
+        budget = self.settings.timeBudget
+        self.deadline = Deadline(math.inf if budget is None else budget)
+
+        if not self.settings.profile:
+            self.stats = None
+            waypoints, nodes = self.__plan()
+            return self.__post_process(waypoints), nodes, None
+
+        # The collision checker and the sampler may be shared, so they are wrapped by proxies instead of being modified.
+        self.stats = PlannerStats()
+        checker, sampler = self.checker, self.sampler
+        self.checker = self.stats.profiled(checker, {"segment_collides": "collision"})
+        self.sampler = self.stats.profiled(sampler, {"next": "sampling", "batch": "sampling"})
+        self.__check_distance = self.stats.timed("steering", functools.partial(RRT.__check_distance, self))
+        t0 = time.perf_counter_ns()
+        try:
+            waypoints, nodes = self.__plan()
+            waypoints = self.__post_process(waypoints)
+        finally:
+            self.stats.total_ns = time.perf_counter_ns() - t0
+            self.checker, self.sampler = checker, sampler
+            del self.__check_distance
+        return waypoints, nodes, self.stats
+
+    def __plan(self):
+        """
+        Runs the planner selected by `settings.planner`.
 
-        waypoints.append([list(self.start), label, root_label])
+        :return: A tuple (waypoints, nodes), see `main_logic`.
+        """
+        if self.settings.planner == "rrt":
+            return self.__rrt_logic()
+        elif self.settings.planner == "connect":
+            return self.__connect_logic()
+        elif self.settings.planner == "star":
+            return self.__star_logic()
+        elif self.settings.planner == "prm":
+            return self.__prm_logic()
+        else:
+            raise ValueError(f"Unknown planner: {self.settings.planner}")
 
-        for obs, size in zip(self.obs, self.obs_sizes):
-            center = np.array(obs) + np.array(size) / 2
-            center_obs.append(center)
+    def __create_nearest_neighbour(self):
+        """
+        Creates an empty nearest-neighbour index of the selected backend, profiled if the search is.
 
-        while not completed:
-            label += 1
-            if label > self.settings.nodeLimit:  # Check if maximum nodes reached
-                print("Maximum nodes reached. Returning current path.")
-                break  # Exit the loop
+        :return: The nearest-neighbour index.
+        """
+        nn = create_nearest_neighbour(self.settings.nnBackend, self.settings.nodeDistance)
+        if self.stats is not None:
+            nn = self.stats.profiled(nn, {"nearest": "nearest_neighbour", "within": "nearest_neighbour", "add": "nn_insert"})
+        return nn
 
-            new_node = self.__create_new_node()
+    def __post_process(self, waypoints):
+        """
+        Shortens the path with random shortcuts and line-of-sight pruning, checked against the same inflated obstacles.
+        Pruning runs last, so it also removes the waypoints left over by the shortcuts.
 
-            nearest_dist = float('inf')
-            nearest_waypoint = None
-            nearest_label = None
+        :param waypoints: A list of waypoints [x, y, z].
+        :return: The processed list of waypoints.
+        """
+        if self.settings.shortcutIterations > 0:
+            waypoints = shortcut_path(waypoints, self.checker, self.settings.shortcutIterations, self.rng)
+        if self.settings.prunePath:
+            waypoints = prune_path(waypoints, self.checker)
+        return waypoints
 
-            for waypoint in waypoints:
-                dist = self.__calculate_distance(waypoint[0], new_node)
-                if dist < nearest_dist:
-                    nearest_dist = dist
-                    nearest_waypoint = waypoint[0]
-                    nearest_label = waypoint[1]
+    def __stop_requested(self):
+        """
+        Checks whether the search must stop because it was cancelled or its time budget ran out.
 
-            if nearest_waypoint is None:
+        :return: True if the search must stop, False otherwise.
+        """
+        if self.cancelled:
+            print("Search cancelled. Returning current path.")
+            return True
+        if self.deadline.expired():
+            print("Time budget reached. Returning best path found.")
+            return True
+        return False
+
+    def __build_stop_requested(self):
+        """
+        Checks whether the roadmap build must stop because the search was cancelled or its time budget ran out. Unlike
+        `__stop_requested`, it reads the clock on every call: the build checks it per edge, not per node.
+
+        :return: True if the build must stop, False otherwise.
+        """
+        if self.cancelled:
+            print("Search cancelled while building the roadmap.")
+            return True
+        if self.deadline.passed():
+            print("Time budget reached while building the roadmap.")
+            return True
+        return False
+
+    def __report_solution(self, cost, nodes, waypoints):
+        """
+        Records a new best solution and passes it to the solution callback.
+
+        :param cost: The length of the path.
+        :param nodes: The number of nodes when it was found.
+        :param waypoints: The waypoints of the path. Only needed if there is a solution callback.
+        """
+        solution = {"time_ms": self.deadline.elapsed_ms(), "cost": cost, "nodes": nodes}
+        self.solutions.append(solution)
+        if self.solution_callback is not None:
+            self.solution_callback(solution["time_ms"], cost, waypoints)
+
+    def __path_length(self, waypoints):
+        """
+        Calculates the length of a path.
+
+        :param waypoints: A list of waypoints (x, y, z).
+        :return: The sum of the distances between consecutive waypoints.
+        """
+        if len(waypoints) < 2:
+            return 0.0
+        return float(np.linalg.norm(np.diff(np.asarray(waypoints, dtype=np.float64), axis=0), axis=1).sum())
+
+    def __rrt_logic(self):
+        """
+        Grows a single tree from the start until a node is within `goalDistance` of the goal.
+
+        See `main_logic` for the parameters and the return value.
+        """
+        tree = Tree(self.settings.nodeLimit + 1)
+        tree.add(self.start, -1)
+        nn = self.__create_nearest_neighbour()
+        nn.add(self.start)
+        best_distance = self.__calculate_distance(self.start, self.goal)
+        best_index = 0
+        streamed = 1
+        goal_index = None
+
+        for iteration in range(1, self.settings.nodeLimit + 1):
+            if self.__stop_requested():
+                break
+
+            if self.progress_callback is not None and iteration % self.progress_interval == 0:
+                self.progress_callback(len(tree), best_distance)
+
+            new_node = self.sampler.next()
+
+            nearest_index, _ = nn.nearest(new_node)
+            if nearest_index is None:
                 continue
 
+            nearest_waypoint = tree.positions[nearest_index]
             new_waypoint = self.__check_distance(nearest_waypoint, new_node, self.settings.nodeDistance)
 
-            collision = False
-            for i in range(len(self.obs)):
-                if self.__check_obstacles(nearest_waypoint, new_waypoint, center_obs[i], self.obs_sizes[i]):
-                    collision = True
-                    break
-
-            if collision:
+            if self.checker.segment_collides(nearest_waypoint, new_waypoint):
                 continue
 
-            waypoints.append([list(new_waypoint), label, nearest_label])
+            new_index = tree.add(new_waypoint, nearest_index)
+            nn.add(new_waypoint)
 
-            if self.__calculate_distance(new_waypoint, self.goal) < self.settings.goalDistance:
+            if self.edge_callback is not None and len(tree) - streamed >= self.edge_chunk:
+                self.edge_callback(tree.edges(streamed, len(tree)))
+                streamed = len(tree)
+
+            goal_distance = self.__calculate_distance(new_waypoint, self.goal)
+            if goal_distance < best_distance:
+                best_distance = goal_distance
+                best_index = new_index
+            if goal_distance < self.settings.goalDistance:
                 print("Goal reached")
-                completed = True
-                back_waypoint = waypoints[-1]
-                print("Number of nodes:", len(waypoints))
-
-                while back_waypoint[1] != back_waypoint[2]:
-                    rwp.append(list(back_waypoint[0]))
-                    for tmp_waypoint in waypoints:
-                        if tmp_waypoint[1] == back_waypoint[2]:
-                            back_waypoint = tmp_waypoint
-                            break
-                rwp.append(list(back_waypoint[0]))
-                rwp.reverse()
-                return rwp, len(waypoints)
-        
-        if len(waypoints) > 0: 
-            back_waypoint = waypoints[-1]
-            while back_waypoint[1] != back_waypoint[2]:
-                rwp.append(list(back_waypoint[0]))
-                for tmp_waypoint in waypoints:
-                    if tmp_waypoint[1] == back_waypoint[2]:
-                        back_waypoint = tmp_waypoint
+                print("Number of nodes:", len(tree))
+                goal_index = new_index
+                break
+        else:
+            print("Maximum nodes reached. Returning best path found.")
+
+        if self.edge_callback is not None and len(tree) > streamed:
+            self.edge_callback(tree.edges(streamed, len(tree)))
+
+        if goal_index is None:
+            return tree.path(best_index), len(tree)
+
+        waypoints = tree.path(goal_index)
+        self.__report_solution(self.__path_length(waypoints), len(tree), waypoints)
+        return waypoints, len(tree)
+
+    def __extend(self, tree, nn, target):
+        """
+        Extends a tree one step (at most `nodeDistance`) from its nearest node towards a target.
+
+        :param tree: The tree to extend.
+        :type tree: `Tree`
+        :param nn: The nearest-neighbour index of the tree.
+        :param target: The target position (x, y, z).
+        :return: A tuple (index, reached): the index of the new node, or None if the step collides or the tree is full,
+            and whether the new node is the target.
+        """
+        if len(tree) == len(tree.positions):
+            return None, False
+
+        nearest_index, _ = nn.nearest(target)
+        nearest_waypoint = tree.positions[nearest_index]
+        new_waypoint = self.__check_distance(nearest_waypoint, target, self.settings.nodeDistance)
+
+        if self.checker.segment_collides(nearest_waypoint, new_waypoint):
+            return None, False
+
+        new_index = tree.add(new_waypoint, nearest_index)
+        nn.add(new_waypoint)
+        return new_index, new_waypoint is target
+
+    def __closer_to_goal(self, waypoint, index, best_index, best_distance):
+        """
+        Keeps track of the node of the start tree that is closest to the goal.
+
+        :param waypoint: The position of a new node of the start tree (x, y, z).
+        :param index: The index of the new node.
+        :param best_index: The index of the closest node so far.
+        :param best_distance: The distance from the closest node so far to the goal.
+        :return: A tuple (best_index, best_distance), updated if the new node is closer to the goal.
+        """
+        distance = self.__calculate_distance(waypoint, self.goal)
+        if distance < best_distance:
+            return index, distance
+        return best_index, best_distance
+
+    def __connect_logic(self):
+        """
+        RRT-Connect: grows one tree from the start and one from the goal. Each iteration extends one tree towards a
+        random sample, then greedily extends the other tree towards the new node until it is reached or blocked.
+        The trees swap roles after every iteration.
+
+        See `main_logic` for the parameters and the return value. The path ends exactly at the goal.
+        """
+        start_tree = Tree(self.settings.nodeLimit + 1)
+        goal_tree = Tree(self.settings.nodeLimit + 1)
+        start_nn = self.__create_nearest_neighbour()
+        goal_nn = self.__create_nearest_neighbour()
+        start_tree.add(self.start, -1)
+        start_nn.add(self.start)
+        goal_tree.add(self.goal, -1)
+        goal_nn.add(self.goal)
+
+        tree_a, nn_a, tree_b, nn_b = start_tree, start_nn, goal_tree, goal_nn
+        streamed = {id(start_tree): 1, id(goal_tree): 1}
+        best_distance = self.__calculate_distance(self.start, self.goal)
+        best_index = 0
+        best_goal_distance = best_distance
+        connection = None
+
+        for iteration in range(1, self.settings.nodeLimit + 1):
+            if self.__stop_requested():
+                break
+
+            if self.progress_callback is not None and iteration % self.progress_interval == 0:
+                self.progress_callback(len(start_tree) + len(goal_tree), best_distance)
+
+            if len(start_tree) == len(start_tree.positions) or len(goal_tree) == len(goal_tree.positions):
+                break
+
+            new_index, _ = self.__extend(tree_a, nn_a, self.sampler.next())
+            if new_index is not None:
+                target = tree_a.positions[new_index].copy()
+                if tree_a is start_tree:
+                    best_index, best_goal_distance = self.__closer_to_goal(target, new_index, best_index, best_goal_distance)
+                while True:
+                    connect_index, reached = self.__extend(tree_b, nn_b, target)
+                    if connect_index is None:
+                        break
+                    if tree_b is start_tree:
+                        best_index, best_goal_distance = self.__closer_to_goal(tree_b.positions[connect_index], connect_index,
+                                                                               best_index, best_goal_distance)
+                    best_distance = min(best_distance, self.__calculate_distance(tree_b.positions[connect_index], target))
+                    if reached:
+                        connection = (new_index, connect_index) if tree_a is start_tree else (connect_index, new_index)
                         break
-            rwp.append(list(back_waypoint[0]))
-            rwp.reverse()
-            return rwp, len(waypoints)
+
+            if self.edge_callback is not None:
+                for tree in (start_tree, goal_tree):
+                    if len(tree) - streamed[id(tree)] >= self.edge_chunk:
+                        self.edge_callback(tree.edges(streamed[id(tree)], len(tree)))
+                        streamed[id(tree)] = len(tree)
+
+            if connection is not None:
+                print("Goal reached")
+                print("Number of nodes:", len(start_tree) + len(goal_tree))
+                break
+
+            tree_a, nn_a, tree_b, nn_b = tree_b, nn_b, tree_a, nn_a
         else:
-            return [], 0
\ No newline at end of file
+            print("Maximum nodes reached. Returning best path found.")
+
+        if self.edge_callback is not None:
+            for tree in (start_tree, goal_tree):
+                if len(tree) > streamed[id(tree)]:
+                    self.edge_callback(tree.edges(streamed[id(tree)], len(tree)))
+
+        nodes = len(start_tree) + len(goal_tree)
+        if connection is None:
+            return start_tree.path(best_index), nodes
+
+        start_index, goal_index = connection
+        goal_path = goal_tree.path(goal_index)
+        goal_path.reverse()
+        waypoints = start_tree.path(start_index) + goal_path[1:]
+        self.__report_solution(self.__path_length(waypoints), nodes, waypoints)
+        return waypoints, nodes
+
+    def __rewire_radius(self, num_nodes):
+        """
+        Calculates the RRT* neighbourhood radius, which shrinks as the tree grows: min(gamma * (log(n) / n)^(1/3), rewireRadius).
+
+        :param num_nodes: The number of nodes in the tree.
+        :return: The neighbourhood radius.
+        """
+        max_radius = self.settings.rewireRadius
+        if max_radius is None:
+            max_radius = 2 * self.settings.nodeDistance
+        volume = np.prod([high - low for low, high in self.size])
+        gamma = 2 * (1 + 1/3)**(1/3) * (volume / (4/3 * math.pi))**(1/3)
+        return min(gamma * (math.log(num_nodes) / num_nodes)**(1/3), max_radius)
+
+    def __star_logic(self):
+        """
+        RRT*: every new node picks the neighbour within the rewiring radius that gives it the lowest cost-to-come, then
+        neighbours that can be reached more cheaply through the new node are rewired to it. The search does not stop at
+        the first solution; it keeps improving the path, reporting every improvement, until `nodeLimit` iterations or
+        `timeBudget` milliseconds.
+
+        See `main_logic` for the parameters and the return value. Streamed edges are not updated when a node is rewired.
+        The returned path goes to the lowest-cost node within `goalDistance` of the goal.
+
+        With `settings.informed`, every improvement of the best solution shrinks the sampling region to the informed
+        hyperspheroid (see `Sampler.set_informed`).
+        """
+        capacity = self.settings.nodeLimit + 1
+        tree = Tree(capacity)
+        cost = np.empty(capacity, dtype=np.float64)
+        children = [[]]
+        tree.add(self.start, -1)
+        cost[0] = 0.0
+        nn = self.__create_nearest_neighbour()
+        nn.add(self.start)
+
+        best_distance = self.__calculate_distance(self.start, self.goal)
+        best_index = 0
+        goal_nodes = []
+        c_best = math.inf
+        streamed = 1
+
+        for iteration in range(1, self.settings.nodeLimit + 1):
+            if self.__stop_requested():
+                break
+
+            if self.progress_callback is not None and iteration % self.progress_interval == 0:
+                self.progress_callback(len(tree), best_distance)
+
+            new_node = self.sampler.next()
+
+            nearest_index, _ = nn.nearest(new_node)
+            nearest_waypoint = tree.positions[nearest_index]
+            new_waypoint = np.array(self.__check_distance(nearest_waypoint, new_node, self.settings.nodeDistance), dtype=np.float64)
+
+            if self.checker.segment_collides(nearest_waypoint, new_waypoint):
+                continue
+
+            near = nn.within(new_waypoint, self.__rewire_radius(len(tree)))
+            near_distance = np.linalg.norm(tree.positions[near] - new_waypoint, axis=1)
+            near_cost = cost[near] + near_distance
+
+            # Choose parent: the cheapest neighbour with a collision-free edge, or the nearest node.
+            parent = nearest_index
+            parent_cost = cost[nearest_index] + self.__calculate_distance(nearest_waypoint, new_waypoint)
+            for j in np.argsort(near_cost):
+                if near_cost[j] >= parent_cost:
+                    break
+                if not self.checker.segment_collides(tree.positions[near[j]], new_waypoint):
+                    parent = int(near[j])
+                    parent_cost = near_cost[j]
+                    break
+
+            new_index = tree.add(new_waypoint, parent)
+            cost[new_index] = parent_cost
+            children[parent].append(new_index)
+            children.append([])
+            nn.add(new_waypoint)
+
+            # Rewire: neighbours that are cheaper to reach through the new node change their parent.
+            rewired_cost = parent_cost + near_distance
+            for j in np.flatnonzero(rewired_cost < cost[near]):
+                neighbour = int(near[j])
+                if neighbour == parent or self.checker.segment_collides(new_waypoint, tree.positions[neighbour]):
+                    continue
+                children[tree.parent[neighbour]].remove(neighbour)
+                tree.parent[neighbour] = new_index
+                children[new_index].append(neighbour)
+
+                delta = rewired_cost[j] - cost[neighbour]
+                subtree = [neighbour]
+                while subtree:
+                    node = subtree.pop()
+                    cost[node] += delta
+                    subtree.extend(children[node])
+
+            if self.edge_callback is not None and len(tree) - streamed >= self.edge_chunk:
+                self.edge_callback(tree.edges(streamed, len(tree)))
+                streamed = len(tree)
+
+            goal_distance = self.__calculate_distance(new_waypoint, self.goal)
+            if goal_distance < best_distance:
+                best_distance = goal_distance
+                best_index = new_index
+            if goal_distance < self.settings.goalDistance:
+                if not goal_nodes:
+                    print("Goal reached")
+                goal_nodes.append(new_index)
+
+            if goal_nodes:
+                # The returned path ends at the goal node, so its length is the node's cost-to-come. Rewiring only
+                # lowers costs, so the best one never goes up.
+                goal_costs = cost[goal_nodes]
+                best = int(np.argmin(goal_costs))
+                if goal_costs[best] < c_best:
+                    c_best = float(goal_costs[best])
+                    waypoints = tree.path(goal_nodes[best]) if self.solution_callback is not None else None
+                    self.__report_solution(c_best, len(tree), waypoints)
+                    if self.settings.informed:
+                        # A shorter path ends within goalDistance of the goal, so none of its points is further than
+                        # c_best + goalDistance from the start and the goal together.
+                        self.sampler.set_informed(self.start, self.goal, c_best + self.settings.goalDistance)
+        else:
+            print("Maximum nodes reached. Returning best path found.")
+
+        if self.edge_callback is not None and len(tree) > streamed:
+            self.edge_callback(tree.edges(streamed, len(tree)))
+
+        print("Number of nodes:", len(tree))
+        if not goal_nodes:
+            return tree.path(best_index), len(tree)
+
+        goal_nodes = np.array(goal_nodes)
+        best_goal = int(goal_nodes[np.argmin(cost[goal_nodes])])
+        return tree.path(best_goal), len(tree)
+
+    def __roadmap(self, radius):
+        """
+        Loads the roadmap of this map from `roadmapDir`, or builds it (and saves it there).
+
+        :param radius: The connection radius.
+        :return: The roadmap, or None if the search was stopped while building it.
+        """
+        path = None
+        if self.settings.roadmapDir is not None:
+            settings = {name: getattr(self.settings, name) for name in ROADMAP_SETTINGS}
+            key = canonical_hash({"environment": environment_hash(self.size, self.map_obstacles), "settings": settings})
+            path = os.path.join(self.settings.roadmapDir, f"roadmap-{key}.npz")
+            if os.path.exists(path):
+                return load_roadmap(path)
+
+        roadmap = build_roadmap(self.size, self.checker, self.rng, self.settings.prmSamples, radius, self.__build_stop_requested)
+        if roadmap is not None and path is not None:
+            roadmap.save(path)
+        return roadmap
+
+    def __prm_logic(self):
+        """
+        Answers the query on a probabilistic roadmap of the whole map with A*. The roadmap only depends on the obstacles,
+        so with `roadmapDir` it is built once per map and every later query only connects the start and the goal to it.
+
+        See `main_logic` for the parameters and the return value.
+        """
+        radius = self.settings.prmRadius or default_radius(self.size, self.settings.prmSamples)
+        if self.roadmap is None:
+            self.roadmap = self.__roadmap(radius)
+        roadmap = self.roadmap
+        if roadmap is None:
+            return [], 0
+
+        if self.edge_callback is not None:
+            edges = roadmap.edges()
+            for lo in range(0, len(edges), 2 * self.edge_chunk):
+                self.edge_callback(edges[lo:lo + 2 * self.edge_chunk])
+
+        waypoints, cost = roadmap.query(self.start, self.goal, self.checker, radius)
+        if not waypoints:
+            print("No path found in the roadmap.")
+            return [], len(roadmap)
+
+        print("Goal reached")
+        print("Number of nodes:", len(roadmap))
+        self.__report_solution(cost, len(roadmap), waypoints)
+        return waypoints, len(roadmap)
@@ -0,0 +1,134 @@
+import numpy as np
+from rrtCore.collisionChecker import points_in_boxes, segment_box_hits
+
+class BVHCollisionChecker(object):
+    """
+    Collision engine backed by a bounding-volume hierarchy (AABB tree) over the inflated obstacles.
+
+    The tree is built once per map. Segment queries walk it level by level, testing all the nodes of a level in a
+    single NumPy expression, so only the boxes near the segment are ever visited.
+
+    :param box_min: The minimum corner of each inflated obstacle, an (M, 3) array.
+    :param box_max: The maximum corner of each inflated obstacle, an (M, 3) array.
+    :param leaf_size: The maximum number of boxes stored in a leaf. Defaults to 8.
+    """
+    def __init__(self, box_min, box_max, leaf_size=8):
+        box_min = np.asarray(box_min, dtype=np.float64).reshape(-1, 3)
+        box_max = np.asarray(box_max, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = leaf_size
+
+        order = np.arange(len(box_min))
+        self.__build(box_min, box_max, order)
+
+        self.box_min = np.ascontiguousarray(box_min[order])
+        self.box_max = np.ascontiguousarray(box_max[order])
+
+    def __len__(self):
+        return len(self.box_min)
+
+    def __build(self, box_min, box_max, order):
+        """
+        Builds the tree by median splits along the axis with the largest spread of box centers.
+
+        :param box_min: The minimum corner of each box.
+        :param box_max: The maximum corner of each box.
+        :param order: The box permutation, reordered in place so that every leaf holds a contiguous range.
+        """
+        centers = (box_min + box_max) / 2
+        node_min = []
+        node_max = []
+        left = []
+        right = []
+        start = []
+        count = []
+
+        if len(order) == 0:
+            self.node_min = np.empty((0, 3))
+            self.node_max = np.empty((0, 3))
+            return
+
+        stack = [(0, 0, len(order))]
+        node_min.append(None)
+        node_max.append(None)
+        left.append(-1)
+        right.append(-1)
+        start.append(0)
+        count.append(0)
+
+        while stack:
+            node, lo, hi = stack.pop()
+            indices = order[lo:hi]
+            node_min[node] = box_min[indices].min(axis=0)
+            node_max[node] = box_max[indices].max(axis=0)
+
+            if hi - lo <= self.leaf_size:
+                start[node] = lo
+                count[node] = hi - lo
+                continue
+
+            node_centers = centers[indices]
+            axis = int(np.argmax(node_centers.max(axis=0) - node_centers.min(axis=0)))
+            mid = (hi - lo) // 2
+            order[lo:hi] = indices[np.argpartition(node_centers[:, axis], mid)]
+
+            for child_lo, child_hi, children in ((lo, lo + mid, left), (lo + mid, hi, right)):
+                child = len(node_min)
+                node_min.append(None)
+                node_max.append(None)
+                left.append(-1)
+                right.append(-1)
+                start.append(0)
+                count.append(0)
+                children[node] = child
+                stack.append((child, child_lo, child_hi))
+
+        self.node_min = np.array(node_min, dtype=np.float64)
+        self.node_max = np.array(node_max, dtype=np.float64)
+        self.left = np.array(left, dtype=np.int64)
+        self.right = np.array(right, dtype=np.int64)
+        self.start = np.array(start, dtype=np.int64)
+        self.count = np.array(count, dtype=np.int64)
+        self.is_leaf = self.left == -1
+
+    def points_collide(self, points):
+        """
+        Checks which points are inside an inflated obstacle. Many points are tested at once against every box, which is
+        faster than walking the tree once per point.
+
+        :param points: An (N, 3) array of points.
+        :return: An (N,) boolean array, True for the colliding points.
+        """
+        return points_in_boxes(points, self.box_min, self.box_max)
+
+    def segment_collides(self, initial, objective):
+        """
+        Checks for collisions between a line segment and all the obstacles.
+
+        :param initial: The starting point of the line segment (x, y, z).
+        :param objective: The ending point of the line segment (x, y, z).
+        :return: True if there is a collision, False otherwise.
+        """
+        if len(self.node_min) == 0:
+            return False
+        p1 = np.asarray(initial, dtype=np.float64)
+        v = np.asarray(objective, dtype=np.float64) - p1
+        slots = np.arange(self.leaf_size)
+
+        frontier = np.zeros(1, dtype=np.int64)
+        while frontier.size:
+            frontier = frontier[segment_box_hits(p1, v, self.node_min[frontier], self.node_max[frontier])]
+            if not frontier.size:
+                break
+
+            leaf_mask = self.is_leaf[frontier]
+            leaves = frontier[leaf_mask]
+            if leaves.size:
+                boxes = self.start[leaves][:, None] + slots
+                boxes = boxes[slots < self.count[leaves][:, None]]
+                if segment_box_hits(p1, v, self.box_min[boxes], self.box_max[boxes]).any():
+                    return True
+
+            internal = frontier[~leaf_mask]
+            frontier = np.concatenate((self.left[internal], self.right[internal]))
+
+        return False
@@ -0,0 +1,110 @@
+import numpy as np
+
+def inflated_boxes(obs_positions, obs_sizes, safe_distance):
+    """
+    Computes the inflated axis-aligned box of every obstacle.
+
+    :param obs_positions: A list of obstacle positions (x, y, z).
+    :param obs_sizes: A list of obstacle sizes (width, length, height).
+    :param safe_distance: The factor applied to the half-size of each obstacle.
+    :return: A tuple (box_min, box_max) of (M, 3) arrays.
+    """
+    positions = np.asarray(obs_positions, dtype=np.float64).reshape(-1, 3)
+    sizes = np.asarray(obs_sizes, dtype=np.float64).reshape(-1, 3)
+
+    center = positions + sizes / 2
+    half_size = sizes / 2 * safe_distance
+    return center - half_size, center + half_size
+
+def segment_box_hits(p1, v, box_min, box_max):
+    """
+    Slab test of one segment against many axis-aligned boxes.
+
+    :param p1: The starting point of the segment, a (3,) array.
+    :param v: The segment vector (objective - initial), a (3,) array.
+    :param box_min: The minimum corner of each box, an (M, 3) array.
+    :param box_max: The maximum corner of each box, an (M, 3) array.
+    :return: An (M,) boolean array, True for every box the segment crosses.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        inv = 1.0 / v
+        t1 = (box_min - p1) * inv
+        t2 = (box_max - p1) * inv
+
+    t_near = np.minimum(t1, t2)
+    t_far = np.maximum(t1, t2)
+
+    parallel = v == 0
+    if parallel.any():
+        # A segment parallel to a slab only crosses the box if it lies between its planes.
+        inside = (p1 >= box_min) & (p1 <= box_max)
+        t_near = np.where(parallel, np.where(inside, -np.inf, np.inf), t_near)
+        t_far = np.where(parallel, np.where(inside, np.inf, -np.inf), t_far)
+
+    t_enter = t_near.max(axis=1)
+    t_exit = t_far.min(axis=1)
+    return (t_enter <= t_exit) & (t_exit >= 0) & (t_enter <= 1)
+
+def points_in_boxes(points, box_min, box_max, chunk=1 << 16):
+    """
+    Checks which points are inside any of many axis-aligned boxes (boundaries included).
+
+    :param points: An (N, 3) array of points.
+    :param box_min: The minimum corner of each box, an (M, 3) array.
+    :param box_max: The maximum corner of each box, an (M, 3) array.
+    :param chunk: The maximum number of point-box pairs tested at once. Defaults to 2**16.
+    :return: An (N,) boolean array, True for the points inside a box.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    hits = np.zeros(len(points), dtype=bool)
+    if len(box_min) == 0:
+        return hits
+    step = max(1, chunk // len(box_min))
+    for lo in range(0, len(points), step):
+        block = points[lo:lo + step]
+        # One (points, boxes) mask per axis is much cheaper than a (points, boxes, 3) mask reduced over the axes.
+        inside = (block[:, None, 0] >= box_min[:, 0]) & (block[:, None, 0] <= box_max[:, 0])
+        for axis in (1, 2):
+            inside &= block[:, None, axis] >= box_min[:, axis]
+            inside &= block[:, None, axis] <= box_max[:, axis]
+        hits[lo:lo + step] = inside.any(axis=1)
+    return hits
+
+class BoxCollisionChecker(object):
+    """
+    Collision engine that tests segments against every inflated obstacle box at once.
+
+    The boxes are precomputed once, so a segment check is a single NumPy expression instead of a Python loop per obstacle.
+
+    :param box_min: The minimum corner of each inflated obstacle, an (M, 3) array.
+    :param box_max: The maximum corner of each inflated obstacle, an (M, 3) array.
+    """
+    def __init__(self, box_min, box_max):
+        self.box_min = np.ascontiguousarray(box_min, dtype=np.float64)
+        self.box_max = np.ascontiguousarray(box_max, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.box_min)
+
+    def points_collide(self, points):
+        """
+        Checks which points are inside an inflated obstacle.
+
+        :param points: An (N, 3) array of points.
+        :return: An (N,) boolean array, True for the colliding points.
+        """
+        return points_in_boxes(points, self.box_min, self.box_max)
+
+    def segment_collides(self, initial, objective):
+        """
+        Checks for collisions between a line segment and all the obstacles.
+
+        :param initial: The starting point of the line segment (x, y, z).
+        :param objective: The ending point of the line segment (x, y, z).
+        :return: True if there is a collision, False otherwise.
+        """
+        if len(self.box_min) == 0:
+            return False
+        p1 = np.asarray(initial, dtype=np.float64)
+        v = np.asarray(objective, dtype=np.float64) - p1
+        return bool(segment_box_hits(p1, v, self.box_min, self.box_max).any())
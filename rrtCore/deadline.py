@@ -0,0 +1,43 @@
+import time
+
+class Deadline(object):
+    """
+    Wall-clock deadline that is cheap to check inside a hot loop: the clock is only read every `stride` checks.
+
+    :param budget_ms: The time budget in milliseconds.
+    :param stride: The number of checks between clock reads. Defaults to 32.
+    """
+    def __init__(self, budget_ms, stride=32):
+        self.start = time.perf_counter()
+        self.end = self.start + budget_ms / 1000
+        self.stride = stride
+        self.countdown = stride
+
+    def expired(self):
+        """
+        Checks whether the budget has run out.
+
+        :return: True if the deadline has passed (detected at most `stride` checks late), False otherwise.
+        """
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = self.stride
+        return time.perf_counter() >= self.end
+
+    def passed(self):
+        """
+        Checks whether the budget has run out, reading the clock on every call. For loops whose iterations are too slow
+        or too few for `expired`.
+
+        :return: True if the deadline has passed, False otherwise.
+        """
+        return time.perf_counter() >= self.end
+
+    def elapsed_ms(self):
+        """
+        Gets the time since the deadline was created.
+
+        :return: The elapsed time in milliseconds.
+        """
+        return (time.perf_counter() - self.start) * 1000
@@ -0,0 +1,121 @@
+import numpy as np
+from rrtCore.occupancyGrid import voxelise_boxes
+
+def squared_distance_transform(features, max_cells):
+    """
+    Separable squared Euclidean distance transform, truncated at `max_cells`.
+
+    Each axis is processed in turn with a min-plus convolution against the parabola k², one vectorised operation per
+    offset k, so the cost grows with the number of voxels times `max_cells`. Distances up to `max_cells` are exact;
+    larger ones are only guaranteed to be greater than `max_cells`.
+
+    :param features: A 3D boolean array, True for the voxels the distance is measured to.
+    :param max_cells: The maximum distance of interest, in voxels.
+    :return: A float32 array with the squared distance (in voxels²) from every voxel to the nearest feature.
+    """
+    cap = np.float32((max_cells + 1)**2)
+    distance = np.where(features, np.float32(0), cap)
+    for axis in range(3):
+        source = np.moveaxis(distance, axis, 0)
+        result = source.copy()
+        for k in range(1, min(max_cells, source.shape[0] - 1) + 1):
+            offset = np.float32(k * k)
+            np.minimum(result[k:], source[:-k] + offset, out=result[k:])
+            np.minimum(result[:-k], source[k:] + offset, out=result[:-k])
+        distance = np.moveaxis(result, 0, axis)
+    return distance
+
+class DistanceFieldChecker(object):
+    """
+    Collision engine backed by a signed Euclidean distance field of the inflated obstacles.
+
+    The obstacles are voxelised and the field is computed once with a separable distance transform, outside
+    (positive) and inside (negative) the obstacles. Lookups return a conservative lower bound of the distance to the
+    nearest obstacle, so a point is free if its bound is at least `clearance`, an additive safety margin that is the
+    same for thin and thick obstacles. Segments are checked by sphere stepping: the bound at the current point is a
+    radius that is known to be free, so the check jumps that far along the segment.
+
+    :param box_min: The minimum corner of each inflated obstacle, an (M, 3) array.
+    :param box_max: The maximum corner of each inflated obstacle, an (M, 3) array.
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param resolution: The edge length of a voxel.
+    :param clearance: The additive distance every point of a path must keep from the obstacles. Defaults to 0.
+    :param max_distance: The distance up to which the field is exact; larger distances are clamped to it. Longer values allow longer sphere steps but take longer to build. Defaults to None (clearance plus 16 voxels).
+    """
+    def __init__(self, box_min, box_max, size, resolution, clearance=0.0, max_distance=None):
+        box_min = np.asarray(box_min, dtype=np.float64).reshape(-1, 3)
+        box_max = np.asarray(box_max, dtype=np.float64).reshape(-1, 3)
+        self.num_obstacles = len(box_min)
+        self.resolution = float(resolution)
+        self.clearance = float(clearance)
+        self.origin = np.array([axis[0] for axis in size], dtype=np.float64)
+        extent = np.array([axis[1] for axis in size], dtype=np.float64) - self.origin
+        self.shape = tuple(int(n) for n in np.maximum(np.ceil(extent / self.resolution), 1))
+
+        if max_distance is None:
+            max_distance = self.clearance + 16 * self.resolution
+        max_cells = int(np.ceil(max_distance / self.resolution))
+
+        occupied = voxelise_boxes(box_min, box_max, self.origin, self.shape, self.resolution)
+        outside = np.sqrt(squared_distance_transform(occupied, max_cells))
+        inside = np.sqrt(squared_distance_transform(~occupied, max_cells))
+        self.field = (np.minimum(outside, max_cells) - np.minimum(inside, max_cells)) * np.float32(self.resolution)
+
+        # Every obstacle point lies in an occupied voxel, within half a voxel diagonal of its center, and so does
+        # every query point of its own voxel center: the field minus a full diagonal never overestimates the distance.
+        self.error = np.sqrt(3) * self.resolution
+        self.min_step = 0.05 * self.resolution
+
+    def __len__(self):
+        return self.num_obstacles
+
+    def distance(self, points):
+        """
+        Gets a lower bound of the distance from points to the nearest inflated obstacle (negative inside them).
+
+        :param points: An (N, 3) array of points.
+        :return: An (N,) array of distances.
+        """
+        cells = np.floor((np.asarray(points, dtype=np.float64).reshape(-1, 3) - self.origin) / self.resolution).astype(np.int64)
+        cells = np.clip(cells, 0, np.array(self.shape) - 1)
+        return self.field[cells[:, 0], cells[:, 1], cells[:, 2]] - self.error
+
+    def points_collide(self, points):
+        """
+        Checks many points at once against the clearance.
+
+        :param points: An (N, 3) array of points.
+        :return: An (N,) boolean array, True for the points closer than `clearance` to an obstacle.
+        """
+        return self.distance(points) < self.clearance
+
+    def point_collides(self, point):
+        """
+        Checks whether a point is closer than `clearance` to an obstacle.
+
+        :param point: The point (x, y, z).
+        :return: True if there is a collision, False otherwise.
+        """
+        return bool(self.points_collide(point)[0])
+
+    def segment_collides(self, initial, objective):
+        """
+        Checks a line segment by sphere stepping along it.
+
+        :param initial: The starting point of the line segment (x, y, z).
+        :param objective: The ending point of the line segment (x, y, z).
+        :return: True if the segment may come closer than `clearance` to an obstacle, False otherwise.
+        """
+        p1 = np.asarray(initial, dtype=np.float64)
+        v = np.asarray(objective, dtype=np.float64) - p1
+        length = np.linalg.norm(v)
+        direction = v / length if length > 0 else v
+
+        t = 0.0
+        while True:
+            margin = self.distance(p1 + direction * t)[0] - self.clearance
+            if margin < self.min_step:
+                return True
+            t += margin
+            if t >= length:
+                return False
@@ -0,0 +1,96 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from rrt import RRT
+
+_worker_map = None
+
+def _init_worker(size, start, goal, obs, settings):
+    """
+    Stores the map and settings in the worker process, so each trial only sends its seed.
+    """
+    global _worker_map
+    _worker_map = (size, start, goal, obs, settings)
+
+def _run_trial(index, seed):
+    """
+    Runs a single trial in a worker process.
+
+    :param index: The index of the trial.
+    :param seed: The seed of the trial.
+    :return: A result dictionary, see `MultiTestRunner.run`.
+    """
+    size, start, goal, obs, settings = _worker_map
+    settings.seed = seed
+    result = {"index": index, "seed": seed, "waypoints": None, "nodes": 0, "success": False, "path_length": 0.0, "time_s": 0.0, "error": None}
+    try:
+        t0 = time.perf_counter()
+        waypoints, nodes, _ = RRT(size, start, goal, obs, settings).main_logic()
+        result["time_s"] = time.perf_counter() - t0
+        result["waypoints"] = waypoints
+        result["nodes"] = nodes
+        if waypoints:
+            points = np.asarray(waypoints, dtype=np.float64)
+            result["success"] = bool(np.linalg.norm(points[-1] - np.asarray(goal, dtype=np.float64)) < settings.goalDistance)
+            result["path_length"] = float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+class MultiTestRunner(object):
+    """
+    Runs independent, seeded RRT trials on a process pool and gathers the results as they complete.
+
+    Trial i uses the seed `settings.seed + i`. If the settings have no seed, a random base seed is drawn so every trial can still be reproduced.
+
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param obs: A list of obstacles.
+    :param settings: Settings for the RRT algorithm.
+    :type settings: `RRTSettings`
+    :param num_tests: The number of trials.
+    :param max_workers: The number of worker processes. Defaults to the number of cores.
+    :param mp_context: The multiprocessing context of the pool. Defaults to the platform default.
+    """
+    def __init__(self, size, start, goal, obs, settings, num_tests, max_workers=None, mp_context=None):
+        self.size = size
+        self.start = start
+        self.goal = goal
+        self.obs = obs
+        self.settings = settings
+        self.max_workers = max_workers or os.cpu_count()
+        self.mp_context = mp_context
+
+        if settings.seed is None:
+            self.base_seed = int(np.random.SeedSequence().generate_state(1)[0])
+        else:
+            self.base_seed = settings.seed
+        self.seeds = [self.base_seed + i for i in range(num_tests)]
+
+    def run(self):
+        """
+        Runs the trials.
+
+        Closing the generator early cancels the trials that have not started yet.
+
+        :return: A generator of result dictionaries, in completion order, with the keys:
+            index, seed, waypoints (None if the trial failed), nodes, success (whether the path reaches the goal),
+            path_length, time_s and error (None if the trial succeeded).
+        """
+        if not self.seeds:
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(self.seeds)), mp_context=self.mp_context,
+                                 initializer=_init_worker,
+                                 initargs=(self.size, self.start, self.goal, self.obs, self.settings)) as executor:
+            futures = [executor.submit(_run_trial, i, seed) for i, seed in enumerate(self.seeds)]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,340 @@
+import math
+import numpy as np
+
+NN_BACKENDS = ("brute", "kdtree", "voxel")
+
+def create_nearest_neighbour(backend, node_distance):
+    """
+    Creates the nearest-neighbour index used to find the closest tree node.
+
+    :param backend: The name of the backend, one of `NN_BACKENDS`.
+    :param node_distance: The maximum distance between nodes, used to size the voxel grid cells.
+    :return: An empty nearest-neighbour index.
+    """
+    if backend == "brute":
+        return BruteForceNN()
+    elif backend == "kdtree":
+        return KDTreeNN()
+    elif backend == "voxel":
+        return VoxelGridNN(node_distance)
+    else:
+        raise ValueError(f"Unknown nearest-neighbour backend: {backend}")
+
+class BruteForceNN(object):
+    """
+    Nearest-neighbour index that compares the query against every stored point in a single NumPy expression.
+
+    :param capacity: The initial number of points the buffer can hold. It grows automatically.
+    """
+    def __init__(self, capacity=1024):
+        self.points = np.empty((capacity, 3), dtype=np.float64)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, point):
+        """
+        Adds a point to the index.
+
+        :param point: The point to add (x, y, z).
+        :return: The index of the new point.
+        """
+        if self.count == len(self.points):
+            self.points = np.concatenate((self.points, np.empty_like(self.points)))
+        self.points[self.count] = point
+        self.count += 1
+        return self.count - 1
+
+    def nearest(self, point):
+        """
+        Finds the stored point closest to the query.
+
+        :param point: The query point (x, y, z).
+        :return: A tuple (index, distance), or (None, inf) if the index is empty.
+        """
+        if self.count == 0:
+            return None, math.inf
+        diff = self.points[:self.count] - np.asarray(point, dtype=np.float64)
+        dist_sq = np.einsum('ij,ij->i', diff, diff)
+        index = int(np.argmin(dist_sq))
+        return index, math.sqrt(dist_sq[index])
+
+    def within(self, point, radius):
+        """
+        Finds all the stored points within a radius of the query.
+
+        :param point: The query point (x, y, z).
+        :param radius: The search radius.
+        :return: An int array with the indices of the points.
+        """
+        diff = self.points[:self.count] - np.asarray(point, dtype=np.float64)
+        dist_sq = np.einsum('ij,ij->i', diff, diff)
+        return np.flatnonzero(dist_sq <= radius * radius)
+
+class KDTreeNN(object):
+    """
+    Incrementally built k-d tree. Points are inserted one by one as the RRT grows, splitting on x, y and z in turn.
+    """
+    def __init__(self):
+        self.points = []
+        self.axis = []
+        self.left = []
+        self.right = []
+
+    def __len__(self):
+        return len(self.points)
+
+    def add(self, point):
+        """
+        Inserts a point into the tree.
+
+        :param point: The point to add (x, y, z).
+        :return: The index of the new point.
+        """
+        new_point = (float(point[0]), float(point[1]), float(point[2]))
+        index = len(self.points)
+        self.points.append(new_point)
+        self.left.append(-1)
+        self.right.append(-1)
+
+        if index == 0:
+            self.axis.append(0)
+            return index
+
+        node = 0
+        while True:
+            axis = self.axis[node]
+            if new_point[axis] < self.points[node][axis]:
+                if self.left[node] == -1:
+                    self.left[node] = index
+                    break
+                node = self.left[node]
+            else:
+                if self.right[node] == -1:
+                    self.right[node] = index
+                    break
+                node = self.right[node]
+
+        self.axis.append((self.axis[node] + 1) % 3)
+        return index
+
+    def nearest(self, point):
+        """
+        Finds the stored point closest to the query.
+
+        :param point: The query point (x, y, z).
+        :return: A tuple (index, distance), or (None, inf) if the tree is empty.
+        """
+        if not self.points:
+            return None, math.inf
+
+        query = (float(point[0]), float(point[1]), float(point[2]))
+        points = self.points
+        axes = self.axis
+        left = self.left
+        right = self.right
+
+        best_index = None
+        best_dist_sq = math.inf
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_dist_sq:
+                continue
+
+            p = points[node]
+            dx = p[0] - query[0]
+            dy = p[1] - query[1]
+            dz = p[2] - query[2]
+            dist_sq = dx*dx + dy*dy + dz*dz
+            if dist_sq < best_dist_sq:
+                best_dist_sq = dist_sq
+                best_index = node
+
+            axis = axes[node]
+            diff = query[axis] - p[axis]
+            if diff < 0:
+                near, far = left[node], right[node]
+            else:
+                near, far = right[node], left[node]
+
+            if far != -1:
+                stack.append((far, diff*diff))
+            if near != -1:
+                stack.append((near, bound))
+
+        return best_index, math.sqrt(best_dist_sq)
+
+    def within(self, point, radius):
+        """
+        Finds all the stored points within a radius of the query.
+
+        :param point: The query point (x, y, z).
+        :param radius: The search radius.
+        :return: An int array with the indices of the points.
+        """
+        if not self.points:
+            return np.empty(0, dtype=np.int64)
+
+        query = (float(point[0]), float(point[1]), float(point[2]))
+        radius_sq = radius * radius
+        points = self.points
+        axes = self.axis
+        left = self.left
+        right = self.right
+
+        found = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            p = points[node]
+            dx = p[0] - query[0]
+            dy = p[1] - query[1]
+            dz = p[2] - query[2]
+            if dx*dx + dy*dy + dz*dz <= radius_sq:
+                found.append(node)
+
+            axis = axes[node]
+            diff = query[axis] - p[axis]
+            if diff < 0:
+                near, far = left[node], right[node]
+            else:
+                near, far = right[node], left[node]
+
+            if near != -1:
+                stack.append(near)
+            if far != -1 and diff*diff <= radius_sq:
+                stack.append(far)
+
+        return np.array(found, dtype=np.int64)
+
+class VoxelGridNN(object):
+    """
+    Uniform voxel-hash grid. Points are bucketed by cell and queries search shells of cells around the query point.
+
+    :param cell_size: The edge length of each cell. Using the node distance keeps most queries within a few cells.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.points = []
+        self.brute = BruteForceNN()
+
+    def __len__(self):
+        return len(self.points)
+
+    def __cell_key(self, point):
+        """
+        Gets the integer cell coordinates of a point.
+
+        :param point: The point (x, y, z).
+        :return: The cell key (i, j, k).
+        """
+        return (math.floor(point[0] / self.cell_size),
+                math.floor(point[1] / self.cell_size),
+                math.floor(point[2] / self.cell_size))
+
+    def add(self, point):
+        """
+        Adds a point to the grid.
+
+        :param point: The point to add (x, y, z).
+        :return: The index of the new point.
+        """
+        new_point = (float(point[0]), float(point[1]), float(point[2]))
+        index = len(self.points)
+        self.points.append(new_point)
+        self.brute.add(new_point)
+        self.cells.setdefault(self.__cell_key(new_point), []).append(index)
+        return index
+
+    def nearest(self, point):
+        """
+        Finds the stored point closest to the query.
+
+        Shells of cells are searched outwards until no closer point can exist. If the shells would visit more
+        cells than there are points (e.g. a sample far away from the tree), it falls back to a brute-force search.
+
+        :param point: The query point (x, y, z).
+        :return: A tuple (index, distance), or (None, inf) if the grid is empty.
+        """
+        if not self.points:
+            return None, math.inf
+
+        query = (float(point[0]), float(point[1]), float(point[2]))
+        ci, cj, ck = self.__cell_key(query)
+        points = self.points
+        cells = self.cells
+
+        best_index = None
+        best_dist_sq = math.inf
+        visited = 0
+        r = 0
+        while True:
+            if best_index is not None and (r - 1) * self.cell_size >= math.sqrt(best_dist_sq):
+                break
+
+            visited += (2*r + 1)**3 - max(2*r - 1, 0)**3
+            if visited > len(points):
+                return self.brute.nearest(query)
+
+            for di in range(-r, r + 1):
+                for dj in range(-r, r + 1):
+                    if abs(di) == r or abs(dj) == r:
+                        dks = range(-r, r + 1)
+                    else:
+                        dks = (-r, r) if r > 0 else (0,)
+                    for dk in dks:
+                        bucket = cells.get((ci + di, cj + dj, ck + dk))
+                        if bucket is None:
+                            continue
+                        for index in bucket:
+                            p = points[index]
+                            dx = p[0] - query[0]
+                            dy = p[1] - query[1]
+                            dz = p[2] - query[2]
+                            dist_sq = dx*dx + dy*dy + dz*dz
+                            if dist_sq < best_dist_sq:
+                                best_dist_sq = dist_sq
+                                best_index = index
+            r += 1
+
+        return best_index, math.sqrt(best_dist_sq)
+
+    def within(self, point, radius):
+        """
+        Finds all the stored points within a radius of the query.
+
+        Falls back to a brute-force search if the radius covers more cells than there are points.
+
+        :param point: The query point (x, y, z).
+        :param radius: The search radius.
+        :return: An int array with the indices of the points.
+        """
+        if (2 * math.ceil(radius / self.cell_size) + 1)**3 > len(self.points):
+            return self.brute.within(point, radius)
+
+        query = (float(point[0]), float(point[1]), float(point[2]))
+        low = self.__cell_key((query[0] - radius, query[1] - radius, query[2] - radius))
+        high = self.__cell_key((query[0] + radius, query[1] + radius, query[2] + radius))
+        radius_sq = radius * radius
+        points = self.points
+        cells = self.cells
+
+        found = []
+        for ci in range(low[0], high[0] + 1):
+            for cj in range(low[1], high[1] + 1):
+                for ck in range(low[2], high[2] + 1):
+                    bucket = cells.get((ci, cj, ck))
+                    if bucket is None:
+                        continue
+                    for index in bucket:
+                        p = points[index]
+                        dx = p[0] - query[0]
+                        dy = p[1] - query[1]
+                        dz = p[2] - query[2]
+                        if dx*dx + dy*dy + dz*dz <= radius_sq:
+                            found.append(index)
+
+        return np.array(sorted(found), dtype=np.int64)
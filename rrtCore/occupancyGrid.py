@@ -0,0 +1,140 @@
+import hashlib
+import os
+import numpy as np
+
+from rrtCore.resultCache import save_arrays
+
+def voxelise_boxes(box_min, box_max, origin, shape, resolution):
+    """
+    Marks every voxel of a grid that overlaps an axis-aligned box.
+
+    :param box_min: The minimum corner of each box, an (M, 3) array.
+    :param box_max: The maximum corner of each box, an (M, 3) array.
+    :param origin: The minimum corner of the grid, a (3,) array.
+    :param shape: The number of voxels per axis.
+    :param resolution: The edge length of a voxel.
+    :return: A boolean array with the grid shape.
+    """
+    occupied = np.zeros(shape, dtype=bool)
+    upper = np.array(shape) - 1
+    lo = np.floor((box_min - origin) / resolution).astype(np.int64)
+    hi = np.floor((box_max - origin) / resolution).astype(np.int64)
+    inside = np.all(hi >= 0, axis=1) & np.all(lo <= upper, axis=1)
+    lo = np.clip(lo[inside], 0, upper)
+    hi = np.clip(hi[inside], 0, upper) + 1
+    for (x0, y0, z0), (x1, y1, z1) in zip(lo, hi):
+        occupied[x0:x1, y0:y1, z0:z1] = True
+    return occupied
+
+class OccupancyGridChecker(object):
+    """
+    Collision engine backed by a precomputed occupancy voxel grid.
+
+    Every voxel that overlaps an inflated obstacle is marked as occupied, and the grid is stored bit-packed (one bit
+    per voxel). A point check is a single bit lookup and a segment check walks the voxels the segment crosses (3D DDA),
+    so the cost of a query does not depend on the number of obstacles. The voxelisation is conservative: a segment
+    that only grazes the free part of an occupied voxel is reported as colliding, so `resolution` should be small
+    compared with the gaps of the map.
+
+    :param box_min: The minimum corner of each inflated obstacle, an (M, 3) array.
+    :param box_max: The maximum corner of each inflated obstacle, an (M, 3) array.
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param resolution: The edge length of a voxel.
+    :param cache_dir: Optional directory where built grids are stored and looked up, so repeated runs on the same map skip building it.
+    """
+    def __init__(self, box_min, box_max, size, resolution, cache_dir=None):
+        box_min = np.asarray(box_min, dtype=np.float64).reshape(-1, 3)
+        box_max = np.asarray(box_max, dtype=np.float64).reshape(-1, 3)
+        self.num_obstacles = len(box_min)
+        self.resolution = float(resolution)
+        self.origin = np.array([axis[0] for axis in size], dtype=np.float64)
+        extent = np.array([axis[1] for axis in size], dtype=np.float64) - self.origin
+        self.shape = tuple(int(n) for n in np.maximum(np.ceil(extent / self.resolution), 1))
+        self.strides = np.array([self.shape[1] * self.shape[2], self.shape[2], 1], dtype=np.int64)
+
+        path = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, f"occupancy-{self.__cache_key(box_min, box_max)}.npz")
+
+        if path is not None and os.path.exists(path):
+            with np.load(path) as data:
+                self.bits = data["bits"]
+        else:
+            self.bits = np.packbits(voxelise_boxes(box_min, box_max, self.origin, self.shape, self.resolution).ravel())
+            if path is not None:
+                save_arrays(path, bits=self.bits)
+
+    def __len__(self):
+        return self.num_obstacles
+
+    def __cache_key(self, box_min, box_max):
+        """
+        Hashes everything the grid depends on.
+
+        :param box_min: The minimum corner of each box.
+        :param box_max: The maximum corner of each box.
+        :return: A hex digest.
+        """
+        digest = hashlib.sha1()
+        for array in (box_min, box_max, self.origin, np.array(self.shape, dtype=np.int64), np.array([self.resolution])):
+            digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.hexdigest()
+
+    def __occupied(self, cells):
+        """
+        Looks up the occupancy bits of voxels.
+
+        :param cells: An (N, 3) int array of voxel indices inside the grid.
+        :return: An (N,) boolean array.
+        """
+        flat = cells @ self.strides
+        return (self.bits[flat >> 3] >> (7 - (flat & 7))) & 1 == 1
+
+    def __cells(self, points):
+        """
+        Gets the voxel of every point, clamped to the grid.
+
+        :param points: An (N, 3) array of points.
+        :return: An (N, 3) int array of voxel indices.
+        """
+        cells = np.floor((points - self.origin) / self.resolution).astype(np.int64)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def point_collides(self, point):
+        """
+        Checks whether a point lies in an occupied voxel.
+
+        :param point: The point (x, y, z).
+        :return: True if the voxel is occupied, False otherwise.
+        """
+        cell = self.__cells(np.asarray(point, dtype=np.float64).reshape(1, 3))
+        return bool(self.__occupied(cell)[0])
+
+    def segment_collides(self, initial, objective):
+        """
+        Checks whether a line segment crosses an occupied voxel.
+
+        All the voxel boundaries the segment crosses are computed at once (a vectorised 3D DDA), and every voxel
+        between two consecutive crossings is looked up.
+
+        :param initial: The starting point of the line segment (x, y, z).
+        :param objective: The ending point of the line segment (x, y, z).
+        :return: True if there is a collision, False otherwise.
+        """
+        p1 = (np.asarray(initial, dtype=np.float64) - self.origin) / self.resolution
+        p2 = (np.asarray(objective, dtype=np.float64) - self.origin) / self.resolution
+        v = p2 - p1
+
+        crossings = [np.zeros(1), np.ones(1)]
+        for axis in range(3):
+            if v[axis] == 0:
+                continue
+            lo, hi = sorted((p1[axis], p2[axis]))
+            planes = np.arange(np.floor(lo) + 1, np.ceil(hi))
+            crossings.append((planes - p1[axis]) / v[axis])
+        t = np.unique(np.concatenate(crossings))
+
+        # The midpoint between two consecutive crossings lies strictly inside the voxel the segment is crossing.
+        midpoints = p1 + np.outer((t[:-1] + t[1:]) / 2, v) if len(t) > 1 else p1[None]
+        cells = np.clip(np.floor(midpoints).astype(np.int64), 0, np.array(self.shape) - 1)
+        return bool(self.__occupied(cells).any())
@@ -0,0 +1,64 @@
+import numpy as np
+
+def prune_path(waypoints, checker):
+    """
+    Greedy line-of-sight pruning: from each kept waypoint, jumps to the farthest later waypoint it can reach in a
+    straight, collision-free line.
+
+    :param waypoints: A list of waypoints [x, y, z].
+    :param checker: The collision checker of the inflated obstacles (see `BoxCollisionChecker`).
+    :return: The pruned list of waypoints. The first and last waypoints are kept.
+    """
+    if len(waypoints) < 3:
+        return [list(p) for p in waypoints]
+
+    pruned = [list(waypoints[0])]
+    i = 0
+    last = len(waypoints) - 1
+    while i < last:
+        j = last
+        while j > i + 1 and checker.segment_collides(waypoints[i], waypoints[j]):
+            j -= 1
+        pruned.append(list(waypoints[j]))
+        i = j
+    return pruned
+
+def shortcut_path(waypoints, checker, iterations, rng):
+    """
+    Randomized shortcutting: picks two random points along the path and, if the straight segment between them is
+    collision-free, replaces the part of the path in between.
+
+    :param waypoints: A list of waypoints [x, y, z].
+    :param checker: The collision checker of the inflated obstacles (see `BoxCollisionChecker`).
+    :param iterations: The number of shortcut attempts.
+    :param rng: The random generator.
+    :type rng: `numpy.random.Generator`
+    :return: The shortened list of waypoints. The first and last waypoints are kept.
+    """
+    path = np.array(waypoints, dtype=np.float64).reshape(-1, 3)
+    for _ in range(iterations):
+        if len(path) < 3:
+            break
+
+        lengths = np.linalg.norm(np.diff(path, axis=0), axis=1)
+        cumulative = np.concatenate(([0.0], np.cumsum(lengths)))
+        if cumulative[-1] == 0:
+            break
+
+        a, b = np.sort(rng.random(2) * cumulative[-1])
+        seg_a = min(int(np.searchsorted(cumulative, a, side='right')) - 1, len(lengths) - 1)
+        seg_b = min(int(np.searchsorted(cumulative, b, side='right')) - 1, len(lengths) - 1)
+        if seg_a == seg_b:
+            continue
+
+        point_a = path[seg_a] + (a - cumulative[seg_a]) / lengths[seg_a] * (path[seg_a + 1] - path[seg_a]) if lengths[seg_a] > 0 else path[seg_a]
+        point_b = path[seg_b] + (b - cumulative[seg_b]) / lengths[seg_b] * (path[seg_b + 1] - path[seg_b]) if lengths[seg_b] > 0 else path[seg_b]
+        if checker.segment_collides(point_a, point_b):
+            continue
+
+        path = np.concatenate((path[:seg_a + 1], [point_a, point_b], path[seg_b + 1:]))
+        # Drop the zero-length segments left when a shortcut ends exactly on a waypoint.
+        keep = np.concatenate(([True], np.any(np.diff(path, axis=0) != 0, axis=1)))
+        path = path[keep]
+
+    return path.tolist()
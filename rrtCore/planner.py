@@ -0,0 +1,118 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rrt import RRT, create_checker
+
+_worker_planner = None
+
+def _init_worker(planner):
+    """
+    Stores the prepared planner in the worker process, so each query only sends its start and goal.
+    """
+    global _worker_planner
+    _worker_planner = planner
+
+def _run_query(index, start, goal):
+    """
+    Runs a single query in a worker process.
+
+    :param index: The index of the query.
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :return: A result dictionary, see `Planner.plan_many`.
+    """
+    return _worker_planner.plan(start, goal, index)
+
+class Planner(object):
+    """
+    Plans many start/goal pairs on one map. The obstacles are unpacked and the collision structures (boxes, BVH,
+    occupancy grid or distance field) are built once, and the PRM roadmap once it exists, then shared by every query.
+
+    Every query uses the same settings, including the seed, so its result does not depend on the other queries.
+
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param obs: A list of obstacles.
+    :param settings: Settings for the RRT algorithm.
+    :type settings: `RRTSettings`
+    """
+    def __init__(self, size, obs, settings):
+        self.size = size
+        self.obs = obs
+        self.settings = settings
+        self.checker = create_checker(size, obs, settings)
+        self.roadmap = None
+
+    def plan(self, start, goal, index=0):
+        """
+        Plans a single start/goal pair.
+
+        :param start: The starting position (x, y, z).
+        :param goal: The goal position (x, y, z).
+        :param index: The index reported in the result. Defaults to 0.
+        :return: A result dictionary, see `plan_many`.
+        """
+        result = {"index": index, "start": start, "goal": goal, "waypoints": None, "nodes": 0, "time_s": 0.0, "stats": None, "error": None}
+        try:
+            t0 = time.perf_counter()
+            rrt = RRT(self.size, start, goal, self.obs, self.settings, checker=self.checker, roadmap=self.roadmap)
+            waypoints, nodes, stats = rrt.main_logic()
+            self.roadmap = rrt.roadmap
+            result["time_s"] = time.perf_counter() - t0
+            result["waypoints"] = waypoints
+            result["nodes"] = nodes
+            result["stats"] = None if stats is None else stats.as_dict()
+        except Exception as e:
+            result["error"] = str(e)
+        return result
+
+    def plan_many(self, starts, goals, max_workers=1, stream=False, mp_context=None):
+        """
+        Plans many start/goal pairs.
+
+        With more than one worker the queries are fanned out to a process pool; the prepared map is sent once to every
+        worker. With the "prm" planner the roadmap is built (or loaded) by the first query, in this process, before
+        the others are sent.
+
+        :param starts: A list of starting positions (x, y, z).
+        :param goals: A list of goal positions (x, y, z), one per start.
+        :param max_workers: The number of worker processes, None for the number of cores. Defaults to 1 (plan in this process).
+        :param stream: If True, returns a generator that yields the results as they finish instead of a list. Defaults to False.
+        :param mp_context: The multiprocessing context of the pool. Defaults to the platform default.
+        :return: A list of result dictionaries in query order (or a generator of them in completion order), with the keys:
+            index, start, goal, waypoints (None if the query failed), nodes, time_s, stats (the per-phase stats as a
+            dictionary if `settings.profile` is enabled) and error (None if the query succeeded).
+        """
+        if len(starts) != len(goals):
+            raise ValueError("There must be one goal per start.")
+
+        results = self.__run(list(starts), list(goals), max_workers or os.cpu_count(), mp_context)
+        if stream:
+            return results
+        return sorted(results, key=lambda result: result["index"])
+
+    def __run(self, starts, goals, max_workers, mp_context):
+        """
+        Runs the queries, see `plan_many`.
+
+        :return: A generator of result dictionaries, in completion order.
+        """
+        pending = list(range(len(starts)))
+        if max_workers <= 1 or len(pending) <= 1:
+            for i in pending:
+                yield self.plan(starts[i], goals[i], i)
+            return
+
+        if self.settings.planner == "prm" and self.roadmap is None:
+            first = pending.pop(0)
+            yield self.plan(starts[first], goals[first], first)
+
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(pending)), mp_context=mp_context,
+                                 initializer=_init_worker, initargs=(self,)) as executor:
+            futures = [executor.submit(_run_query, i, starts[i], goals[i]) for i in pending]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
@@ -0,0 +1,119 @@
+import time
+
+class PhaseStats(object):
+    """
+    Counters and timings of one planner phase.
+
+    :param name: The name of the phase.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.hits = 0
+        self.time_ns = 0
+
+    @property
+    def time_ms(self):
+        return self.time_ns / 1e6
+
+class PlannerStats(object):
+    """
+    Per-phase counters and high-resolution timings of a search, filled by the wrappers returned by `timed` and
+    `profiled`. Nothing is wrapped unless profiling is enabled, so a normal search pays nothing for it.
+
+    The phases used by the RRT are:
+        - sampling: random samples drawn (calls of `Sampler.next` and `Sampler.batch`).
+        - nearest_neighbour: nearest and radius queries of the nearest-neighbour index.
+        - nn_insert: points added to the nearest-neighbour index.
+        - steering: the steps towards the samples (`__check_distance`).
+        - collision: segment checks; `hits` counts the ones that collided and were rejected.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.total_ns = 0
+
+    def phase(self, name):
+        """
+        Gets the stats of a phase, creating them on first use.
+
+        :param name: The name of the phase.
+        :return: The phase stats.
+        :rtype: `PhaseStats`
+        """
+        if name not in self.phases:
+            self.phases[name] = PhaseStats(name)
+        return self.phases[name]
+
+    def timed(self, name, function):
+        """
+        Wraps a function so every call is counted and timed in a phase. Calls that return True are also counted as hits.
+
+        :param name: The name of the phase.
+        :param function: The function to wrap.
+        :return: The wrapped function.
+        """
+        phase = self.phase(name)
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            t0 = clock()
+            result = function(*args, **kwargs)
+            phase.time_ns += clock() - t0
+            phase.calls += 1
+            if result is True:
+                phase.hits += 1
+            return result
+        return wrapper
+
+    def profiled(self, target, methods):
+        """
+        Wraps an object so some of its methods are counted and timed. The object itself is not modified, so it can be
+        shared with searches that are not profiled.
+
+        :param target: The object to wrap.
+        :param methods: A dictionary {method name: phase name}.
+        :return: A proxy that forwards everything else to the object.
+        """
+        return _ProfiledProxy(target, {method: self.timed(name, getattr(target, method)) for method, name in methods.items()})
+
+    def as_dict(self):
+        """
+        Gets the stats as plain data.
+
+        :return: A dictionary with "total_ms" and "phases", {phase: {"calls", "hits", "time_ms"}}.
+        """
+        return {
+            "total_ms": self.total_ns / 1e6,
+            "phases": {name: {"calls": p.calls, "hits": p.hits, "time_ms": p.time_ms} for name, p in self.phases.items()},
+        }
+
+    def summary(self):
+        """
+        Gets a one-line summary of the stats.
+
+        :return: A string with the time and the calls of every phase.
+        """
+        parts = [f"Total {self.total_ns / 1e6:.1f} ms"]
+        for name, p in self.phases.items():
+            part = f"{name} {p.time_ms:.1f} ms / {p.calls}"
+            if p.hits:
+                part += f" ({p.hits} hits)"
+            parts.append(part)
+        return " | ".join(parts)
+
+class _ProfiledProxy(object):
+    """
+    Forwards attribute access to a target object, except for the wrapped methods.
+
+    :param target: The wrapped object.
+    :param wrapped: A dictionary {method name: wrapped method}.
+    """
+    def __init__(self, target, wrapped):
+        self.__dict__.update(wrapped)
+        self._target = target
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+    def __len__(self):
+        return len(self._target)
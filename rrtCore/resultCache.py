@@ -0,0 +1,221 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+_open_caches = {}
+_open_caches_lock = threading.Lock()
+
+def _canonical(value):
+    """
+    Converts a value to a JSON-serialisable form where equal inputs always give equal text: tuples become lists,
+    NumPy values become Python values, and numbers with an integral value become ints (so 1 and 1.0 give the same text,
+    and large ints such as seeds keep every digit) while the other numbers stay floats.
+
+    :param value: The value to convert.
+    :return: The canonical value.
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, (bool, np.bool_)) or value is None or isinstance(value, str):
+        return bool(value) if isinstance(value, np.bool_) else value
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        return int(value) if value.is_integer() else value
+    return repr(value)
+
+def canonical_hash(value):
+    """
+    Hashes a value through its canonical JSON text.
+
+    :param value: A JSON-like value (dicts, lists, tuples, numbers, strings, NumPy arrays).
+    :return: A hex SHA-256 digest.
+    """
+    text = json.dumps(_canonical(value), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def save_arrays(path, **arrays):
+    """
+    Saves arrays to a compressed .npz file atomically: they are written to a temporary file in the same directory,
+    which then replaces `path`. Other processes sharing a cache directory see either no file or a complete one.
+
+    :param path: The file.
+    :param arrays: The arrays to save, by name.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".npz.tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez_compressed(file, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+def map_hash(size, start, goal, obs):
+    """
+    Hashes the content of a map. Obstacle ids and colors do not change the plan, so only positions and sizes are used.
+
+    :param size: The dimensions of the environment.
+    :param start: The starting position (x, y, z).
+    :param goal: The goal position (x, y, z).
+    :param obs: A list of obstacles [id, position, size, color].
+    :return: A hex SHA-256 digest.
+    """
+    obstacles = [[obstacle[1], obstacle[2]] for obstacle in obs]
+    return canonical_hash({"mapSize": size, "posStart": start, "posGoal": goal, "listObstacles": obstacles})
+
+def environment_hash(size, obs):
+    """
+    Hashes the static part of a map (its dimensions and obstacles), shared by every start/goal query on it.
+
+    :param size: The dimensions of the environment.
+    :param obs: A list of obstacles [id, position, size, color].
+    :return: A hex SHA-256 digest.
+    """
+    obstacles = [[obstacle[1], obstacle[2]] for obstacle in obs]
+    return canonical_hash({"mapSize": size, "listObstacles": obstacles})
+
+def open_result_cache(path, max_bytes):
+    """
+    Gets the cache stored at a path, opening it on first use. Every call with the same path in a process, from any
+    thread, shares the same cache and counters.
+
+    :param path: The SQLite file of the cache.
+    :param max_bytes: The size limit of the stored results.
+    :return: The cache.
+    :rtype: `ResultCache`
+    """
+    key = os.path.abspath(path)
+    with _open_caches_lock:
+        cache = _open_caches.get(key)
+        if cache is None:
+            cache = _open_caches[key] = ResultCache(path, max_bytes)
+        cache.max_bytes = max_bytes
+    return cache
+
+class ResultCache(object):
+    """
+    Persistent cache of planner results stored in a SQLite file.
+
+    Each entry holds the waypoints, node count and planning time of one search, under a key built from the map and
+    the settings (see `map_hash` and `canonical_hash`). When the stored results grow beyond `max_bytes`, the least
+    recently used entries are evicted.
+
+    The cache can be used from several threads: they share one connection, and every operation holds a lock.
+
+    :param path: The SQLite file. It is created if it does not exist.
+    :param max_bytes: The size limit of the stored results. Defaults to 64 MiB.
+    """
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, waypoints BLOB NOT NULL, nodes INTEGER NOT NULL, time_s REAL NOT NULL, "
+            "bytes INTEGER NOT NULL, last_used REAL NOT NULL)")
+        self.connection.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key):
+        """
+        Looks up a result and marks it as recently used.
+
+        :param key: The key of the result.
+        :return: A dictionary with "waypoints" (a list of [x, y, z]), "nodes" and "time_s", or None on a miss.
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT waypoints, nodes, time_s FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.connection.commit()
+        waypoints = np.frombuffer(row[0], dtype=np.float64).reshape(-1, 3).tolist()
+        return {"waypoints": waypoints, "nodes": row[1], "time_s": row[2]}
+
+    def put(self, key, waypoints, nodes, time_s):
+        """
+        Stores a result, then evicts the least recently used results above the size limit.
+
+        :param key: The key of the result.
+        :param waypoints: A list of waypoints [x, y, z].
+        :param nodes: The number of nodes of the search.
+        :param time_s: The planning time in seconds.
+        """
+        blob = np.asarray(waypoints, dtype=np.float64).reshape(-1, 3).tobytes()
+        with self.lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, waypoints, nodes, time_s, bytes, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, blob, int(nodes), float(time_s), len(blob) + len(key), time.time()))
+            self.__evict()
+            self.connection.commit()
+
+    def __evict(self):
+        """Deletes the least recently used results until the stored size fits in `max_bytes`. Called with the lock held."""
+        total = self.connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for key, size in self.connection.execute("SELECT key, bytes FROM results ORDER BY last_used, rowid"):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self.connection.executemany("DELETE FROM results WHERE key = ?", stale)
+        self.evictions += len(stale)
+
+    def size_bytes(self):
+        """
+        Gets the size of the stored results.
+
+        :return: The number of bytes.
+        """
+        with self.lock:
+            return self.connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM results").fetchone()[0]
+
+    def stats(self):
+        """
+        Gets the counters of the cache.
+
+        :return: A dictionary with "hits", "misses", "evictions", "entries" and "bytes".
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self), "bytes": self.size_bytes()}
+
+    def clear(self):
+        """Deletes every stored result."""
+        with self.lock:
+            self.connection.execute("DELETE FROM results")
+            self.connection.commit()
+
+    def close(self):
+        """Closes the database."""
+        with self.lock:
+            self.connection.close()
+        with _open_caches_lock:
+            if _open_caches.get(os.path.abspath(self.path)) is self:
+                del _open_caches[os.path.abspath(self.path)]
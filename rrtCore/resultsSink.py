@@ -0,0 +1,176 @@
+import csv
+import datetime
+import json
+import os
+
+import numpy as np
+
+RESULT_FIELDS = ["session", "run", "seed", "success", "nodes", "waypoint_count", "path_length", "time_s", "error"]
+FORMATS = ("csv", "ndjson")
+# Settings columns are prefixed so they never collide with a result field (e.g. the per-run "seed").
+SETTING_PREFIX = "setting_"
+
+def settings_columns(settings):
+    """
+    Gets the scalar settings as columns.
+
+    :param settings: Settings for the RRT algorithm.
+    :type settings: `RRTSettings`
+    :return: A dictionary {setting name: value}, sorted by name.
+    """
+    return {name: value for name, value in sorted(vars(settings).items())
+            if value is None or isinstance(value, (bool, int, float, str))}
+
+def describe(values):
+    """
+    Describes a list of numbers.
+
+    :param values: The numbers.
+    :return: A dictionary with "mean", "median", "p95", "min" and "max", or None if there are no values.
+    """
+    if not values:
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    return {"mean": float(values.mean()), "median": float(np.median(values)), "p95": float(np.percentile(values, 95)),
+            "min": float(values.min()), "max": float(values.max())}
+
+class ResultsSummary(object):
+    """
+    Aggregate statistics of a set of results, accumulated one record at a time.
+    """
+    def __init__(self):
+        self.runs = 0
+        self.successes = 0
+        self.errors = 0
+        self.nodes = []
+        self.time_s = []
+        self.path_length = []
+
+    def add(self, record):
+        """
+        Adds a result.
+
+        :param record: A result record with the `RESULT_FIELDS` keys.
+        """
+        self.runs += 1
+        if record.get("error") is not None:
+            self.errors += 1
+            return
+        self.nodes.append(record["nodes"])
+        self.time_s.append(record["time_s"])
+        if record.get("success"):
+            self.successes += 1
+            self.path_length.append(record["path_length"])
+
+    def as_dict(self):
+        """
+        Gets the statistics. Path lengths only include the successful runs; runs that failed with an error are only
+        counted in "runs" and "errors".
+
+        :return: A dictionary with "runs", "successes", "errors", "success_rate", "nodes", "time_s" and "path_length".
+        """
+        return {
+            "runs": self.runs,
+            "successes": self.successes,
+            "errors": self.errors,
+            "success_rate": self.successes / self.runs if self.runs else 0.0,
+            "nodes": describe(self.nodes),
+            "time_s": describe(self.time_s),
+            "path_length": describe(self.path_length),
+        }
+
+class ResultsSink(object):
+    """
+    Buffered writer of structured run results. Every row holds the `RESULT_FIELDS` and the scalar settings of the
+    run (as `SETTING_PREFIX` + name columns), and rows are appended to the file (CSV or NDJSON, one JSON object per line) in batches of `buffer_size`.
+
+    A `ResultsSummary` is kept up to date as rows are written. On `close` it is saved next to the results, in
+    `<name>.summary.json`, together with the session and the settings.
+
+    :param path: The results file. Rows are appended if it already exists.
+    :param settings: The settings of the runs, stored in every row. Defaults to None.
+    :type settings: `RRTSettings`
+    :param fmt: "csv" or "ndjson". Defaults to None (from the file extension, CSV unless it is .ndjson or .jsonl).
+    :param buffer_size: The number of rows kept in memory before they are written. Defaults to 64.
+    :param session: The identifier stored in every row, to tell appended sessions apart. Defaults to None (the current time).
+    """
+    def __init__(self, path, settings=None, fmt=None, buffer_size=64, session=None):
+        if fmt is None:
+            fmt = "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown results format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.buffer_size = buffer_size
+        self.session = session or datetime.datetime.now().isoformat(timespec="seconds")
+        self.settings = {} if settings is None else settings_columns(settings)
+        self.setting_columns = {SETTING_PREFIX + name: value for name, value in self.settings.items()}
+        self.fields = RESULT_FIELDS + list(self.setting_columns)
+        self.summary = ResultsSummary()
+        self.buffer = []
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, record):
+        """
+        Adds a result row. It is written to the file when the buffer is full.
+
+        :param record: A dictionary with the `RESULT_FIELDS` keys (the session and the settings are added).
+        """
+        row = {field: record.get(field) for field in RESULT_FIELDS}
+        row["session"] = self.session
+        row.update(self.setting_columns)
+        self.buffer.append(row)
+        self.summary.add(row)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Appends the buffered rows to the file."""
+        if not self.buffer:
+            return
+        new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='') as f:
+            if self.fmt == "csv":
+                fields = self.fields
+                if not new_file:
+                    # Keep the columns of the existing file, so every row stays aligned with its header.
+                    with open(self.path, 'r', newline='') as existing:
+                        fields = next(csv.reader(existing), self.fields)
+                writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(self.buffer)
+            else:
+                for row in self.buffer:
+                    f.write(json.dumps(row) + "\n")
+        self.buffer = []
+
+    def summary_path(self):
+        """
+        Gets the path of the summary file.
+
+        :return: The results path with its extension replaced by .summary.json.
+        """
+        return os.path.splitext(self.path)[0] + ".summary.json"
+
+    def close(self):
+        """
+        Writes the remaining rows and the summary.
+
+        :return: The summary of the session, see `ResultsSummary.as_dict`.
+        """
+        summary = self.summary.as_dict()
+        if self.closed:
+            return summary
+        self.flush()
+        with open(self.summary_path(), 'w') as f:
+            json.dump({"session": self.session, "results": self.path, "settings": self.settings, "summary": summary}, f, indent=4)
+            f.write("\n")
+        self.closed = True
+        return summary
@@ -0,0 +1,228 @@
+import heapq
+import math
+import numpy as np
+
+from rrtCore.resultCache import save_arrays
+
+def _free_points(checker, points, stop=None):
+    """
+    Checks which points are outside the inflated obstacles.
+
+    :param checker: The collision checker.
+    :param points: An (N, 3) array of points.
+    :param stop: Optional function checked before every point when the checker has no vectorised point test.
+    :return: An (N,) boolean array, True for the free points, or None if it was stopped.
+    """
+    if hasattr(checker, "points_collide"):
+        return ~checker.points_collide(points)
+    free = np.empty(len(points), dtype=bool)
+    for i, point in enumerate(points):
+        if stop is not None and stop():
+            return None
+        free[i] = not checker.segment_collides(point, point)
+    return free
+
+def default_radius(size, num_samples, neighbours=15):
+    """
+    Computes the connection radius that gives every roadmap node about `neighbours` neighbours on an empty map.
+
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param num_samples: The number of roadmap nodes.
+    :param neighbours: The expected number of neighbours. Defaults to 15.
+    :return: The radius.
+    """
+    bounds = np.asarray(size, dtype=np.float64)
+    volume = np.prod(bounds[:, 1] - bounds[:, 0])
+    return float((3 * neighbours * volume / (4 * math.pi * max(num_samples, 1)))**(1/3))
+
+def build_roadmap(size, checker, rng, num_samples, radius, stop=None, chunk=256):
+    """
+    Builds a probabilistic roadmap: samples free nodes uniformly over the environment and connects every pair closer
+    than `radius` whose segment does not collide.
+
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param checker: The collision checker of the inflated obstacles.
+    :param rng: The random generator.
+    :type rng: `numpy.random.Generator`
+    :param num_samples: The number of free nodes.
+    :param radius: The maximum length of an edge.
+    :param stop: Optional function checked between sampling rounds and before every edge collision check; when it
+        returns True the build is abandoned. It should be cheap, it is called once per candidate edge.
+    :param chunk: The number of nodes whose neighbours are computed at once. Defaults to 256.
+    :return: The roadmap, or None if it was stopped.
+    :rtype: `Roadmap`
+    """
+    bounds = np.asarray(size, dtype=np.float64)
+    low, high = bounds[:, 0], bounds[:, 1]
+    nodes = []
+    found = 0
+    for _ in range(100):
+        if found >= num_samples:
+            break
+        if stop is not None and stop():
+            return None
+        points = low + rng.random((num_samples, 3)) * (high - low)
+        free = _free_points(checker, points, stop)
+        if free is None:
+            return None
+        points = points[free]
+        nodes.append(points)
+        found += len(points)
+    positions = np.concatenate(nodes)[:num_samples] if nodes else np.empty((0, 3))
+
+    sources = []
+    targets = []
+    squared_norms = np.einsum('ij,ij->i', positions, positions)
+    for lo in range(0, len(positions), chunk):
+        if stop is not None and stop():
+            return None
+        block = positions[lo:lo + chunk]
+        squared_distances = squared_norms[lo:lo + chunk, None] + squared_norms[None, :] - 2 * block @ positions.T
+        rows, cols = np.nonzero(squared_distances <= radius * radius)
+        rows += lo
+        keep = rows < cols
+        for i, j in zip(rows[keep], cols[keep]):
+            if stop is not None and stop():
+                return None
+            if not checker.segment_collides(positions[i], positions[j]):
+                sources.append(i)
+                targets.append(j)
+
+    sources = np.array(sources, dtype=np.int64)
+    targets = np.array(targets, dtype=np.int64)
+    return Roadmap(positions, np.concatenate((sources, targets)), np.concatenate((targets, sources)))
+
+def load_roadmap(path):
+    """
+    Loads a roadmap saved with `Roadmap.save`.
+
+    :param path: The .npz file.
+    :return: The roadmap.
+    :rtype: `Roadmap`
+    """
+    with np.load(path) as data:
+        return Roadmap(data["positions"], data["sources"], data["targets"])
+
+class Roadmap(object):
+    """
+    Undirected graph of collision-free nodes and edges, stored as compressed sparse rows, that answers any number of
+    start/goal queries with A*.
+
+    :param positions: The (N, 3) node positions.
+    :param sources: The first node of every directed edge (each undirected edge appears in both directions).
+    :param targets: The second node of every directed edge.
+    """
+    def __init__(self, positions, sources, targets):
+        self.positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        order = np.argsort(sources, kind='stable')
+        self.sources = np.asarray(sources, dtype=np.int64)[order]
+        self.targets = np.asarray(targets, dtype=np.int64)[order]
+        self.indptr = np.searchsorted(self.sources, np.arange(len(self.positions) + 1))
+        self.weights = np.linalg.norm(self.positions[self.targets] - self.positions[self.sources], axis=1)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def save(self, path):
+        """
+        Saves the roadmap to a .npz file. The file is replaced atomically, so concurrent searches never load a partial one.
+
+        :param path: The file.
+        """
+        save_arrays(path, positions=self.positions, sources=self.sources, targets=self.targets)
+
+    def edges(self):
+        """
+        Gets every undirected edge once, as segment endpoints for drawing.
+
+        :return: A (2K, 3) array where rows 2i and 2i+1 are the endpoints of edge i.
+        """
+        keep = self.sources < self.targets
+        segments = np.empty((2 * np.count_nonzero(keep), 3))
+        segments[0::2] = self.positions[self.sources[keep]]
+        segments[1::2] = self.positions[self.targets[keep]]
+        return segments
+
+    def __connections(self, point, checker, radius):
+        """
+        Finds the nodes a query point can be connected to.
+
+        :param point: The query point, a (3,) array.
+        :param checker: The collision checker.
+        :param radius: The connection radius. If no node is that close, the 10 nearest nodes are tried.
+        :return: A dictionary {node: distance} of collision-free connections.
+        """
+        if len(self.positions) == 0:
+            return {}
+        distances = np.linalg.norm(self.positions - point, axis=1)
+        candidates = np.nonzero(distances <= radius)[0]
+        if len(candidates) == 0:
+            candidates = np.argsort(distances)[:10]
+        return {int(j): float(distances[j]) for j in candidates if not checker.segment_collides(point, self.positions[j])}
+
+    def query(self, start, goal, checker, radius):
+        """
+        Finds the shortest roadmap path between two points with A* (Euclidean heuristic). The start and the goal are
+        connected to the nearby nodes they can see, and directly to each other if possible.
+
+        :param start: The starting position (x, y, z).
+        :param goal: The goal position (x, y, z).
+        :param checker: The collision checker of the inflated obstacles.
+        :param radius: The connection radius of the start and the goal.
+        :return: A tuple (waypoints, cost) with a list of waypoints [x, y, z], or an empty list and infinity if the goal cannot be reached.
+        """
+        start = np.asarray(start, dtype=np.float64)
+        goal = np.asarray(goal, dtype=np.float64)
+        n = len(self.positions)
+        start_index, goal_index = n, n + 1
+
+        start_links = self.__connections(start, checker, radius)
+        goal_links = self.__connections(goal, checker, radius)
+        direct = np.linalg.norm(goal - start)
+        if not checker.segment_collides(start, goal):
+            start_links[goal_index] = float(direct)
+
+        heuristic = np.linalg.norm(self.positions - goal, axis=1)
+        cost = np.full(n + 2, np.inf)
+        parent = np.full(n + 2, -1, dtype=np.int64)
+        cost[start_index] = 0.0
+        heap = [(direct, start_index)]
+        closed = np.zeros(n + 2, dtype=bool)
+
+        while heap:
+            _, u = heapq.heappop(heap)
+            if closed[u]:
+                continue
+            closed[u] = True
+            if u == goal_index:
+                break
+
+            if u == start_index:
+                links = start_links.items()
+            else:
+                lo, hi = self.indptr[u], self.indptr[u + 1]
+                links = zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist())
+                if u in goal_links:
+                    links = list(links) + [(goal_index, goal_links[u])]
+
+            for v, weight in links:
+                new_cost = cost[u] + weight
+                if new_cost < cost[v]:
+                    cost[v] = new_cost
+                    parent[v] = u
+                    heapq.heappush(heap, (new_cost + (0.0 if v == goal_index else heuristic[v]), v))
+
+        if not np.isfinite(cost[goal_index]):
+            return [], math.inf
+
+        waypoints = []
+        node = goal_index
+        while node != -1:
+            if node == start_index:
+                waypoints.append(start.tolist())
+            elif node == goal_index:
+                waypoints.append(goal.tolist())
+            else:
+                waypoints.append(self.positions[node].tolist())
+            node = parent[node]
+        return waypoints[::-1], float(cost[goal_index])
@@ -0,0 +1,150 @@
+import numpy as np
+
+class Sampler(object):
+    """
+    Generates random nodes in blocks with a seeded `numpy.random.Generator` and hands them out one at a time or in batches.
+
+    With a biased region (the goal quadrant) each sample is drawn inside that region with probability `region_prob`,
+    and from the whole environment otherwise. Once a solution is known, `set_informed` restricts the samples to the
+    region that can still improve it. An optional `reject` filter discards samples (e.g. those too close to an
+    obstacle) a whole block at a time.
+
+    :param size: The dimensions of the environment (min_x, max_x), (min_y, max_y), (min_z, max_z).
+    :param rng: The random generator.
+    :type rng: `numpy.random.Generator`
+    :param region: An optional biased region ((min_x, min_y, min_z), (max_x, max_y, max_z)). Defaults to None.
+    :param region_prob: The probability of sampling inside the biased region. Defaults to 0.
+    :param block_size: The number of samples generated at once. Defaults to 1024.
+    :param reject: An optional function that takes an (N, 3) array of samples and returns an (N,) boolean array, True for the samples to discard. Defaults to None.
+    """
+    def __init__(self, size, rng, region=None, region_prob=0.0, block_size=1024, reject=None):
+        bounds = np.asarray(size, dtype=np.float64)
+        self.low = bounds[:, 0]
+        self.high = bounds[:, 1]
+        self.rng = rng
+        self.region = None if region is None else np.asarray(region, dtype=np.float64)
+        self.region_prob = region_prob
+        self.block_size = block_size
+        self.reject = reject
+        self.block = np.empty((0, 3))
+        self.position = 0
+        self.informed = None
+
+    def set_informed(self, start, goal, c_best):
+        """
+        Switches to informed sampling: samples are drawn uniformly inside the prolate hyperspheroid with foci at the
+        start and the goal and transverse diameter `c_best`, the only region where a point can lie on a shorter path.
+
+        If the hyperspheroid is larger than the environment, sampling stays uniform over the environment.
+
+        :param start: The starting position (x, y, z).
+        :param goal: The goal position (x, y, z).
+        :param c_best: The length of the best path to the goal found so far, or an upper bound of it.
+        """
+        start = np.asarray(start, dtype=np.float64)
+        goal = np.asarray(goal, dtype=np.float64)
+        c_min = np.linalg.norm(goal - start)
+        if c_min == 0 or c_best <= c_min:
+            return
+
+        radii = np.array([c_best / 2, np.sqrt(c_best**2 - c_min**2) / 2, np.sqrt(c_best**2 - c_min**2) / 2])
+        if 4/3 * np.pi * np.prod(radii) >= np.prod(self.high - self.low):
+            self.informed = None
+            return
+
+        # Rotation that maps the x axis onto the start-goal direction.
+        U, _, Vt = np.linalg.svd(np.outer((goal - start) / c_min, [1, 0, 0]))
+        rotation = U @ np.diag([1, 1, np.linalg.det(U) * np.linalg.det(Vt)]) @ Vt
+
+        self.informed = ((start + goal) / 2, rotation * radii)
+        self.block = np.empty((0, 3))
+        self.position = 0
+
+    def __generate_informed(self, n):
+        """
+        Generates samples inside the informed hyperspheroid and the environment bounds.
+
+        :param n: The number of samples.
+        :return: An (n, 3) array of samples.
+        """
+        center, transform = self.informed
+        samples = []
+        found = 0
+        while found < n:
+            ball = self.rng.normal(size=(n, 3))
+            ball *= (self.rng.random(n)**(1/3) / np.linalg.norm(ball, axis=1))[:, None]
+            points = ball @ transform.T + center
+            points = points[np.all((points >= self.low) & (points <= self.high), axis=1)]
+            samples.append(points)
+            found += len(points)
+        return np.concatenate(samples)[:n]
+
+    def __generate(self, n, max_rounds=100):
+        """
+        Generates new samples, discarding the ones rejected by the filter.
+
+        :param n: The number of samples.
+        :param max_rounds: The number of filtered rounds after which the remaining samples are returned unfiltered, so an (almost) fully rejected space cannot stall the search. Defaults to 100.
+        :return: An (n, 3) array of samples.
+        """
+        if self.reject is None:
+            return self.__draw(n)
+
+        samples = []
+        found = 0
+        for _ in range(max_rounds):
+            points = self.__draw(n)
+            points = points[~self.reject(points)]
+            samples.append(points)
+            found += len(points)
+            if found >= n:
+                break
+        else:
+            samples.append(self.__draw(n - found))
+        return np.concatenate(samples)[:n]
+
+    def __draw(self, n):
+        """
+        Draws new unfiltered samples.
+
+        :param n: The number of samples.
+        :return: An (n, 3) array of samples.
+        """
+        if self.informed is not None:
+            return self.__generate_informed(n)
+
+        low = self.low
+        high = self.high
+        if self.region is not None and self.region_prob > 0:
+            biased = (self.rng.random(n) < self.region_prob)[:, None]
+            low = np.where(biased, self.region[0], low)
+            high = np.where(biased, self.region[1], high)
+        return low + self.rng.random((n, 3)) * (high - low)
+
+    def next(self):
+        """
+        Gets the next sample.
+
+        :return: The sample, a (3,) array.
+        """
+        if self.position == len(self.block):
+            self.block = self.__generate(self.block_size)
+            self.position = 0
+        sample = self.block[self.position]
+        self.position += 1
+        return sample
+
+    def batch(self, n):
+        """
+        Gets the next `n` samples.
+
+        :param n: The number of samples.
+        :return: An (n, 3) array of samples.
+        """
+        remaining = self.block[self.position:]
+        if len(remaining) >= n:
+            self.position += n
+            return remaining[:n]
+        self.block = np.empty((0, 3))
+        self.position = 0
+        return np.concatenate((remaining, self.__generate(n - len(remaining))))
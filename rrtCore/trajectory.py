@@ -0,0 +1,294 @@
+import numpy as np
+
+# Gauss-Legendre nodes and weights on [0, 1], used to integrate the speed of the curve.
+_GAUSS_NODES, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(5)
+_GAUSS_NODES = (_GAUSS_NODES + 1) / 2
+_GAUSS_WEIGHTS = _GAUSS_WEIGHTS / 2
+
+class Trajectory(object):
+    """
+    Smooth, time-parameterised trajectory through a list of waypoints.
+
+    The waypoints are interpolated by a natural cubic spline, parameterised by chord length. If a checker is given,
+    the curve is sampled and checked against the obstacles; waypoint segments whose curve collides get their midpoint
+    inserted and the spline is refitted, so the curve is pulled towards the (collision-free) polyline. If it still
+    collides after `max_refinements`, the trajectory falls back to the polyline itself.
+
+    Time follows a speed profile along the arc length that starts and ends at rest. The speed stays under
+    `max_velocity` and under sqrt(max_acceleration / curvature), so the centripetal acceleration stays under
+    `max_acceleration`, and the speed changes by at most `max_acceleration` per second (tangential acceleration).
+    Tangential and centripetal acceleration are limited separately, so their combined magnitude can reach
+    sqrt(2) * `max_acceleration`. The limits are enforced at `samples_per_segment` points per segment, between which
+    the curvature is assumed to vary little; the polyline fallback stops at every corner. Arc lengths are integrated
+    with Gauss-Legendre quadrature and inverted with Newton's method, so the speed is continuous.
+
+    :param waypoints: A list of waypoints [x, y, z].
+    :param max_velocity: The maximum speed. Defaults to 1.0.
+    :param max_acceleration: The maximum tangential and centripetal acceleration. Defaults to 1.0.
+    :param checker: Optional collision checker of the inflated obstacles (see `BoxCollisionChecker`).
+    :param samples_per_segment: The number of curve samples per waypoint segment used for the collision checks and the speed profile. Defaults to 20.
+    :param max_refinements: The maximum number of refit rounds when the curve collides. Defaults to 8.
+    """
+    def __init__(self, waypoints, max_velocity=1.0, max_acceleration=1.0, checker=None, samples_per_segment=20, max_refinements=8):
+        points = np.asarray(waypoints, dtype=np.float64).reshape(-1, 3)
+        if len(points) == 0:
+            raise ValueError("A trajectory needs at least one waypoint.")
+        keep = np.concatenate(([True], np.any(np.diff(points, axis=0) != 0, axis=1)))
+        points = points[keep]
+
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.samples_per_segment = samples_per_segment
+
+        self.__fit(points)
+        if checker is not None:
+            for _ in range(max_refinements):
+                colliding = self.__colliding_segments(checker)
+                if not colliding.size:
+                    break
+                midpoints = (points[colliding] + points[colliding + 1]) / 2
+                points = np.insert(points, colliding + 1, midpoints, axis=0)
+                self.__fit(points)
+            else:
+                if self.__colliding_segments(checker).size:
+                    self.__fit(points, linear=True)
+
+        self.__parameterise_time()
+
+    def __fit(self, points, linear=False):
+        """
+        Fits the spline coefficients through the points.
+
+        :param points: The (N, 3) waypoints.
+        :param linear: If True, fits straight segments (the polyline) instead of a cubic spline.
+        """
+        self.waypoints = points
+        self.linear = linear
+        n = len(points) - 1
+        if n == 0:
+            self.knots = np.zeros(1)
+            self.coefficients = np.zeros((0, 4, 3))
+            return
+
+        h = np.linalg.norm(np.diff(points, axis=0), axis=1)
+        self.knots = np.concatenate(([0.0], np.cumsum(h)))
+
+        # Second derivatives M of the natural spline (M_0 = M_n = 0), solved with the Thomas algorithm.
+        M = np.zeros((n + 1, 3))
+        if n > 1 and not linear:
+            slopes = np.diff(points, axis=0) / h[:, None]
+            lower = h[:-1].copy()
+            diag = 2 * (h[:-1] + h[1:])
+            upper = h[1:].copy()
+            rhs = 6 * np.diff(slopes, axis=0)
+            for i in range(1, n - 1):
+                w = lower[i] / diag[i - 1]
+                diag[i] -= w * upper[i - 1]
+                rhs[i] -= w * rhs[i - 1]
+            interior = np.empty_like(rhs)
+            interior[-1] = rhs[-1] / diag[-1]
+            for i in range(n - 3, -1, -1):
+                interior[i] = (rhs[i] - upper[i] * interior[i + 1]) / diag[i]
+            M[1:-1] = interior
+
+        hh = h[:, None]
+        a = points[:-1]
+        b = (points[1:] - points[:-1]) / hh - hh * (2 * M[:-1] + M[1:]) / 6
+        c = M[:-1] / 2
+        d = (M[1:] - M[:-1]) / (6 * hh)
+        self.coefficients = np.stack((a, b, c, d), axis=1)
+
+    def __segments(self, u):
+        """
+        Finds the spline segment of every parameter.
+
+        :param u: An array of parameters.
+        :return: An int array of segment indices.
+        """
+        return np.clip(np.searchsorted(self.knots, u, side='right') - 1, 0, len(self.coefficients) - 1)
+
+    def evaluate(self, u):
+        """
+        Evaluates the curve at chord-length parameters.
+
+        :param u: An array of parameters between 0 and the total chord length.
+        :return: An (N, 3) array of positions.
+        """
+        u = np.atleast_1d(np.asarray(u, dtype=np.float64))
+        if len(self.coefficients) == 0:
+            return np.repeat(self.waypoints[:1], len(u), axis=0)
+
+        u = np.clip(u, 0, self.knots[-1])
+        segment = self.__segments(u)
+        du = (u - self.knots[segment])[:, None]
+        a, b, c, d = np.moveaxis(self.coefficients[segment], 1, 0)
+        return a + du * (b + du * (c + du * d))
+
+    def __derivatives(self, u, segment):
+        """
+        Evaluates the first and second derivatives of the curve.
+
+        :param u: An array of parameters.
+        :param segment: The spline segment of every parameter (a parameter on a knot belongs to either side).
+        :return: A tuple of (N, 3) arrays (first derivative, second derivative).
+        """
+        du = (u - self.knots[segment])[:, None]
+        _, b, c, d = np.moveaxis(self.coefficients[segment], 1, 0)
+        return b + du * (2 * c + du * 3 * d), 2 * c + du * 6 * d
+
+    def __speed_integral(self, u0, u1, segment):
+        """
+        Integrates the speed |C'(u)| between parameters of the same segment with Gauss-Legendre quadrature.
+
+        :param u0: An array of lower bounds.
+        :param u1: An array of upper bounds.
+        :param segment: The spline segment of every interval.
+        :return: An array of arc lengths.
+        """
+        width = u1 - u0
+        u = u0[:, None] + width[:, None] * _GAUSS_NODES
+        first, _ = self.__derivatives(u.ravel(), np.repeat(segment, len(_GAUSS_NODES)))
+        speed = np.linalg.norm(first, axis=1).reshape(u.shape)
+        return width * (speed @ _GAUSS_WEIGHTS)
+
+    def __dense_parameters(self):
+        """
+        Gets `samples_per_segment` evenly spaced parameters on every segment, including both ends of the curve.
+
+        :return: An array of parameters.
+        """
+        steps = np.linspace(0, 1, self.samples_per_segment, endpoint=False)
+        h = np.diff(self.knots)
+        u = (self.knots[:-1, None] + h[:, None] * steps).ravel()
+        return np.concatenate((u, self.knots[-1:]))
+
+    def __colliding_segments(self, checker):
+        """
+        Finds the waypoint segments whose curve collides.
+
+        :param checker: The collision checker.
+        :return: An int array with the indices of the colliding segments.
+        """
+        if len(self.coefficients) == 0:
+            return np.empty(0, dtype=np.int64)
+        samples = self.evaluate(self.__dense_parameters())
+        colliding = set()
+        for k in range(len(samples) - 1):
+            segment = min(k // self.samples_per_segment, len(self.coefficients) - 1)
+            if segment not in colliding and checker.segment_collides(samples[k], samples[k + 1]):
+                colliding.add(segment)
+        return np.array(sorted(colliding), dtype=np.int64)
+
+    def __parameterise_time(self):
+        """Builds the arc-length table and the speed profile."""
+        if len(self.coefficients) == 0:
+            self.arc_parameters = np.zeros(1)
+            self.arc_lengths = np.zeros(1)
+            self.arc_segments = np.zeros(0, dtype=np.int64)
+            self.profile_speeds = np.zeros(1)
+            self.profile_times = np.zeros(1)
+            self.profile_accelerations = np.zeros(0)
+            self.length = 0.0
+            self.peak_velocity = 0.0
+            self.duration = 0.0
+            return
+
+        u = self.__dense_parameters()
+        self.arc_parameters = u
+        self.arc_segments = np.repeat(np.arange(len(self.coefficients)), self.samples_per_segment)
+        pieces = self.__speed_integral(u[:-1], u[1:], self.arc_segments)
+        self.arc_lengths = np.concatenate(([0.0], np.cumsum(pieces)))
+        self.length = float(self.arc_lengths[-1])
+
+        # Speed limit at every table point: the maximum speed and the curvature limit sqrt(a / kappa).
+        segment = np.append(self.arc_segments, len(self.coefficients) - 1)
+        first, second = self.__derivatives(u, segment)
+        speed = np.maximum(np.linalg.norm(first, axis=1), 1e-12)
+        curvature = np.linalg.norm(np.cross(first, second), axis=1) / speed**3
+        with np.errstate(divide='ignore'):
+            limit = np.minimum(self.max_velocity, np.sqrt(self.max_acceleration / curvature))
+        if self.linear:
+            # The polyline stops at every corner; inserted midpoints keep the direction and are passed through.
+            directions = np.diff(self.waypoints, axis=0) / np.diff(self.knots)[:, None]
+            straight = np.linalg.norm(np.cross(directions[:-1], directions[1:]), axis=1) <= 1e-9
+            turns = ~straight | (np.einsum('ij,ij->i', directions[:-1], directions[1:]) < 0)
+            limit[self.samples_per_segment * (1 + np.flatnonzero(turns))] = 0.0
+        limit[0] = limit[-1] = 0.0
+
+        # Forward and backward passes keep the tangential acceleration under max_acceleration: v1^2 <= v0^2 + 2 a ds.
+        v2 = limit**2
+        ds = np.diff(self.arc_lengths)
+        for i in range(len(ds)):
+            v2[i + 1] = min(v2[i + 1], v2[i] + 2 * self.max_acceleration * ds[i])
+        for i in range(len(ds) - 1, -1, -1):
+            v2[i] = min(v2[i], v2[i + 1] + 2 * self.max_acceleration * ds[i])
+        v = np.sqrt(v2)
+
+        # Between table points the acceleration is constant, so the speed changes linearly with time.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.profile_accelerations = np.where(ds > 0, (v2[1:] - v2[:-1]) / (2 * ds), 0.0)
+            dt = np.where(ds > 0, 2 * ds / (v[:-1] + v[1:]), 0.0)
+        self.profile_speeds = v
+        self.profile_times = np.concatenate(([0.0], np.cumsum(dt)))
+        self.peak_velocity = float(v.max())
+        self.duration = float(self.profile_times[-1])
+
+    def arc_length(self, t):
+        """
+        Gets the distance travelled along the curve at given times.
+
+        :param t: An array of times between 0 and `duration`.
+        :return: An array of arc lengths.
+        """
+        t = np.clip(np.atleast_1d(np.asarray(t, dtype=np.float64)), 0, self.duration)
+        if self.duration == 0:
+            return np.zeros_like(t)
+        i = np.clip(np.searchsorted(self.profile_times, t, side='right') - 1, 0, len(self.profile_accelerations) - 1)
+        tau = t - self.profile_times[i]
+        s = self.arc_lengths[i] + self.profile_speeds[i] * tau + 0.5 * self.profile_accelerations[i] * tau * tau
+        return np.minimum(s, self.arc_lengths[i + 1])
+
+    def __parameters_at(self, s, iterations=3):
+        """
+        Inverts the arc length: finds the curve parameters at given distances with Newton's method, starting from a
+        linear interpolation of the arc-length table.
+
+        :param s: An array of arc lengths between 0 and `length`.
+        :param iterations: The number of Newton steps. Defaults to 3.
+        :return: An array of parameters.
+        """
+        i = np.clip(np.searchsorted(self.arc_lengths, s, side='right') - 1, 0, len(self.arc_segments) - 1)
+        u0 = self.arc_parameters[i]
+        u1 = self.arc_parameters[i + 1]
+        s0 = self.arc_lengths[i]
+        piece = self.arc_lengths[i + 1] - s0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            u = u0 + np.where(piece > 0, (s - s0) / piece, 0.0) * (u1 - u0)
+        segment = self.arc_segments[i]
+        for _ in range(iterations):
+            first, _ = self.__derivatives(u, segment)
+            speed = np.maximum(np.linalg.norm(first, axis=1), 1e-12)
+            u = np.clip(u - (s0 + self.__speed_integral(u0, u, segment) - s) / speed, u0, u1)
+        return u
+
+    def sample(self, t):
+        """
+        Evaluates the trajectory at given times, in a single vectorised call.
+
+        :param t: A time or an array of times between 0 and `duration`.
+        :return: An (N, 3) array of positions.
+        """
+        s = self.arc_length(np.atleast_1d(t))
+        if len(self.coefficients) == 0:
+            return self.evaluate(s)
+        return self.evaluate(self.__parameters_at(s))
+
+    def sample_uniform(self, num):
+        """
+        Samples the trajectory at evenly spaced times.
+
+        :param num: The number of samples.
+        :return: A tuple (times, positions) with a (num,) array and a (num, 3) array.
+        """
+        times = np.linspace(0, self.duration, num)
+        return times, self.sample(times)
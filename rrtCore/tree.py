@@ -0,0 +1,68 @@
+import numpy as np
+
+class Tree(object):
+    """
+    Stores the RRT nodes in preallocated NumPy arrays: positions as (N, 3) float64 and parent pointers as int32.
+
+    Each node takes 28 bytes and the path back to the root is followed by direct indexing.
+
+    :param capacity: The maximum number of nodes the tree can hold.
+    """
+    def __init__(self, capacity):
+        self.positions = np.empty((capacity, 3), dtype=np.float64)
+        self.parent = np.empty(capacity, dtype=np.int32)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, point, parent):
+        """
+        Adds a node to the tree.
+
+        :param point: The position of the node (x, y, z).
+        :param parent: The index of the parent node, or -1 for the root.
+        :return: The index of the new node.
+        """
+        index = self.count
+        self.positions[index] = point
+        self.parent[index] = parent
+        self.count += 1
+        return index
+
+    def edges(self, start, stop):
+        """
+        Gets the edges from the nodes in [start, stop) to their parents.
+
+        :param start: The index of the first node. Must not be the root.
+        :param stop: The index after the last node.
+        :return: A (2K, 3) array with the parent and child endpoints of each edge, ready to draw with `mode='lines'`.
+        """
+        edges = np.empty((stop - start, 2, 3), dtype=np.float64)
+        edges[:, 0] = self.positions[self.parent[start:stop]]
+        edges[:, 1] = self.positions[start:stop]
+        return edges.reshape(-1, 3)
+
+    def path_indices(self, index):
+        """
+        Follows the parent pointers from a node back to the root.
+
+        :param index: The index of the last node of the path.
+        :return: An int array with the node indices, ordered from the root to `index`.
+        """
+        parent = self.parent
+        indices = []
+        while index != -1:
+            indices.append(index)
+            index = parent[index]
+        indices.reverse()
+        return np.array(indices, dtype=np.int64)
+
+    def path(self, index):
+        """
+        Gets the waypoints from the root to a node.
+
+        :param index: The index of the last node of the path.
+        :return: A list of waypoints [x, y, z], starting at the root.
+        """
+        return self.positions[self.path_indices(index)].tolist()
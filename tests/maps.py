@@ -0,0 +1,82 @@
+import contextlib
+import io
+import json
+import os
+
+import numpy as np
+
+from rrt import RRT, RRTSettings
+from rrtCore.collisionChecker import BoxCollisionChecker, inflated_boxes
+
+SIZE = [[-5.0, 5.0], [-5.0, 5.0], [0.0, 5.0]]
+
+def random_obstacles(rng, count=60):
+    """
+    Generates random box obstacles inside `SIZE`.
+
+    :param rng: The random generator.
+    :param count: The number of obstacles. Defaults to 60.
+    :return: A list of obstacles [id, position, size, color].
+    """
+    obstacles = []
+    for i in range(count):
+        size = rng.uniform(0.2, 1.5, 3)
+        position = rng.uniform([-5.0, -5.0, 0.0], [5.0, 5.0, 5.0] - size)
+        obstacles.append([i, position.tolist(), size.tolist(), [1, 0, 0, 1]])
+    return obstacles
+
+def random_segments(rng, count, max_length):
+    """
+    Generates random segments inside `SIZE`.
+
+    :param rng: The random generator.
+    :param count: The number of segments.
+    :param max_length: The maximum segment length.
+    :return: A tuple (start, end) of (count, 3) arrays.
+    """
+    low = np.array([axis[0] for axis in SIZE])
+    high = np.array([axis[1] for axis in SIZE])
+    start = rng.uniform(low, high, (count, 3))
+    direction = rng.normal(size=(count, 3))
+    direction /= np.linalg.norm(direction, axis=1)[:, None]
+    end = np.clip(start + direction * rng.uniform(0, max_length, (count, 1)), low, high)
+    return start, end
+
+def box_checker(obstacles, settings):
+    """
+    Builds the reference box checker of a map.
+
+    :param obstacles: A list of obstacles.
+    :param settings: The RRT settings (for safeDistance).
+    :return: A `BoxCollisionChecker`.
+    """
+    positions = [obstacle[1] for obstacle in obstacles]
+    sizes = [obstacle[2] for obstacle in obstacles]
+    return BoxCollisionChecker(*inflated_boxes(positions, sizes, settings.safeDistance))
+
+EXAMPLE_MAP = os.path.join(os.path.dirname(__file__), "..", "maps", "example.json")
+
+def plan(map_file=EXAMPLE_MAP, **settings):
+    """
+    Runs a search on a map file, silencing its progress output.
+
+    :param map_file: The map JSON file. Defaults to maps/example.json.
+    :param settings: The `RRTSettings` arguments.
+    :return: A tuple (rrt, waypoints, nodes).
+    """
+    with open(map_file) as f:
+        map_data = json.load(f)
+    rrt = RRT(map_data["mapSize"], map_data["posStart"], map_data["posGoal"], map_data["listObstacles"], RRTSettings(**settings))
+    with contextlib.redirect_stdout(io.StringIO()):
+        waypoints, nodes, _ = rrt.main_logic()
+    return rrt, waypoints, nodes
+
+def path_collides(waypoints, checker):
+    """
+    Checks a path against a collision checker.
+
+    :param waypoints: A list of waypoints [x, y, z].
+    :param checker: The collision checker.
+    :return: True if any segment of the path collides.
+    """
+    return any(checker.segment_collides(a, b) for a, b in zip(waypoints, waypoints[1:]))
@@ -0,0 +1,30 @@
+import numpy as np
+
+from rrt import RRTSettings, create_checker
+from rrtCore.bvh import BVHCollisionChecker
+from rrtCore.collisionChecker import BoxCollisionChecker
+from tests.maps import SIZE, box_checker, random_obstacles, random_segments
+
+def test_bvh_matches_box_checker():
+    rng = np.random.default_rng(0)
+    obstacles = random_obstacles(rng)
+    settings = RRTSettings(bvhThreshold=0)
+    boxes = box_checker(obstacles, settings)
+    bvh = create_checker(SIZE, obstacles, settings)
+    assert isinstance(bvh, BVHCollisionChecker)
+
+    for initial, objective in zip(*random_segments(rng, 5000, 3.0)):
+        assert bvh.segment_collides(initial, objective) == boxes.segment_collides(initial, objective)
+
+def test_bvh_with_one_box_per_leaf():
+    rng = np.random.default_rng(1)
+    box_min = rng.uniform(-5, 4, (200, 3))
+    box_max = box_min + rng.uniform(0.1, 1.0, (200, 3))
+    boxes = BoxCollisionChecker(box_min, box_max)
+    bvh = BVHCollisionChecker(box_min, box_max, leaf_size=1)
+    for initial, objective in zip(*random_segments(rng, 2000, 5.0)):
+        assert bvh.segment_collides(initial, objective) == boxes.segment_collides(initial, objective)
+
+def test_empty_bvh():
+    bvh = BVHCollisionChecker(np.empty((0, 3)), np.empty((0, 3)))
+    assert not bvh.segment_collides((0, 0, 0), (1, 1, 1))
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from rrt import RRTSettings, create_checker
+from rrtCore.distanceField import squared_distance_transform
+from tests.maps import SIZE, box_checker, random_obstacles, random_segments
+
+@pytest.mark.parametrize("clearance", [0.0, 0.2])
+def test_sdf_checker_is_conservative(clearance):
+    """The sdf checker may reject free segments, but never accepts one that the box checker rejects."""
+    rng = np.random.default_rng(3)
+    obstacles = random_obstacles(rng)
+    settings = RRTSettings(collisionBackend="sdf", clearance=clearance)
+    boxes = box_checker(obstacles, settings)
+    checker = create_checker(SIZE, obstacles, settings)
+
+    collisions = 0
+    for initial, objective in zip(*random_segments(rng, 5000, settings.nodeDistance)):
+        if boxes.segment_collides(initial, objective):
+            collisions += 1
+            assert checker.segment_collides(initial, objective)
+    assert collisions > 0
+
+def test_sdf_keeps_clearance():
+    """Points accepted by the sdf checker are at least `clearance` away from every inflated obstacle."""
+    rng = np.random.default_rng(4)
+    obstacles = random_obstacles(rng, 20)
+    settings = RRTSettings(collisionBackend="sdf", clearance=0.3)
+    boxes = box_checker(obstacles, settings)
+    checker = create_checker(SIZE, obstacles, settings)
+
+    points = rng.uniform([-5, -5, 0], [5, 5, 5], (5000, 3))
+    free = points[~checker.points_collide(points)]
+    assert len(free) > 0
+    gap = np.maximum(np.maximum(boxes.box_min[None] - free[:, None], free[:, None] - boxes.box_max[None]), 0)
+    assert np.linalg.norm(gap, axis=2).min() >= settings.clearance
+
+@pytest.mark.parametrize("max_cells", [2, 5, 40])
+def test_distance_transform_matches_brute_force(max_cells):
+    rng = np.random.default_rng(5)
+    features = rng.random((12, 9, 7)) < 0.02
+    features[0, 0, 0] = True
+    distance = squared_distance_transform(features, max_cells)
+
+    cells = np.argwhere(np.ones(features.shape, dtype=bool))
+    sources = np.argwhere(features)
+    exact = ((cells[:, None] - sources[None])**2).sum(axis=2).min(axis=1).reshape(features.shape)
+    within = exact <= max_cells**2
+    assert np.array_equal(distance[within], exact[within])
+    assert np.all(distance[~within] > max_cells**2)
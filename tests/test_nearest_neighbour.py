@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from rrtCore.nearestNeighbour import NN_BACKENDS, create_nearest_neighbour
+
+def _brute_nearest(points, query):
+    distances = np.linalg.norm(points - query, axis=1)
+    return distances.min()
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_nearest_matches_brute_force(backend):
+    """Every backend finds a point as close as the true nearest one, while points are being added."""
+    rng = np.random.default_rng(0)
+    nn = create_nearest_neighbour(backend, 0.3)
+    points = rng.uniform(-5, 5, (2000, 3))
+    queries = rng.uniform(-6, 6, (2000, 3))
+    for i, (point, query) in enumerate(zip(points, queries)):
+        nn.add(point)
+        index, distance = nn.nearest(query)
+        expected = _brute_nearest(points[:i + 1], query)
+        assert distance == pytest.approx(expected)
+        assert np.linalg.norm(points[index] - query) == pytest.approx(expected)
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+def test_nearest_on_empty_index(backend):
+    nn = create_nearest_neighbour(backend, 0.3)
+    assert nn.nearest((0.0, 0.0, 0.0))[0] is None
+
+@pytest.mark.parametrize("backend", NN_BACKENDS)
+@pytest.mark.parametrize("radius", [0.1, 0.5, 2.0])
+def test_within_matches_brute_force(backend, radius):
+    """Every backend returns exactly the points within the radius."""
+    rng = np.random.default_rng(1)
+    nn = create_nearest_neighbour(backend, 0.3)
+    points = rng.uniform(-5, 5, (3000, 3))
+    for point in points:
+        nn.add(point)
+    for query in rng.uniform(-5, 5, (200, 3)):
+        expected = np.flatnonzero(np.linalg.norm(points - query, axis=1) <= radius)
+        assert sorted(np.asarray(nn.within(query, radius)).tolist()) == expected.tolist()
@@ -0,0 +1,30 @@
+import os
+
+import numpy as np
+
+from rrt import RRTSettings, create_checker
+from tests.maps import SIZE, box_checker, random_obstacles, random_segments
+
+def test_voxel_checker_is_conservative():
+    """The voxel checker may reject free segments, but never accepts one that the box checker rejects."""
+    rng = np.random.default_rng(3)
+    obstacles = random_obstacles(rng)
+    settings = RRTSettings(collisionBackend="voxel")
+    boxes = box_checker(obstacles, settings)
+    checker = create_checker(SIZE, obstacles, settings)
+
+    collisions = 0
+    for initial, objective in zip(*random_segments(rng, 5000, settings.nodeDistance)):
+        if boxes.segment_collides(initial, objective):
+            collisions += 1
+            assert checker.segment_collides(initial, objective)
+    assert collisions > 0
+
+def test_cached_grid_is_reused(tmp_path):
+    rng = np.random.default_rng(4)
+    obstacles = random_obstacles(rng, 20)
+    settings = RRTSettings(collisionBackend="voxel", voxelCacheDir=str(tmp_path))
+    built = create_checker(SIZE, obstacles, settings)
+    assert len(os.listdir(tmp_path)) == 1
+    loaded = create_checker(SIZE, obstacles, settings)
+    assert np.array_equal(built.bits, loaded.bits)
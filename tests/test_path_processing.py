@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from rrtCore.pathProcessing import prune_path, shortcut_path
+from tests.maps import path_collides, plan
+
+def _path_length(waypoints):
+    return float(np.linalg.norm(np.diff(np.asarray(waypoints), axis=0), axis=1).sum())
+
+def _raw_path(seed):
+    rrt, waypoints, _ = plan(seed=seed)
+    assert waypoints and not path_collides(waypoints, rrt.checker)
+    return rrt, waypoints
+
+def _check_processed(rrt, raw, processed):
+    assert np.allclose(processed[0], raw[0]) and np.allclose(processed[-1], raw[-1])
+    assert not path_collides(processed, rrt.checker)
+    assert _path_length(processed) <= _path_length(raw) + 1e-9
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_prune_keeps_the_path_collision_free(seed):
+    rrt, raw = _raw_path(seed)
+    pruned = prune_path(raw, rrt.checker)
+    _check_processed(rrt, raw, pruned)
+    assert len(pruned) <= len(raw)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_shortcut_keeps_the_path_collision_free(seed):
+    rrt, raw = _raw_path(seed)
+    shortened = shortcut_path(raw, rrt.checker, 200, np.random.default_rng(seed))
+    _check_processed(rrt, raw, shortened)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_post_processing_settings(seed):
+    rrt, raw = _raw_path(seed)
+    rrt, processed, _ = plan(seed=seed, prunePath=True, shortcutIterations=200)
+    _check_processed(rrt, raw, processed)
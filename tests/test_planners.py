@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from tests.maps import path_collides, plan
+
+def _check_path(rrt, waypoints):
+    assert waypoints, "no path found"
+    assert np.allclose(waypoints[0], rrt.start)
+    assert np.linalg.norm(np.asarray(waypoints[-1]) - rrt.goal) <= rrt.settings.goalDistance + 1e-9
+    assert not path_collides(waypoints, rrt.checker)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_connect_path_is_collision_free(seed):
+    rrt, waypoints, _ = plan(planner="connect", seed=seed)
+    _check_path(rrt, waypoints)
+
+def _path_length(waypoints):
+    return float(np.linalg.norm(np.diff(np.asarray(waypoints), axis=0), axis=1).sum())
+
+def _check_improving(rrt, waypoints):
+    costs = [solution["cost"] for solution in rrt.solutions]
+    assert len(costs) > 1, "the search never improved its first solution"
+    assert all(later <= earlier for earlier, later in zip(costs, costs[1:]))
+    assert _path_length(waypoints) == pytest.approx(costs[-1])
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_star_cost_never_goes_up(seed):
+    rrt, waypoints, _ = plan(planner="star", seed=seed, nodeLimit=3000)
+    _check_path(rrt, waypoints)
+    _check_improving(rrt, waypoints)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_informed_star_cost_never_goes_up(seed):
+    rrt, waypoints, _ = plan(planner="star", informed=True, seed=seed, nodeLimit=3000)
+    _check_path(rrt, waypoints)
+    _check_improving(rrt, waypoints)
+
+def test_informed_samples_stay_in_the_hyperspheroid():
+    rrt, _, _ = plan(planner="star", informed=True, seed=0, nodeLimit=3000)
+    c_best = rrt.solutions[-1]["cost"] + rrt.settings.goalDistance
+    samples = rrt.sampler.batch(2000)
+    foci = np.linalg.norm(samples - rrt.start, axis=1) + np.linalg.norm(samples - rrt.goal, axis=1)
+    assert np.all(foci <= c_best + 1e-9)
@@ -0,0 +1,100 @@
+import contextlib
+import io
+import os
+import threading
+import time
+
+from batch_runner import run_map
+from rrt import RRTSettings, is_cacheable
+from rrtCore.resultCache import ResultCache, canonical_hash, map_hash, open_result_cache
+
+MAP_FILE = os.path.join(os.path.dirname(__file__), "..", "maps", "example.json")
+
+WAYPOINTS = [[0.0, 0.0, 0.0], [1.0, 2.0, 3.0]]
+
+def _entry_bytes(key):
+    return 8 * 3 * len(WAYPOINTS) + len(key)
+
+def test_hit_and_miss(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get("a") is None
+    cache.put("a", WAYPOINTS, 10, 0.5)
+    assert cache.get("a") == {"waypoints": WAYPOINTS, "nodes": 10, "time_s": 0.5}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_bytes=2 * _entry_bytes("a"))
+    cache.put("a", WAYPOINTS, 1, 0.1)
+    time.sleep(0.02)
+    cache.put("b", WAYPOINTS, 2, 0.1)
+    time.sleep(0.02)
+    assert cache.get("a") is not None
+    time.sleep(0.02)
+    cache.put("c", WAYPOINTS, 3, 0.1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.evictions == 1
+    assert cache.size_bytes() <= cache.max_bytes
+    cache.close()
+
+def test_entries_persist(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path)
+    cache.put("a", WAYPOINTS, 1, 0.1)
+    cache.close()
+    cache = ResultCache(path)
+    assert cache.get("a")["nodes"] == 1
+    cache.close()
+
+def test_keys_ignore_number_types():
+    obstacles = [[0, [1, 2, 3], [1, 1, 1], [1, 0, 0, 1]]]
+    same = [[0, (1.0, 2.0, 3.0), (1.0, 1.0, 1.0), (1, 0, 0, 1)]]
+    assert map_hash([[0, 5]] * 3, (0, 0, 0), (1, 1, 1), obstacles) == map_hash([[0.0, 5.0]] * 3, [0, 0, 0], [1, 1, 1], same)
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
+
+def test_large_integers_keep_their_value():
+    assert canonical_hash({"seed": 2**53}) != canonical_hash({"seed": 2**53 + 1})
+    assert canonical_hash({"seed": 3}) == canonical_hash({"seed": 3.0})
+
+def test_cache_is_usable_from_other_threads(tmp_path):
+    cache = open_result_cache(str(tmp_path / "cache.sqlite"), 1 << 20)
+    cache.put("a", WAYPOINTS, 1, 0.1)
+    errors = []
+
+    def worker(i):
+        try:
+            assert cache.get("a") is not None
+            cache.put(f"key-{i}", WAYPOINTS, i, 0.1)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(cache) == 9
+    cache.close()
+
+def test_only_reproducible_searches_are_cached(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    assert is_cacheable(RRTSettings(seed=1, resultCache=path))
+    assert not is_cacheable(RRTSettings(seed=1))
+    assert not is_cacheable(RRTSettings(resultCache=path))
+    assert not is_cacheable(RRTSettings(seed=1, resultCache=path, timeBudget=100))
+    assert not is_cacheable(RRTSettings(seed=1, resultCache=path, profile=True))
+
+def test_batch_runner_reuses_cached_runs(tmp_path):
+    settings = RRTSettings(seed=1, nodeLimit=2000, resultCache=str(tmp_path / "cache.sqlite"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = run_map(MAP_FILE, settings, 2)
+        second = run_map(MAP_FILE, settings, 2)
+    assert [result["cached"] for result in first + second] == [False, False, True, True]
+    for planned, cached in zip(first, second):
+        assert cached["waypoints"] == planned["waypoints"]
+        assert cached["nodes"] == planned["nodes"]
+    open_result_cache(settings.resultCache, settings.resultCacheSize).close()
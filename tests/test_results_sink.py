@@ -0,0 +1,54 @@
+import csv
+import json
+
+from rrt import RRTSettings
+from rrtCore.resultsSink import RESULT_FIELDS, SETTING_PREFIX, ResultsSink
+
+def _record(run, seed):
+    return {"run": run, "seed": seed, "success": run % 2 == 0, "nodes": 100 + run, "waypoint_count": 10,
+            "path_length": 5.0 + run, "time_s": 0.01 * (run + 1), "error": None}
+
+def test_rows_keep_their_own_seed(tmp_path):
+    path = str(tmp_path / "results.csv")
+    settings = RRTSettings(seed=3)
+    with ResultsSink(path, settings, buffer_size=2) as sink:
+        for run in range(6):
+            sink.write(_record(run, 3 + run))
+
+    with open(path, newline='') as f:
+        header = next(csv.reader(f))
+    assert len(header) == len(set(header))
+    assert header[:len(RESULT_FIELDS)] == RESULT_FIELDS
+
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [int(row["seed"]) for row in rows] == [3, 4, 5, 6, 7, 8]
+    assert all(row[SETTING_PREFIX + "seed"] == "3" for row in rows)
+    assert all(float(row[SETTING_PREFIX + "nodeDistance"]) == settings.nodeDistance for row in rows)
+
+def test_appended_sessions_keep_one_header(tmp_path):
+    path = str(tmp_path / "results.csv")
+    for session in ("first", "second"):
+        with ResultsSink(path, RRTSettings(), session=session) as sink:
+            sink.write(_record(0, 1))
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row["session"] for row in rows] == ["first", "second"]
+
+def test_ndjson_and_summary(tmp_path):
+    path = str(tmp_path / "results.ndjson")
+    sink = ResultsSink(path, RRTSettings(seed=7))
+    for run in range(4):
+        sink.write(_record(run, 7 + run))
+    sink.write({"run": 4, "seed": 11, "error": "boom"})
+    summary = sink.close()
+
+    with open(path) as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["seed"] for row in rows] == [7, 8, 9, 10, 11]
+    assert all(row[SETTING_PREFIX + "seed"] == 7 for row in rows)
+
+    assert (summary["runs"], summary["successes"], summary["errors"]) == (5, 2, 1)
+    assert summary["nodes"]["median"] == 101.5
+    with open(sink.summary_path()) as f:
+        assert json.load(f)["summary"] == summary
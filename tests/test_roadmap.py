@@ -0,0 +1,73 @@
+import numpy as np
+
+from rrt import RRTSettings, create_checker
+from rrtCore.roadmap import Roadmap, build_roadmap, load_roadmap
+from tests.maps import SIZE, box_checker, random_obstacles
+
+class _OnlyPoints(object):
+    """Checker on which every segment of non-zero length collides, so a query only reaches the node it sits on."""
+    def segment_collides(self, initial, objective):
+        return bool(np.any(np.asarray(initial) != np.asarray(objective)))
+
+def _shortest_paths(positions, sources, targets):
+    n = len(positions)
+    distance = np.full((n, n), np.inf)
+    np.fill_diagonal(distance, 0.0)
+    distance[sources, targets] = np.linalg.norm(positions[targets] - positions[sources], axis=1)
+    for k in range(n):
+        distance = np.minimum(distance, distance[:, k, None] + distance[None, k, :])
+    return distance
+
+def test_query_finds_shortest_path():
+    """A* over the roadmap returns the same costs as Floyd-Warshall over the same graph."""
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, 10, (80, 3))
+    distances = np.linalg.norm(positions[:, None] - positions[None], axis=2)
+    sources, targets = np.nonzero((distances < 3.0) & (distances > 0))
+    roadmap = Roadmap(positions, sources, targets)
+    expected = _shortest_paths(positions, sources, targets)
+
+    checker = _OnlyPoints()
+    for a, b in rng.integers(0, len(positions), (100, 2)):
+        if a == b:
+            continue
+        waypoints, cost = roadmap.query(positions[a], positions[b], checker, 1e-9)
+        if np.isinf(expected[a, b]):
+            assert waypoints == []
+            continue
+        assert np.isclose(cost, expected[a, b])
+        path = np.asarray(waypoints)
+        assert np.isclose(np.linalg.norm(np.diff(path, axis=0), axis=1).sum(), cost)
+        assert np.allclose(path[0], positions[a]) and np.allclose(path[-1], positions[b])
+
+def test_save_and_load(tmp_path):
+    rng = np.random.default_rng(1)
+    roadmap = Roadmap(rng.random((5, 3)), [0, 1, 1, 2], [1, 0, 2, 1])
+    path = str(tmp_path / "roadmap.npz")
+    roadmap.save(path)
+    loaded = load_roadmap(path)
+    assert np.array_equal(loaded.positions, roadmap.positions)
+    assert np.array_equal(loaded.targets, roadmap.targets)
+    assert list(tmp_path.iterdir()) == [tmp_path / "roadmap.npz"]
+
+def test_points_collide_matches_segment_checks():
+    """Roadmap nodes are sampled with the vectorised point test of the box and BVH checkers."""
+    rng = np.random.default_rng(2)
+    obstacles = random_obstacles(rng)
+    boxes = box_checker(obstacles, RRTSettings())
+    bvh = create_checker(SIZE, obstacles, RRTSettings(bvhThreshold=0))
+    points = rng.uniform([-5, -5, 0], [5, 5, 5], (3000, 3))
+    expected = np.array([boxes.segment_collides(point, point) for point in points])
+    assert expected.any()
+    assert np.array_equal(boxes.points_collide(points), expected)
+    assert np.array_equal(bvh.points_collide(points), expected)
+
+def test_build_stops_when_asked():
+    rng = np.random.default_rng(3)
+    checker = create_checker(SIZE, random_obstacles(rng, 10), RRTSettings())
+    calls = []
+    def stop():
+        calls.append(None)
+        return len(calls) > 5
+    assert build_roadmap(SIZE, checker, rng, 500, 1.0, stop) is None
+    assert len(calls) == 6
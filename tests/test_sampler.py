@@ -0,0 +1,38 @@
+import numpy as np
+
+from rrtCore.sampler import Sampler
+from tests.maps import SIZE, plan
+
+def _stream(seed, block_size, n):
+    sampler = Sampler(SIZE, np.random.default_rng(seed), block_size=block_size)
+    return np.array([sampler.next() for _ in range(n)])
+
+def test_samples_stay_inside_the_map():
+    samples = _stream(0, 64, 1000)
+    bounds = np.array(SIZE)
+    assert np.all(samples >= bounds[:, 0]) and np.all(samples <= bounds[:, 1])
+
+def test_same_seed_gives_the_same_samples():
+    assert np.array_equal(_stream(1, 64, 500), _stream(1, 64, 500))
+    assert not np.array_equal(_stream(1, 64, 500), _stream(2, 64, 500))
+
+def test_batch_continues_the_stream():
+    sampler = Sampler(SIZE, np.random.default_rng(3), block_size=64)
+    first = np.array([sampler.next() for _ in range(10)])
+    rest = sampler.batch(30)
+    assert np.array_equal(np.concatenate((first, rest)), _stream(3, 64, 40))
+
+def test_biased_region_receives_its_share():
+    region = ((0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+    sampler = Sampler(SIZE, np.random.default_rng(4), region, 0.5)
+    samples = sampler.batch(20000)
+    inside = np.all((samples >= region[0]) & (samples <= region[1]), axis=1)
+    # Half the samples are drawn in the region, plus the uniform ones that fall in it (1/500 of the map).
+    assert abs(inside.mean() - 0.501) < 0.02
+
+def test_same_seed_gives_the_same_path():
+    _, first, nodes_first = plan(seed=5)
+    _, second, nodes_second = plan(seed=5)
+    assert first == second and nodes_first == nodes_second
+    _, other, _ = plan(seed=6)
+    assert other != first
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from rrtCore.trajectory import Trajectory
+from tests.maps import path_collides, plan
+
+MAX_VELOCITY = 1.0
+MAX_ACCELERATION = 2.0
+SAMPLES = 20001
+
+def _trajectory(seed, checker=True):
+    rrt, waypoints, _ = plan(seed=seed)
+    assert waypoints
+    trajectory = Trajectory(waypoints, MAX_VELOCITY, MAX_ACCELERATION, rrt.checker if checker else None)
+    return rrt, waypoints, trajectory
+
+def _derivatives(trajectory):
+    times, positions = trajectory.sample_uniform(SAMPLES)
+    dt = times[1] - times[0]
+    velocity = np.gradient(positions, dt, axis=0)
+    acceleration = np.gradient(velocity, dt, axis=0)
+    return positions, velocity, acceleration
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trajectory_respects_the_limits(seed):
+    _, _, trajectory = _trajectory(seed)
+    _, velocity, acceleration = _derivatives(trajectory)
+    speed = np.linalg.norm(velocity, axis=1)
+    assert speed.max() <= MAX_VELOCITY * 1.01
+
+    # Tangential acceleration is the change of speed; centripetal acceleration adds at most max_acceleration more.
+    tangential = np.gradient(speed, trajectory.duration / (SAMPLES - 1))
+    assert np.abs(tangential[1:-1]).max() <= MAX_ACCELERATION * 1.01
+    assert np.linalg.norm(acceleration, axis=1)[1:-1].max() <= np.sqrt(2) * MAX_ACCELERATION * 1.02
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trajectory_starts_and_ends_at_rest(seed):
+    _, waypoints, trajectory = _trajectory(seed)
+    assert np.allclose(trajectory.sample(0.0)[0], waypoints[0])
+    assert np.allclose(trajectory.sample(trajectory.duration)[0], waypoints[-1])
+    speed = np.linalg.norm(_derivatives(trajectory)[1], axis=1)
+    assert speed[0] < 0.02 * MAX_VELOCITY and speed[-1] < 0.02 * MAX_VELOCITY
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_trajectory_is_collision_free(seed):
+    rrt, _, trajectory = _trajectory(seed)
+    _, positions = trajectory.sample_uniform(2000)
+    assert not path_collides(positions, rrt.checker)
+
+def test_single_waypoint():
+    trajectory = Trajectory([[1.0, 2.0, 3.0]])
+    assert trajectory.duration == 0
+    assert np.allclose(trajectory.sample(0.0), [[1.0, 2.0, 3.0]])